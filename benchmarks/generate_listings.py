@@ -0,0 +1,105 @@
+"""
+RUKindaHomeless - Synthetic Listings Generator
+Writes listings CSVs with the same columns and quirks as data/listings.csv
+(quoted addresses, some rents formatted like "1,992", building pages shared by
+several units, occasional re-scraped duplicates) at any size.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+STREETS = [
+    'Somerset St', 'Easton Ave', 'Hamilton St', 'George St', 'Livingston Ave', 'Paterson St',
+    'Paul Robeson Blvd', 'Mine St', 'Mercer St', 'Senior St', 'Handy St', 'Denison St',
+    'Us Highway 1', 'Remsen Ave', 'Joyce Kilmer Ave', 'French St',
+]
+TOWNS = [
+    ('New Brunswick', '08901'), ('New Brunswick', '08901'), ('New Brunswick', '08901'),
+    ('Highland Park', '08904'), ('Piscataway', '08854'), ('Somerset', '08873'),
+]
+
+# Roughly the mix of data/listings.csv
+BEDROOMS = [0, 1, 2, 3, 4, 5]
+BEDROOM_WEIGHTS = [0.04, 0.48, 0.36, 0.08, 0.02, 0.02]
+SOURCES = ['craigslist', 'Redfin', 'The Edge', 'Skyline Tower', 'Premiere Residences', 'The Vue', 'Trulia']
+SOURCE_WEIGHTS = [0.55, 0.10, 0.10, 0.08, 0.08, 0.07, 0.02]
+
+COLUMNS = ['address', 'rent', 'BR', 'Ba', 'sqft', 'url', 'source']
+
+
+def generate_chunk(rng, start, size, duplicate_rate=0.02):
+    """Build `size` synthetic listings numbered from `start` as a DataFrame with the CSV columns."""
+    br = rng.choice(BEDROOMS, size=size, p=BEDROOM_WEIGHTS)
+    ba = np.where(br <= 1, 1.0, rng.choice([1.0, 1.5, 2.0, 2.5], size=size, p=[0.25, 0.2, 0.45, 0.1]))
+    sqft = np.maximum(120, rng.normal(430 + 280 * br, 120)).astype(int)
+    rent = np.maximum(700, np.round(600 + 420 * br + 1.6 * sqft + rng.normal(0, 300, size))).astype(int)
+
+    numbers = rng.integers(1, 999, size=size)
+    streets = rng.integers(0, len(STREETS), size=size)
+    towns = rng.integers(0, len(TOWNS), size=size)
+    units = rng.integers(1, 40, size=size)
+    has_unit = rng.random(size) < 0.15
+    address = [
+        f"{n} {STREETS[s]}{f' Unit {u}' if unit else ''}, {TOWNS[t][0]}, NJ {TOWNS[t][1]}"
+        for n, s, t, u, unit in zip(numbers, streets, towns, units, has_unit)
+    ]
+
+    # Craigslist posts get one URL each; the apartment sites list units on a shared building page
+    source_idx = rng.choice(len(SOURCES), size=size, p=SOURCE_WEIGHTS)
+    ids = np.arange(start, start + size)
+    url = [
+        f"https://cnj.craigslist.org/apa/d/new-brunswick-apartment/{7800000000 + i}.html"
+        if s == 0 else
+        f"https://www.trulia.com/building/{SOURCES[s].lower().replace(' ', '-')}-{n}-{STREETS[st].lower().replace(' ', '-')}-{1000000000 + (i % 5000)}"
+        for i, s, n, st in zip(ids, source_idx, numbers, streets)
+    ]
+
+    # About a third of rents come through with thousands separators, like the scraped data
+    rent_text = np.where(
+        (rng.random(size) < 0.3) & (rent >= 1000),
+        [f"{r:,}" for r in rent],
+        rent.astype(str)
+    )
+
+    df = pd.DataFrame({
+        'address': address,
+        'rent': rent_text,
+        'BR': br,
+        'Ba': ba,
+        'sqft': sqft,
+        'url': url,
+        'source': [SOURCES[s] for s in source_idx],
+    })
+
+    # Re-scrapes: overwrite a few rows with verbatim copies of others
+    repeated = np.flatnonzero(rng.random(size) < duplicate_rate)
+    df.iloc[repeated] = df.iloc[rng.integers(0, size, len(repeated))].to_numpy()
+    return df
+
+
+def write_listings(path, rows, seed=42, chunk_size=250000):
+    """Stream `rows` synthetic listings to `path` in chunks so memory stays flat at any size."""
+    rng = np.random.default_rng(seed)
+    written = 0
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(COLUMNS) + '\n')
+        while written < rows:
+            size = min(chunk_size, rows - written)
+            generate_chunk(rng, written, size).to_csv(f, index=False, header=False)
+            written += size
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a synthetic listings CSV")
+    parser.add_argument('rows', type=int, help="number of listings to generate")
+    parser.add_argument('--output', default='listings_synthetic.csv', help="CSV file to write")
+    parser.add_argument('--seed', type=int, default=42, help="random seed")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    written = write_listings(args.output, args.rows, args.seed)
+    print(f"✅ Wrote {written:,} listings to {args.output} in {time.perf_counter() - start_time:.1f}s")
@@ -0,0 +1,237 @@
+"""
+RUKindaHomeless - End-to-End Benchmarks
+Generates synthetic listings at each requested size and times every pipeline stage:
+CSV parse, database load, stats computation, model training, batch prediction and web
+app generation. Results are written as JSON (one file per run plus an appended
+history.jsonl) so they can be compared over time.
+
+Database stages run in a scratch schema selected through PGOPTIONS, so the real
+listings table is never touched.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from generate_listings import write_listings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'database'))
+sys.path.insert(0, REPO_ROOT)
+import db  # noqa: E402
+import queries  # noqa: E402
+from data.listings import load_listings  # noqa: E402
+STAGES = ['csv_parse', 'snapshot_load', 'db_load', 'stats', 'train_rent_model', 'train_value_classifier',
+          'batch_predict', 'webapp']
+
+
+def parse_size(text):
+    """'10k' -> 10000, '1m' -> 1000000."""
+    text = text.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def run_script(args, cwd, log_path, env=None):
+    """Run a repo script as a child process; return wall seconds, peak RSS (MB) and exit status."""
+    start_time = time.perf_counter()
+    with open(log_path, 'w') as log:
+        proc = subprocess.Popen([sys.executable] + args, cwd=cwd, stdout=log, stderr=subprocess.STDOUT,
+                                env={**os.environ, **(env or {})})
+        _, status, usage = os.wait4(proc.pid, 0)
+    result = {
+        'seconds': round(time.perf_counter() - start_time, 3),
+        'peak_rss_mb': round(usage.ru_maxrss / 1024, 1),
+        'ok': os.waitstatus_to_exitcode(status) == 0,
+    }
+    if not result['ok']:
+        result['log'] = log_path
+    return result
+
+
+def time_csv_parse(csv_path):
+    """The parse + rent cleanup every script repeats."""
+    start_time = time.perf_counter()
+    df = pd.read_csv(csv_path)
+    df['rent'] = df['rent'].astype(str).str.replace(',', '').astype(float)
+    return {'seconds': round(time.perf_counter() - start_time, 3), 'ok': True, 'rows': len(df)}
+
+
+def time_snapshot_load(csv_path):
+    """Shared loader: build the Arrow snapshot once, then time the memory-mapped reload."""
+    load_listings(csv_path)
+    start_time = time.perf_counter()
+    load_listings(csv_path)
+    return {'seconds': round(time.perf_counter() - start_time, 3), 'ok': True}
+
+
+def reset_db_schema(schema_name):
+    """Create an empty copy of schema.sql in a scratch schema."""
+    conn = db.connect()
+    cursor = conn.cursor()
+    cursor.execute(f'DROP SCHEMA IF EXISTS "{schema_name}" CASCADE')
+    cursor.execute(f'CREATE SCHEMA "{schema_name}"')
+    cursor.execute(f'SET search_path TO "{schema_name}"')
+    with open(os.path.join(REPO_ROOT, 'database', 'schema.sql')) as f:
+        cursor.execute(f.read())
+    conn.commit()
+    return conn
+
+
+def time_stats(conn, schema_name):
+    """Full recompute of the summary tables and listing_stats in the scratch schema."""
+    cursor = conn.cursor()
+    cursor.execute(f'SET search_path TO "{schema_name}"')
+    start_time = time.perf_counter()
+    cursor.execute("SELECT refresh_rent_summaries()")
+    cursor.execute(queries.LISTING_STATS.format(group_filter="", row_filter=""))
+    conn.commit()
+    return {'seconds': round(time.perf_counter() - start_time, 3), 'ok': True}
+
+
+def benchmark_size(rows, stages, work_dir, schema_name, keep_csv):
+    csv_path = os.path.join(work_dir, f'listings_{rows}.csv')
+    run_dir = os.path.join(work_dir, f'run_{rows}')
+    os.makedirs(run_dir, exist_ok=True)
+
+    if not os.path.exists(csv_path):
+        print(f"\n📝 Generating {rows:,} listings...")
+        start_time = time.perf_counter()
+        write_listings(csv_path, rows)
+        print(f"   done in {time.perf_counter() - start_time:.1f}s")
+
+    results = {'rows': rows, 'csv_bytes': os.path.getsize(csv_path), 'stages': {}}
+    timings = results['stages']
+
+    def log(stage):
+        return os.path.join(run_dir, f'{stage}.log')
+
+    if 'csv_parse' in stages:
+        timings['csv_parse'] = time_csv_parse(csv_path)
+    if 'snapshot_load' in stages:
+        timings['snapshot_load'] = time_snapshot_load(csv_path)
+
+    if 'db_load' in stages or 'stats' in stages:
+        conn = reset_db_schema(schema_name)
+        timings['db_load'] = run_script(
+            ['load_data.py', '--csv', csv_path], os.path.join(REPO_ROOT, 'database'), log('db_load'),
+            env={'PGOPTIONS': f'-c search_path={schema_name}'})
+        if 'stats' in stages:
+            timings['stats'] = time_stats(conn, schema_name)
+        conn.cursor().execute(f'DROP SCHEMA "{schema_name}" CASCADE')
+        conn.commit()
+        db.release(conn)
+
+    # Models are published to a registry inside run_dir, leaving the repo's registry alone;
+    # --retrain so a cached fit from an earlier run doesn't stand in for the timing
+    registry_dir = os.path.join(run_dir, 'registry')
+    if 'train_rent_model' in stages or 'batch_predict' in stages:
+        timings['train_rent_model'] = run_script(
+            [os.path.join(REPO_ROOT, 'models', 'predict_rent.py'), '--csv', csv_path, '--retrain',
+             '--registry-dir', registry_dir], run_dir, log('train_rent_model'))
+    if 'train_value_classifier' in stages or 'batch_predict' in stages:
+        timings['train_value_classifier'] = run_script(
+            [os.path.join(REPO_ROOT, 'models', 'value_classifier.py'), '--csv', csv_path,
+             '--registry-dir', registry_dir], run_dir, log('train_value_classifier'))
+
+    # Score the whole file with the models just trained, through the process-pool scorer
+    if 'batch_predict' in stages:
+        timings['batch_predict'] = run_script(
+            [os.path.join(REPO_ROOT, 'models', 'batch_score.py'), csv_path, '--registry-dir', registry_dir,
+             '--output', os.path.join(run_dir, 'scored.csv')], run_dir, log('batch_predict'))
+
+    if 'webapp' in stages:
+        timings['webapp'] = run_script(
+            [os.path.join(REPO_ROOT, 'webapp', 'generate_webapp.py'), '--csv', csv_path], run_dir, log('webapp'))
+        # First paint needs index.html and the manifest; shards load as filters ask for them
+        output = os.path.join(run_dir, 'index.html')
+        if os.path.exists(output):
+            timings['webapp']['output_bytes'] = os.path.getsize(output)
+            shard_dir = os.path.join(run_dir, 'shards')
+            timings['webapp']['shard_bytes'] = sum(
+                os.path.getsize(os.path.join(shard_dir, name)) for name in os.listdir(shard_dir))
+
+    for stage, result in timings.items():
+        if 'seconds' in result and result['seconds']:
+            result.setdefault('rows_per_sec', round(rows / result['seconds']))
+
+    if not keep_csv:
+        os.remove(csv_path)
+        shutil.rmtree(os.path.join(work_dir, '.cache'), ignore_errors=True)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on synthetic listings")
+    parser.add_argument('--sizes', default='10k,100k,1m',
+                        help="comma-separated dataset sizes, e.g. 10k,100k,1m,10m")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"subset of: {','.join(STAGES)}")
+    parser.add_argument('--work-dir', default=None, help="where generated CSVs and stage outputs go (default: temp dir)")
+    parser.add_argument('--results-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results'),
+                        help="where JSON reports are written")
+    parser.add_argument('--schema', default='benchmark', help="scratch database schema for the DB stages")
+    parser.add_argument('--keep', action='store_true', help="keep generated CSVs and stage outputs")
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(',')]
+    stages = [s.strip() for s in args.stages.split(',')]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    print("=" * 70)
+    print("RUKINDAHOMELESS - END-TO-END BENCHMARKS")
+    print("=" * 70)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='rukh_bench_')
+    os.makedirs(work_dir, exist_ok=True)
+
+    report = {
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'runs': [],
+    }
+
+    try:
+        for rows in sizes:
+            result = benchmark_size(rows, stages, work_dir, args.schema, args.keep)
+            report['runs'].append(result)
+
+            print(f"\n📊 {rows:,} listings")
+            print(f"{'Stage':<26} {'Seconds':<10} {'Rows/sec':<14} {'Peak MB':<10}")
+            print("-" * 70)
+            for stage, timing in result['stages'].items():
+                status = '' if timing.get('ok', True) else f"  ❌ failed, see {timing['log']} (--keep)"
+                print(f"{stage:<26} {timing['seconds']:<10.2f} {timing.get('rows_per_sec') or 0:<14,} "
+                      f"{timing.get('peak_rss_mb', ''):<10}{status}")
+    finally:
+        if not args.keep and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    report_path = os.path.join(args.results_dir, f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    with open(os.path.join(args.results_dir, 'history.jsonl'), 'a') as f:
+        f.write(json.dumps(report) + '\n')
+
+    print(f"\n✅ Report written to {report_path}")
+    print("=" * 70 + "\n")
@@ -0,0 +1,319 @@
+"""
+RUKindaHomeless - Near-Duplicate Listings
+The same unit shows up more than once in a scrape: reposted under a new URL, listed on two
+sites, or re-scraped with a typo ("1,992" vs 1993, 929 vs 939 sqft, BR miscounted on one
+copy). This finds those clusters and gives every listing a canonical_id, the row number of
+the copy that represents its cluster (the last one scraped), so loaders and trainers can keep
+one row per unit.
+
+Work stays roughly linear in the number of listings; no two listings are compared unless
+they land in the same candidate group:
+    1. Addresses are normalized (case, punctuation, "Street" -> "st", unit, zip).
+    2. Candidate groups: addresses sharing a blocking key (house number + street + unit +
+       zip), joined with addresses whose MinHash signatures over character 3-grams collide
+       in an LSH band at the same house number and zip (catches spelling and formatting
+       variants of the street).
+    3. Within a group, listings are sorted by rent and each is compared with its neighbours
+       until the rent tolerance runs out (sorted neighbourhood), using the rules below.
+    4. Matches are clustered with a vectorized union-find.
+
+Two listings are the same unit when their rents are within RENT_TOLERANCE, their sizes
+within SQFT_TOLERANCE, their units (when both give one) agree, and they either have the same
+bedroom and bathroom counts or come from the same listing URL.
+
+Usage:
+    from data.dedup import find_duplicates
+    df['canonical_id'] = find_duplicates(df)          # index label of each row's canonical copy
+    python dedup.py [--csv listings.csv] [--output clusters.csv]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data.ingest import DEFAULT_CHUNK_SIZE, read_batches
+
+# Two copies of a unit: rent and size may drift this much (relative) between scrapes
+RENT_TOLERANCE = 0.02
+SQFT_TOLERANCE = 0.02
+
+# 32 MinHash values in 8 bands of 4: addresses with ~60% 3-gram overlap usually share a band
+NUM_PERMUTATIONS = 32
+BANDS = 8
+SHINGLE_SIZE = 3
+MINHASH_SEED = 42
+
+# Sorted-neighbourhood window: how many rent-sorted neighbours each listing is compared with
+MAX_WINDOW = 64
+
+ABBREVIATIONS = {
+    'street': 'st', 'str': 'st', 'avenue': 'ave', 'av': 'ave', 'road': 'rd', 'drive': 'dr',
+    'boulevard': 'blvd', 'lane': 'ln', 'court': 'ct', 'circle': 'cir', 'place': 'pl',
+    'highway': 'hwy', 'parkway': 'pkwy', 'terrace': 'ter', 'square': 'sq',
+    'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
+    'apartment': 'unit', 'apt': 'unit', 'suite': 'unit', 'ste': 'unit',
+}
+STATES = {'nj', 'ny', 'pa', 'new jersey'}
+ZIP_PATTERN = re.compile(r'\b(\d{5})(?:-\d{4})?\b')
+
+
+def normalize_address(address):
+    """
+    '110 Somerset Street, New Brunswick, NJ 08901' -> ('110 somerset st new brunswick', '', '08901').
+    Returns (line, unit, zip); repeated comma segments and a trailing "city" are dropped.
+    """
+    text = str(address).lower().replace('#', ' unit ')
+    zips = ZIP_PATTERN.findall(text)
+    zip_code = zips[-1] if zips else ''
+    text = ZIP_PATTERN.sub(' ', text)
+
+    segments = []
+    for segment in text.split(','):
+        words = [ABBREVIATIONS.get(word, word) for word in re.findall(r'[a-z0-9]+', segment)]
+        if words and words[-1] == 'city' and len(words) > 1:
+            words = words[:-1]
+        segment = ' '.join(words)
+        if segment and segment not in STATES and segment not in segments:
+            segments.append(segment)
+
+    words = ' '.join(segments).split()
+    # "new brunswick nj" when the state had no comma of its own
+    words = [word for i, word in enumerate(words) if not (word in STATES and i == len(words) - 1)]
+    unit = ''
+    if 'unit' in words:
+        i = words.index('unit')
+        unit = words[i + 1] if i + 1 < len(words) else ''
+        del words[i:i + 2]
+    return ' '.join(words), unit, zip_code
+
+
+def blocking_key(line, unit, zip_code):
+    """House number and first street word, plus unit and zip: '110 somerset||08901'."""
+    return f"{' '.join(line.split()[:2])}|{unit}|{zip_code}"
+
+
+def shingle_hashes(text):
+    """CRC32 of each character 3-gram of text (the whole text when it is shorter)."""
+    text = f" {text} "
+    grams = {text[i:i + SHINGLE_SIZE] for i in range(max(len(text) - SHINGLE_SIZE + 1, 1))}
+    return [zlib.crc32(gram.encode()) for gram in grams]
+
+
+def minhash_signatures(texts, num_permutations=NUM_PERMUTATIONS, seed=MINHASH_SEED, block=4000):
+    """
+    (len(texts), num_permutations) uint32 MinHash signatures. Permutations are multiply-shift
+    hashes of the 3-gram CRCs; texts are processed block rows at a time to bound memory.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, num_permutations, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, num_permutations, dtype=np.uint64)
+    signatures = np.empty((len(texts), num_permutations), dtype=np.uint32)
+
+    for start in range(0, len(texts), block):
+        shingles = [shingle_hashes(text) for text in texts[start:start + block]]
+        counts = np.array([len(s) for s in shingles])
+        values = np.fromiter((h for s in shingles for h in s), dtype=np.uint64, count=counts.sum())
+        # (shingles, permutations), wrapping uint64 arithmetic, top 32 bits kept
+        hashed = ((values[:, None] * a + b) >> np.uint64(32)).astype(np.uint32)
+        starts = np.r_[0, np.cumsum(counts)[:-1]]
+        signatures[start:start + len(shingles)] = np.minimum.reduceat(hashed, starts, axis=0)
+    return signatures
+
+
+def equal_key_edges(keys):
+    """Edges chaining together all positions whose keys are equal (one fewer edge than members)."""
+    order = np.argsort(keys, kind='stable')
+    same = keys[order[1:]] == keys[order[:-1]]
+    return order[:-1][same], order[1:][same]
+
+
+def union_find(n, left, right):
+    """
+    Cluster n nodes joined by the edges (left[i], right[i]). Each round hooks every edge's
+    root onto the smaller of its two roots, then compresses paths by pointer jumping.
+    Returns each node's label, the smallest node in its cluster.
+    """
+    parent = np.arange(n)
+    while len(left):
+        root_left, root_right = parent[left], parent[right]
+        pending = root_left != root_right
+        if not pending.any():
+            break
+        low = np.minimum(root_left[pending], root_right[pending])
+        np.minimum.at(parent, root_left[pending], low)
+        np.minimum.at(parent, root_right[pending], low)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+    return parent
+
+
+def address_groups(addresses):
+    """
+    Candidate group per unique address: same blocking key, or an LSH band collision between
+    addresses with the same house number and zip. Returns (groups, units) aligned with addresses.
+    """
+    parsed = [normalize_address(address) for address in addresses]
+    lines = [line for line, _, _ in parsed]
+    units = np.array([unit for _, unit, _ in parsed], dtype=object)
+    # LSH only links addresses with the same house number and zip: "12 somerset st" and
+    # "21 somerset st" share most of their 3-grams but are different buildings
+    places = pd.factorize(pd.Series([f"{line.split()[0] if line else ''}|{zip_code}"
+                                     for line, _, zip_code in parsed]))[0].astype(np.uint64)
+
+    keys = pd.factorize(pd.Series([blocking_key(*p) for p in parsed]))[0]
+    key_left, key_right = equal_key_edges(keys)
+    left, right = [key_left], [key_right]
+
+    signatures = minhash_signatures(lines).astype(np.uint64)
+    rows = NUM_PERMUTATIONS // BANDS
+    for band in range(BANDS):
+        # One uint64 per band and place; a false collision only costs extra comparisons later
+        band_key = places * np.uint64(0x9E3779B97F4A7C15) + np.uint64(band)
+        for value in signatures[:, band * rows:(band + 1) * rows].T:
+            band_key = band_key * np.uint64(0x100000001B3) ^ value
+        band_left, band_right = equal_key_edges(band_key)
+        left.append(band_left)
+        right.append(band_right)
+
+    groups = union_find(len(addresses), np.concatenate(left), np.concatenate(right))
+    return groups, units
+
+
+def url_keys(urls):
+    """64-bit hash per URL, 0 where there is none; cheaper to keep than the URLs themselves."""
+    keys = pd.util.hash_pandas_object(urls.astype(object), index=False).to_numpy()
+    return np.where(urls.notna().to_numpy(), keys, np.uint64(0))
+
+
+def cluster_rows(address_codes, addresses, urls, rent, bedrooms, bathrooms, sqft):
+    """
+    Core of find_duplicates on plain arrays: addresses as codes into the unique addresses,
+    urls as url_keys(). Returns each row's cluster label: the position of its last member.
+    """
+    n = len(address_codes)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    groups, units = address_groups(addresses)
+    group = groups[address_codes]
+    unit = units[address_codes]
+    rent = np.asarray(rent, dtype=np.float64)
+    sqft = np.asarray(sqft, dtype=np.float64)
+
+    # Sorted neighbourhood: within a group, compare each listing with the next ones by rent
+    order = np.lexsort((rent, group))
+    left, right = [], []
+    for offset in range(1, min(MAX_WINDOW, n - 1) + 1):
+        i, j = order[:-offset], order[offset:]
+        in_window = (group[i] == group[j]) & (rent[j] - rent[i] <= RENT_TOLERANCE * rent[j])
+        if not in_window.any():
+            break
+        i, j = i[in_window], j[in_window]
+        match = (
+            (np.abs(sqft[i] - sqft[j]) <= SQFT_TOLERANCE * np.maximum(sqft[i], sqft[j]))
+            & ((unit[i] == unit[j]) | (unit[i] == '') | (unit[j] == ''))
+            & (((bedrooms[i] == bedrooms[j]) & (bathrooms[i] == bathrooms[j]))
+               | ((urls[i] == urls[j]) & (urls[i] != 0)))
+        )
+        left.append(i[match])
+        right.append(j[match])
+
+    labels = union_find(n, np.concatenate(left or [[]]).astype(np.int64),
+                        np.concatenate(right or [[]]).astype(np.int64))
+    # Canonical copy: the last one in the input, as with repeated rows elsewhere
+    last = pd.Series(np.arange(n)).groupby(labels).transform('max').to_numpy()
+    return last
+
+
+def find_duplicates(df):
+    """
+    Canonical listing per row of a listings frame (address, rent, BR, Ba, sqft, url):
+    a Series aligned with df.index holding the index label of the row's canonical copy.
+    Rows that are their own canonical copy are the ones to keep.
+    """
+    address_codes, addresses = pd.factorize(df['address'].astype(str))
+    urls = url_keys(df['url']) if 'url' in df.columns else np.zeros(len(df), dtype=np.uint64)
+    positions = cluster_rows(address_codes, list(addresses), urls, df['rent'].to_numpy(),
+                             df['BR'].to_numpy(), df['Ba'].to_numpy(), df['sqft'].to_numpy())
+    return pd.Series(df.index.to_numpy()[positions], index=df.index, name='canonical_id')
+
+
+def dedupe_listings(df):
+    """Only the canonical copy of each listing."""
+    canonical = find_duplicates(df)
+    return df[canonical.to_numpy() == df.index.to_numpy()]
+
+
+def file_canonical_ids(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    find_duplicates over a whole CSV or Parquet file without holding it in memory: the ingest
+    stream is reduced to the matching columns, with each distinct address kept once and URLs
+    kept as hashes. Returns an array indexed by input row number; rows that failed validation
+    hold -1.
+    """
+    address_codes, urls, numbers, rows = [], [], [], []
+    address_index = {}
+    for batch in read_batches(path, chunk_size):
+        address_codes.append(np.fromiter((address_index.setdefault(a, len(address_index)) for a in batch['address']),
+                                         dtype=np.int64, count=len(batch)))
+        urls.append(url_keys(batch['url']))
+        numbers.append(batch[['rent', 'BR', 'Ba', 'sqft']])
+        rows.append(batch.index.to_numpy())
+
+    if not rows:
+        return np.empty(0, dtype=np.int64)
+    numbers = pd.concat(numbers)
+    rows = np.concatenate(rows)
+    positions = cluster_rows(np.concatenate(address_codes), list(address_index), np.concatenate(urls),
+                             numbers['rent'].to_numpy(), numbers['BR'].to_numpy(), numbers['Ba'].to_numpy(),
+                             numbers['sqft'].to_numpy())
+    canonical = np.full(rows.max() + 1, -1, dtype=np.int64)
+    canonical[rows] = rows[positions]
+    return canonical
+
+
+if __name__ == '__main__':
+    from data.listings import DEFAULT_CSV
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate listings")
+    parser.add_argument('--csv', default=DEFAULT_CSV, help="listings CSV or Parquet file")
+    parser.add_argument('--output', default=None,
+                        help="write row, canonical_id and the listing columns of every duplicated row here")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="rows read at a time")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("RUKINDAHOMELESS - NEAR-DUPLICATE LISTINGS")
+    print("=" * 70)
+
+    start_time = time.perf_counter()
+    canonical = file_canonical_ids(args.csv, args.chunk_size)
+    elapsed = time.perf_counter() - start_time
+
+    valid = canonical >= 0
+    rows = np.flatnonzero(valid)
+    sizes = pd.Series(canonical[valid]).value_counts()
+    duplicated = sizes[sizes > 1]
+    print(f"\n✅ {valid.sum():,} listings, {len(sizes):,} distinct units in {elapsed:.2f}s")
+    print(f"   {int(duplicated.sum() - len(duplicated)):,} duplicate rows in {len(duplicated):,} clusters "
+          f"(largest: {int(duplicated.max()) if len(duplicated) else 0})")
+
+    if args.output:
+        in_cluster = rows[np.isin(canonical[rows], duplicated.index)]
+        report = pd.DataFrame({'row': in_cluster, 'canonical_id': canonical[in_cluster]})
+        listings = pd.concat(batch[batch.index.isin(in_cluster)]
+                             for batch in read_batches(args.csv, args.chunk_size))
+        report = report.join(listings, on='row').sort_values(['canonical_id', 'row'])
+        report.to_csv(args.output, index=False)
+        print(f"📄 Clusters written to {args.output}")
+
+    print("\n" + "=" * 70 + "\n")
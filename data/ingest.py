@@ -0,0 +1,189 @@
+"""
+RUKindaHomeless - Streaming Ingest
+Reads a listings file (CSV or Parquet) of any size in bounded chunks, validates and coerces
+each chunk's columns in one vectorized pass, and yields clean typed batches. Rows that fail a
+check are appended to a quarantine CSV with their values as read, their row number in the
+input and every reason they were rejected, so a bad scrape can be fixed and re-run.
+
+Only one chunk is held at a time, so memory stays flat however large the file is.
+
+Usage (from a script one level below the repo root):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from data.ingest import Quarantine, read_batches, rejects_path
+    with Quarantine(rejects_path(path)) as quarantine:
+        for batch in read_batches(path, chunk_size=100000, quarantine=quarantine):
+            ...                   # address, rent, BR, Ba, sqft, url, source
+    print(f"{quarantine.rows} rows quarantined")
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['address', 'rent', 'BR', 'Ba', 'sqft', 'url', 'source']
+REQUIRED_COLUMNS = ['address', 'rent', 'BR', 'Ba', 'sqft']
+
+# Text columns are read as strings so a chunk's dtypes never depend on what happens to be
+# in it; rent is text in the scrapes anyway ("1,992")
+CSV_DTYPES = {'address': str, 'rent': str, 'url': str, 'source': str}
+
+# Inclusive bounds for the numeric columns; values outside them are quarantined, not loaded
+LIMITS = {
+    'rent': (1, 100000),
+    'BR': (0, 20),
+    'Ba': (0, 20),
+    'sqft': (1, 100000),
+}
+WHOLE_NUMBER_COLUMNS = ['BR', 'sqft']
+
+# Stored for rows the scraper could not attribute (partitions.py uses the same default)
+UNKNOWN_SOURCE = 'unknown'
+
+DEFAULT_CHUNK_SIZE = 100000
+
+
+def rejects_path(path):
+    """Default quarantine file for an input: <name>_rejects.csv beside it."""
+    return os.path.splitext(path)[0] + '_rejects.csv'
+
+
+def check_columns(columns):
+    """Raise ValueError if a required column is missing from the input."""
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"missing required column(s): {', '.join(missing)}")
+
+
+def read_columns(path):
+    """Column names of a CSV or Parquet file, without reading any rows."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).schema_arrow.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def to_number(values, thousands=False):
+    """Coerce a column to float64; anything unparseable becomes NaN."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(np.float64)
+    text = values.astype(str)
+    if thousands:
+        text = text.str.replace(',', '', regex=False)
+    return pd.to_numeric(text.str.strip(), errors='coerce').astype(np.float64)
+
+
+def validate_chunk(raw, first_row=0):
+    """
+    Validate and coerce one raw chunk. Returns (clean, rejects):
+      clean    address, rent (float32), BR (int32), Ba (float32), sqft (int32), url, source
+               (categorical), indexed by row number in the input
+      rejects  the raw rows that failed, with row and reason columns in front
+    """
+    raw = raw.set_axis(pd.RangeIndex(first_row, first_row + len(raw)))
+
+    # (reason, mask of failing rows)
+    checks = []
+    address = raw['address'].str.strip()
+    checks.append(('address: missing', address.isna() | (address == '')))
+
+    values = {}
+    for column, (low, high) in LIMITS.items():
+        number = to_number(raw[column], thousands=(column == 'rent'))
+        missing = raw[column].isna()
+        checks.append((f'{column}: missing', missing))
+        checks.append((f'{column}: not a number', number.isna() & ~missing))
+        checks.append((f'{column}: outside {low}-{high}', (number < low) | (number > high)))
+        if column in WHOLE_NUMBER_COLUMNS:
+            checks.append((f'{column}: not a whole number', number.notna() & (number % 1 != 0)))
+        values[column] = number
+
+    bad = np.zeros(len(raw), dtype=bool)
+    for _, mask in checks:
+        bad |= mask.to_numpy()
+
+    rejects = raw[bad]
+    if len(rejects):
+        failed = [(reason, mask.to_numpy()[bad]) for reason, mask in checks if mask.to_numpy()[bad].any()]
+        reasons = ['; '.join(reason for reason, mask in failed if mask[i]) for i in range(len(rejects))]
+        rejects = rejects.assign(reason=reasons)
+        rejects.insert(0, 'row', rejects.index)
+
+    ok = ~bad
+    source = raw['source'].str.strip() if 'source' in raw.columns else pd.Series(np.nan, index=raw.index)
+    url = raw['url'] if 'url' in raw.columns else pd.Series(np.nan, index=raw.index)
+    clean = pd.DataFrame({
+        'address': address[ok],
+        'rent': values['rent'][ok].astype(np.float32),
+        'BR': values['BR'][ok].astype(np.int32),
+        'Ba': values['Ba'][ok].astype(np.float32),
+        'sqft': values['sqft'][ok].astype(np.int32),
+        'url': url[ok],
+        'source': source[ok].fillna(UNKNOWN_SOURCE).replace('', UNKNOWN_SOURCE).astype('category'),
+    })
+    return clean, rejects
+
+
+def read_raw(path, chunk_size):
+    """Yield raw DataFrames of at most chunk_size rows from a CSV or Parquet file."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=CSV_DTYPES)
+
+
+def read_batches(path, chunk_size=DEFAULT_CHUNK_SIZE, quarantine=None):
+    """
+    Yield clean batches (see validate_chunk) of at most chunk_size rows. Rejected rows go to
+    quarantine when one is given and are dropped otherwise.
+    """
+    check_columns(read_columns(path))
+    first_row = 0
+    for raw in read_raw(path, chunk_size):
+        clean, rejects = validate_chunk(raw, first_row)
+        first_row += len(raw)
+        if quarantine is not None:
+            quarantine.write(rejects)
+        if len(clean):
+            yield clean
+
+
+class Quarantine:
+    """
+    Appends rejected rows to a CSV. The file is only created once there is something to put
+    in it, and an old one from a previous run is removed up front so it never looks current.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.reasons = {}
+        self.file = None
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, rejects):
+        if not len(rejects):
+            return
+        if self.file is None:
+            self.file = open(self.path, 'w', newline='')
+            rejects.to_csv(self.file, index=False)
+        else:
+            rejects.to_csv(self.file, index=False, header=False)
+        self.rows += len(rejects)
+        for reasons in rejects['reason']:
+            for reason in reasons.split('; '):
+                self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,132 @@
+"""
+RUKindaHomeless - Shared Listings Loader
+Parses and validates listings.csv once (through the streaming ingest in ingest.py, which
+quarantines bad rows to listings_rejects.csv) and marks near-duplicates (dedup.py), then keeps
+a typed Arrow IPC snapshot next to it (data/.cache/) that later runs memory-map instead of
+re-parsing the CSV text.
+
+Usage (from a script one level below the repo root):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from data.listings import load_listings
+    df = load_listings()          # or load_listings(args.csv)
+    df = load_listings(dedupe=True)   # one row per unit
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # the cache is an optimization; fall back to parsing every time
+    pa = None
+
+from data.dedup import find_duplicates
+from data.ingest import COLUMNS, Quarantine, read_batches, rejects_path
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CSV = os.path.join(DATA_DIR, 'listings.csv')
+
+# Bump when the cleaning in ingest.py or the matching in dedup.py changes so stale
+# snapshots are rebuilt
+CACHE_VERSION = 3
+
+
+def file_fingerprint(path):
+    """SHA-256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_paths(csv_path):
+    """Snapshot and metadata paths for a CSV, kept in a .cache folder beside it."""
+    csv_path = os.path.abspath(csv_path)
+    cache_dir = os.path.join(os.path.dirname(csv_path), '.cache')
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f'{stem}.arrow'), os.path.join(cache_dir, f'{stem}.json')
+
+
+def read_snapshot(csv_path):
+    """Return the cached frame if the snapshot still matches the CSV, else None."""
+    snapshot_path, meta_path = cache_paths(csv_path)
+    if not (os.path.exists(snapshot_path) and os.path.exists(meta_path)):
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get('version') != CACHE_VERSION:
+        return None
+
+    stat = os.stat(csv_path)
+    if (meta['size'], meta['mtime_ns']) != (stat.st_size, stat.st_mtime_ns):
+        # Touched but maybe not changed: fall back to the content hash
+        if meta['size'] != stat.st_size or meta['sha256'] != file_fingerprint(csv_path):
+            return None
+        meta['mtime_ns'] = stat.st_mtime_ns
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+
+    with pa.memory_map(snapshot_path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def write_snapshot(csv_path, df):
+    """Write the cleaned frame as an uncompressed Arrow IPC file so it can be memory-mapped."""
+    snapshot_path, meta_path = cache_paths(csv_path)
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = snapshot_path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, snapshot_path)
+
+    stat = os.stat(csv_path)
+    with open(meta_path, 'w') as f:
+        json.dump({
+            'version': CACHE_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_fingerprint(csv_path),
+            'rows': len(df),
+        }, f)
+
+
+def load_listings(csv_path=DEFAULT_CSV, use_cache=True, dedupe=False):
+    """
+    Load listings with rent already cleaned and compact dtypes applied.
+    Columns keep their CSV names: address, rent, BR, Ba, sqft, url, source, plus canonical_id,
+    the position of the row standing in for each listing's near-duplicates.
+    Rows that fail validation are left out and written to <csv>_rejects.csv.
+    With dedupe, only canonical rows are returned (the index keeps their positions).
+    """
+    df = read_snapshot(csv_path) if use_cache and pa is not None else None
+    if df is None:
+        df = parse_listings(csv_path)
+        if use_cache and pa is not None:
+            write_snapshot(csv_path, df)
+    if dedupe:
+        df = df[df['canonical_id'].to_numpy() == np.arange(len(df))]
+    return df
+
+
+def parse_listings(csv_path):
+    """Validate the CSV chunk by chunk, then mark near-duplicates."""
+    # Chunks are typed as they are read, so the whole file never exists as raw text columns
+    with Quarantine(rejects_path(csv_path)) as quarantine:
+        batches = list(read_batches(csv_path, quarantine=quarantine))
+    if batches:
+        df = pd.concat(batches, ignore_index=True)
+        df['source'] = df['source'].astype('category')
+    else:
+        df = pd.DataFrame(columns=COLUMNS)
+    df['canonical_id'] = find_duplicates(df).to_numpy()
+    return df
@@ -0,0 +1,245 @@
+"""
+RUKindaHomeless - Database Access
+One place for connection settings, a shared connection pool, server-side cursors and
+prepared statements, used by every database script.
+
+Connection settings start from the local defaults below, then database/db.json (or the file
+named by RUKH_DB_CONFIG) is applied, then environment variables:
+    RUKH_DB_NAME, RUKH_DB_USER, RUKH_DB_PASSWORD, RUKH_DB_HOST, RUKH_DB_PORT,
+    RUKH_DB_POOL_MIN, RUKH_DB_POOL_MAX, RUKH_DB_POOL_TIMEOUT
+libpq's own variables (PGOPTIONS, PGSSLMODE, ...) still apply on top.
+
+Usage (from database/, or with database/ on sys.path):
+    import db
+    with db.connection() as conn:          # borrowed from the pool, committed on success
+        cursor = conn.cursor()
+        db.execute_prepared(cursor, 'best_value', queries.BEST_VALUE)
+        for rows in db.stream(conn, "SELECT * FROM listings"):   # server-side cursor
+            ...
+"""
+
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db.json')
+
+DEFAULTS = {
+    'dbname': 'rukindahomeless',
+    'user': 'yakshbha',
+    'password': '',
+    'host': 'localhost',
+    'port': 5432,
+    'pool_min': 1,
+    'pool_max': 8,
+    'pool_timeout': 30.0,
+}
+
+ENV_VARS = {
+    'RUKH_DB_NAME': 'dbname',
+    'RUKH_DB_USER': 'user',
+    'RUKH_DB_PASSWORD': 'password',
+    'RUKH_DB_HOST': 'host',
+    'RUKH_DB_PORT': 'port',
+    'RUKH_DB_POOL_MIN': 'pool_min',
+    'RUKH_DB_POOL_MAX': 'pool_max',
+    'RUKH_DB_POOL_TIMEOUT': 'pool_timeout',
+}
+
+# Rows per round trip when streaming from a server-side cursor
+STREAM_CHUNK_SIZE = 10000
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def load_settings(**overrides):
+    """Defaults, then the JSON config file, then environment variables, then overrides."""
+    settings = dict(DEFAULTS)
+    config_path = os.environ.get('RUKH_DB_CONFIG', CONFIG_PATH)
+    if os.path.exists(config_path):
+        with open(config_path) as f:
+            settings.update(json.load(f))
+    for var, key in ENV_VARS.items():
+        if var in os.environ:
+            settings[key] = os.environ[var]
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+
+    settings['port'] = int(settings['port'])
+    settings['pool_min'] = int(settings['pool_min'])
+    settings['pool_max'] = int(settings['pool_max'])
+    settings['pool_timeout'] = float(settings['pool_timeout'])
+    return settings
+
+
+def connect_kwargs(settings):
+    return {key: settings[key] for key in ['dbname', 'user', 'password', 'host', 'port']}
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """A connection that remembers which statements it has PREPAREd."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+class BlockingPool(psycopg2.pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool raises PoolError once maxconn connections are out; this waits
+    (up to timeout seconds) for one to come back instead, so concurrent jobs queue up
+    rather than fail or open more connections than the server allows.
+    """
+
+    def __init__(self, minconn, maxconn, timeout, **kwargs):
+        self.slots = threading.BoundedSemaphore(maxconn)
+        self.timeout = timeout
+        super().__init__(minconn, maxconn, connection_factory=PooledConnection, **kwargs)
+
+    def getconn(self, key=None):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise psycopg2.pool.PoolError(f"no connection free after {self.timeout:.0f}s")
+        try:
+            return super().getconn(key)
+        except Exception:
+            self.slots.release()
+            raise
+
+    def putconn(self, conn, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self.slots.release()
+
+    def _putconn(self, conn, key=None, close=False):
+        """
+        The base class closes a returned connection once minconn are idle, so with pool_min=1
+        most borrows would reconnect and lose their prepared statements. Keep every healthy
+        connection idle instead; the slots semaphore still caps the total at maxconn.
+        """
+        if self.closed:
+            raise psycopg2.pool.PoolError("connection pool is closed")
+        if key is None:
+            key = self._rused.get(id(conn))
+            if key is None:
+                raise psycopg2.pool.PoolError("trying to put unkeyed connection")
+
+        if close or conn.closed or conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            conn.close()
+        else:
+            if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            self._pool.append(conn)
+
+        del self._used[key]
+        del self._rused[id(conn)]
+
+
+def get_pool(**overrides):
+    """The process-wide pool, created on first use. Overrides only apply to that first call."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            settings = load_settings(**overrides)
+            _pool = BlockingPool(settings['pool_min'], settings['pool_max'], settings['pool_timeout'],
+                                 **connect_kwargs(settings))
+        return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def connect():
+    """Borrow a pooled connection for a whole script run; hand it back with release()."""
+    return get_pool().getconn()
+
+
+def release(conn):
+    """
+    Return a connection from connect(). Uncommitted work is discarded and session settings
+    such as search_path are reset; prepared statements are kept for the next borrower.
+    """
+    if not conn.closed:
+        try:
+            conn.rollback()
+            with conn.cursor() as cursor:
+                cursor.execute("RESET ALL")
+            conn.commit()
+        except psycopg2.Error:
+            conn.close()
+    get_pool().putconn(conn, close=bool(conn.closed))
+
+
+@contextmanager
+def connection():
+    """Borrow a pooled connection: commits if the block succeeds, rolls back if it raises."""
+    conn = connect()
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        release(conn)
+
+
+def stream(conn, sql, params=None, chunk_size=STREAM_CHUNK_SIZE, name='rukh_stream'):
+    """
+    Run sql on a server-side (named) cursor and yield lists of at most chunk_size rows, so
+    a large result set never has to fit in client memory. Must run inside a transaction,
+    which is psycopg2's default.
+    """
+    with conn.cursor(name=name) as cursor:
+        cursor.itersize = chunk_size
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+
+def _numbered_placeholders(sql):
+    """%s placeholders -> $1, $2, ... as PREPARE expects."""
+    numbers = iter(range(1, sql.count('%s') + 1))
+    return re.sub(r'%s', lambda _: f'${next(numbers)}', sql)
+
+
+def execute_prepared(cursor, name, sql, params=()):
+    """
+    Execute sql as the prepared statement `name`, preparing it the first time this connection
+    sees it, so repeated queries skip parsing and planning. sql uses %s placeholders.
+    """
+    conn = cursor.connection
+    prepared = getattr(conn, 'prepared', None)
+    if prepared is None or name not in prepared:
+        cursor.execute(f"PREPARE {name} AS {_numbered_placeholders(sql)}")
+        if prepared is not None:
+            prepared.add(name)
+    if params:
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    else:
+        cursor.execute(f"EXECUTE {name}")
+    return cursor
+
+
+def plan_nodes(plan):
+    """Flatten a JSON plan into 'Node Type [on relation/index]' strings, depth first."""
+    label = plan['Node Type']
+    if 'Index Name' in plan:
+        label += f" using {plan['Index Name']}"
+    elif 'Relation Name' in plan:
+        label += f" on {plan['Relation Name']}"
+    nodes = [label]
+    for child in plan.get('Plans', []):
+        nodes.extend(plan_nodes(child))
+    return nodes
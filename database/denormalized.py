@@ -0,0 +1,195 @@
+"""
+RUKindaHomeless - Denormalized Listings Layout
+Alternative storage layout that keeps every listing metric on the listings row itself, so
+the analytical queries read one table instead of joining listing_stats:
+
+    price_per_sqft, price_per_bedroom          generated columns (always in step with the row)
+    avg_rent_for_bedrooms, is_above_average,   maintained by statement triggers that recompute
+    value_score                                only the bedroom groups a statement touched, and
+                                               only write rows whose values actually changed
+
+listing_stats becomes a view over listings, so existing two-table queries keep working. The
+layout can't be combined with partitions.py's monthly partitions; each migrate refuses to run
+once the other layout is in place.
+
+    python denormalized.py migrate
+
+explain_queries.py builds this layout next to the two-table one and compares the plans of
+queries.DENORMALIZED_QUERIES with queries.ANALYTICAL_QUERIES.
+"""
+
+import argparse
+import sys
+import time
+
+import db
+import partitions
+import queries
+
+COLUMNS_DDL = """
+    ALTER TABLE listings
+        ADD COLUMN price_per_sqft DECIMAL(6,2)
+            GENERATED ALWAYS AS (ROUND(monthly_rent::numeric / NULLIF(square_feet, 0), 2)) STORED,
+        ADD COLUMN price_per_bedroom DECIMAL(10,2)
+            GENERATED ALWAYS AS (CASE WHEN bedrooms > 0 THEN ROUND(monthly_rent::numeric / bedrooms, 2)
+                                      ELSE monthly_rent END) STORED,
+        ADD COLUMN avg_rent_for_bedrooms DECIMAL(10,2),
+        ADD COLUMN is_above_average BOOLEAN,
+        ADD COLUMN value_score DECIMAL(3,1)
+"""
+
+# Same roles as the listing_stats indexes in schema.sql, on the listings columns
+INDEXES = [
+    "CREATE INDEX idx_listings_value_score ON listings(value_score DESC)",
+    "CREATE INDEX idx_listings_price_per_sqft ON listings(price_per_sqft DESC)",
+    "CREATE INDEX idx_listings_bedrooms_value_score ON listings(bedrooms, value_score DESC)",
+]
+
+# Group-dependent metrics for the given bedroom groups (all when NULL). The IS DISTINCT FROM
+# filter keeps untouched rows out of the UPDATE, so a statement that leaves a group's average
+# alone only rewrites its own rows. rukh.derived_update tells the listings triggers (including
+# the summary trigger in schema.sql) to ignore this UPDATE.
+REFRESH_FUNCTION = f"""
+    CREATE FUNCTION refresh_listing_values(groups INT[]) RETURNS void AS $$
+    BEGIN
+        PERFORM set_config('rukh.derived_update', 'on', true);
+        UPDATE listings l SET
+            avg_rent_for_bedrooms = ROUND(avg_prices.avg_rent, 2),
+            is_above_average = l.monthly_rent > avg_prices.avg_rent,
+            value_score = {queries.VALUE_SCORE_CASE}
+        FROM (
+            SELECT bedrooms, total_rent / num_listings as avg_rent
+            FROM bedroom_summary
+            WHERE groups IS NULL OR bedrooms = ANY(groups)
+        ) avg_prices
+        WHERE l.bedrooms = avg_prices.bedrooms
+          AND (l.avg_rent_for_bedrooms, l.is_above_average, l.value_score) IS DISTINCT FROM
+              (ROUND(avg_prices.avg_rent, 2), l.monthly_rent > avg_prices.avg_rent, {queries.VALUE_SCORE_CASE});
+        PERFORM set_config('rukh.derived_update', 'off', true);
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+# Named after the summary triggers so they fire after them, once bedroom_summary is current
+TRIGGER_FUNCTION = """
+    CREATE FUNCTION listings_values_trigger() RETURNS trigger AS $$
+    DECLARE
+        groups INT[];
+    BEGIN
+        IF current_setting('rukh.derived_update', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'INSERT' THEN
+            groups := ARRAY(SELECT DISTINCT bedrooms FROM new_rows);
+        ELSIF TG_OP = 'DELETE' THEN
+            groups := ARRAY(SELECT DISTINCT bedrooms FROM old_rows);
+        ELSE
+            groups := ARRAY(SELECT bedrooms FROM new_rows UNION SELECT bedrooms FROM old_rows);
+        END IF;
+        PERFORM refresh_listing_values(groups);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = [
+    """CREATE TRIGGER listings_values_insert AFTER INSERT ON listings
+       REFERENCING NEW TABLE AS new_rows
+       FOR EACH STATEMENT EXECUTE FUNCTION listings_values_trigger()""",
+    """CREATE TRIGGER listings_values_update AFTER UPDATE ON listings
+       REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+       FOR EACH STATEMENT EXECUTE FUNCTION listings_values_trigger()""",
+    """CREATE TRIGGER listings_values_delete AFTER DELETE ON listings
+       REFERENCING OLD TABLE AS old_rows
+       FOR EACH STATEMENT EXECUTE FUNCTION listings_values_trigger()""",
+]
+
+STATS_VIEW = """
+    CREATE VIEW listing_stats AS
+    SELECT listing_id, price_per_sqft, price_per_bedroom, avg_rent_for_bedrooms, is_above_average,
+           value_score, created_at, created_at AS listed_at
+    FROM listings
+"""
+
+
+def is_denormalized(cursor):
+    """True once listings carries its own value columns."""
+    cursor.execute("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_attribute
+            WHERE attrelid = to_regclass('listings') AND attname = 'value_score' AND NOT attisdropped
+        )
+    """)
+    return cursor.fetchone()[0]
+
+
+def apply_layout(cursor, replace_stats=True):
+    """
+    Add the columns, indexes and triggers to listings and fill the group-dependent columns.
+    With replace_stats, listing_stats is swapped for a view over listings.
+    """
+    cursor.execute(COLUMNS_DDL)
+    for statement in INDEXES + [REFRESH_FUNCTION, TRIGGER_FUNCTION] + TRIGGERS:
+        cursor.execute(statement)
+    cursor.execute("SELECT refresh_listing_values(NULL)")
+    if replace_stats:
+        cursor.execute("DROP TABLE listing_stats")
+        cursor.execute(STATS_VIEW)
+    cursor.execute("ANALYZE listings")
+
+
+def vacuum(conn):
+    """
+    The backfill UPDATE leaves a dead copy of every row behind; rewrite the table compactly
+    so scans and the planner's cost estimates match a freshly loaded one. VACUUM can't run
+    inside a transaction, so this commits first.
+    """
+    conn.commit()
+    conn.autocommit = True
+    try:
+        conn.cursor().execute("VACUUM (FULL, ANALYZE) listings")
+    finally:
+        conn.autocommit = False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Move listing metrics onto the listings table")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('migrate', help="add the columns and triggers, and replace listing_stats with a view")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("RUKINDAHOMELESS - DENORMALIZED LAYOUT")
+    print("=" * 70)
+
+    try:
+        conn = db.connect()
+        cursor = conn.cursor()
+    except Exception as e:
+        print(f"\n❌ Could not connect to database: {e}")
+        sys.exit(1)
+
+    if is_denormalized(cursor):
+        print("\n❌ listings already carries its value columns")
+        sys.exit(1)
+    # New month partitions of listing_stats (partitions.py ensure, run by load_data.py) need it
+    # to stay a table
+    if partitions.is_partitioned(cursor):
+        print("\n❌ listings is partitioned (partitions.py); the denormalized layout needs the "
+              "unpartitioned tables")
+        sys.exit(1)
+
+    print("\n⏳ Adding generated and trigger-maintained columns to listings...")
+    start_time = time.perf_counter()
+    apply_layout(cursor)
+    conn.commit()
+    vacuum(conn)
+    print(f"✅ Migrated in {time.perf_counter() - start_time:.2f}s; listing_stats is now a view")
+
+    cursor.execute("SELECT COUNT(*), COUNT(value_score) FROM listings")
+    total, scored = cursor.fetchone()
+    print(f"   {scored:,} of {total:,} listings scored")
+
+    cursor.close()
+    db.release(conn)
+    print("\n" + "=" * 70 + "\n")
@@ -0,0 +1,186 @@
+"""
+RUKindaHomeless - Query Plan Comparison
+Builds a synthetic listings dataset in a scratch schema, then runs EXPLAIN ANALYZE for each
+query in queries.ANALYTICAL_QUERIES twice: once with the original single-column indexes and
+once with the index set in schema.sql. It then adds denormalized.py's layout and runs
+queries.DENORMALIZED_QUERIES, the join-free versions of the same queries. Plans and timings
+are written to a JSON report.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+import db
+import denormalized
+import queries
+
+# The index set schema.sql shipped with before it was tuned to the queries
+LEGACY_INDEXES = [
+    "CREATE INDEX idx_rent ON listings(monthly_rent)",
+    "CREATE INDEX idx_bedrooms ON listings(bedrooms)",
+    "CREATE INDEX idx_source ON listings(source)",
+    "CREATE INDEX idx_sqft ON listings(square_feet)",
+]
+
+# Street names and sources sampled for the synthetic rows
+SYNTHETIC_LISTINGS = """
+    INSERT INTO listings (address, monthly_rent, bedrooms, bathrooms, square_feet, source, listing_url)
+    SELECT
+        (10 + mod(i, 990)) || ' ' ||
+            (ARRAY['Somerset St', 'Easton Ave', 'Hamilton St', 'George St', 'Livingston Ave',
+                   'Paterson St', 'Paul Robeson Blvd', 'Mine St'])[1 + mod(i, 8)] ||
+            ', New Brunswick, NJ 08901',
+        ROUND((900 + br * 550 + random() * 1200)::numeric, 0),
+        br,
+        CASE WHEN br <= 1 THEN 1 ELSE 1 + (random() * 2)::int * 0.5 END,
+        (350 + br * 300 + random() * 400)::int,
+        (ARRAY['craigslist', 'Redfin', 'Trulia', 'The Vue', 'The Edge', 'Skyline Tower',
+               'Premiere Residences'])[1 + mod(i, 7)],
+        'https://example.com/listing/' || i
+    FROM (
+        SELECT i, (ARRAY[0, 1, 1, 1, 2, 2, 2, 3, 3, 5])[1 + floor(random() * 10)::int] AS br
+        FROM generate_series(1, %s) AS i
+    ) rows
+"""
+
+
+def schema_indexes(schema_sql):
+    """CREATE INDEX statements from schema.sql, keyed by index name."""
+    statements = re.findall(r'CREATE (?:UNIQUE )?INDEX \w+ ON [^;]+', schema_sql)
+    return {re.search(r'INDEX (\w+)', s).group(1): s for s in statements}
+
+
+def apply_indexes(cursor, schema_name, statements):
+    """Drop every secondary index in the scratch schema, then create the given set."""
+    cursor.execute("""
+        SELECT i.relname FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        JOIN pg_namespace n ON n.oid = i.relnamespace
+        WHERE n.nspname = %s AND NOT x.indisprimary
+    """, (schema_name,))
+    for (index_name,) in cursor.fetchall():
+        cursor.execute(f'DROP INDEX "{schema_name}"."{index_name}"')
+    for statement in statements:
+        cursor.execute(statement)
+    cursor.execute("ANALYZE listings")
+    cursor.execute("ANALYZE listing_stats")
+
+
+def explain(cursor, sql, repeat):
+    """EXPLAIN ANALYZE a query repeat times; keep the plan of the median run."""
+    runs = []
+    for _ in range(repeat):
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql)
+        result = cursor.fetchone()[0][0]
+        runs.append(result)
+    runs.sort(key=lambda r: r['Execution Time'])
+    median = runs[len(runs) // 2]
+    return {
+        'execution_ms': round(statistics.median(r['Execution Time'] for r in runs), 3),
+        'planning_ms': round(median['Planning Time'], 3),
+        'nodes': db.plan_nodes(median['Plan']),
+        'plan': median['Plan'],
+    }
+
+
+parser = argparse.ArgumentParser(description="Compare query plans for the legacy and current index sets")
+parser.add_argument('--rows', type=int, default=1000000, help="synthetic listings to generate")
+parser.add_argument('--repeat', type=int, default=3, help="EXPLAIN ANALYZE runs per query (median is reported)")
+parser.add_argument('--schema', default='explain_bench', help="scratch schema to build the dataset in")
+parser.add_argument('--output', default='explain_report.json', help="where to write the JSON report")
+parser.add_argument('--keep', action='store_true', help="keep the scratch schema afterwards")
+args = parser.parse_args()
+
+print("=" * 70)
+print("RUKINDAHOMELESS - QUERY PLAN COMPARISON")
+print("=" * 70)
+
+schema_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+with open(schema_path) as f:
+    schema_sql = f.read()
+
+try:
+    conn = db.connect()
+    cursor = conn.cursor()
+except Exception as e:
+    print(f"\n❌ Could not connect to database: {e}")
+    sys.exit(1)
+
+# Build the scratch copy of the schema and fill it
+print(f"\n🏗️  Creating schema '{args.schema}' with {args.rows:,} synthetic listings...")
+start_time = time.perf_counter()
+cursor.execute(f'DROP SCHEMA IF EXISTS "{args.schema}" CASCADE')
+cursor.execute(f'CREATE SCHEMA "{args.schema}"')
+cursor.execute(f'SET search_path TO "{args.schema}"')
+cursor.execute(schema_sql)
+cursor.execute(SYNTHETIC_LISTINGS, (args.rows,))
+cursor.execute(queries.LISTING_STATS.format(group_filter="", row_filter=""))
+conn.commit()
+print(f"✅ Dataset ready in {time.perf_counter() - start_time:.1f}s")
+
+index_sets = {
+    'legacy': LEGACY_INDEXES,
+    'current': list(schema_indexes(schema_sql).values()),
+}
+
+report = {
+    'rows': args.rows,
+    'repeat': args.repeat,
+    'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    'index_sets': index_sets,
+    'queries': {name: {'sql': ' '.join(sql.split())} for name, sql in queries.ANALYTICAL_QUERIES},
+}
+
+for set_name, statements in index_sets.items():
+    print(f"\n🔧 Building '{set_name}' index set ({len(statements)} indexes)...")
+    apply_indexes(cursor, args.schema, statements)
+    conn.commit()
+
+    for name, sql in queries.ANALYTICAL_QUERIES:
+        report['queries'][name][set_name] = explain(cursor, sql, args.repeat)
+        print(f"   {name:<28} {report['queries'][name][set_name]['execution_ms']:>10.2f} ms")
+
+# Same data with the metrics folded into listings; listing_stats stays for the runs above
+print("\n🔧 Building the denormalized layout...")
+start_time = time.perf_counter()
+denormalized.apply_layout(cursor, replace_stats=False)
+denormalized.vacuum(conn)
+print(f"   done in {time.perf_counter() - start_time:.1f}s")
+report['index_sets']['denormalized'] = denormalized.INDEXES
+for name, sql in queries.DENORMALIZED_QUERIES:
+    report['queries'][name]['denormalized_sql'] = ' '.join(sql.split())
+    report['queries'][name]['denormalized'] = explain(cursor, sql, args.repeat)
+    print(f"   {name:<28} {report['queries'][name]['denormalized']['execution_ms']:>10.2f} ms")
+
+if not args.keep:
+    cursor.execute(f'DROP SCHEMA "{args.schema}" CASCADE')
+    conn.commit()
+
+cursor.close()
+db.release(conn)
+
+with open(args.output, 'w') as f:
+    json.dump(report, f, indent=2, default=str)
+
+# Before/after summary
+print("\n" + "=" * 70)
+print("RESULTS")
+print("=" * 70)
+print(f"\n{'Query':<28} {'Legacy (ms)':<13} {'Current (ms)':<13} {'Denorm (ms)':<13} {'Speedup':<8}")
+print("-" * 70)
+for name, result in report['queries'].items():
+    before = result['legacy']['execution_ms']
+    after = result['current']['execution_ms']
+    denorm = result['denormalized']['execution_ms']
+    speedup = before / min(after, denorm) if min(after, denorm) > 0 else float('inf')
+    print(f"{name:<28} {before:<13.2f} {after:<13.2f} {denorm:<13.2f} {speedup:.1f}x")
+    print(f"   two tables: {' → '.join(result['current']['nodes'][:4])}")
+    print(f"   one table:  {' → '.join(result['denormalized']['nodes'][:4])}")
+
+print(f"\n✅ Report written to {args.output}")
+print("=" * 70 + "\n")
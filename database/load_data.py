@@ -1,14 +1,290 @@
+import numpy as np
 import pandas as pd
 import psycopg2
+import psycopg2.extras
+import db
+import denormalized
+import partitions
+import queries
+import argparse
+import io
 import sys
 import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data.dedup import file_canonical_ids
+from data.ingest import DEFAULT_CHUNK_SIZE, Quarantine, check_columns, read_batches, read_columns, rejects_path
+
+# Columns written to the listings table, in COPY/INSERT order
+LISTING_COLUMNS = ['address', 'monthly_rent', 'bedrooms', 'bathrooms', 'square_feet', 'source', 'listing_url']
+
+INSERT_SQL = """
+    INSERT INTO listings (address, monthly_rent, bedrooms, bathrooms, square_feet, source, listing_url)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+COPY_SQL = "COPY {table} (" + ', '.join(LISTING_COLUMNS) + ") FROM STDIN WITH (FORMAT csv)"
+
+# Natural key of a listing: the same unit scraped again has the same URL (or address when
+# there is no URL), bedroom count, bathrooms and size. Must match idx_listing_natural_key.
+# URL + bedrooms alone is not enough: building pages on trulia share one URL across units.
+NATURAL_KEY_SQL = "(COALESCE(listing_url, address)), bedrooms, bathrooms, square_feet"
+
+
+def table_rows(batch):
+    """A validated ingest batch (see data/ingest.py) in the listings table layout."""
+    return pd.DataFrame({
+        'address': batch['address'],
+        'monthly_rent': batch['rent'].astype(float).round(2),
+        'bedrooms': batch['BR'].astype(int),
+        'bathrooms': batch['Ba'].astype(float).round(1),
+        'square_feet': batch['sqft'].astype(int),
+        'source': batch['source'].astype(str),
+        'listing_url': batch['url'].astype(object).where(batch['url'].notna(), None),
+    })
+
+
+def canonical_batches(batches, canonical):
+    """Drop rows that have a near-duplicate standing in for them (see data/dedup.py)."""
+    for batch in batches:
+        rows = batch.index.to_numpy()
+        yield batch[canonical[rows] == rows]
+
+
+def copy_rows(cursor, rows, table='listings'):
+    """Stream a block of cleaned rows into a table with COPY FROM STDIN."""
+    buffer = io.StringIO()
+    rows.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cursor.copy_expert(COPY_SQL.format(table=table), buffer)
+
+
+def insert_values(cursor, rows, table='listings'):
+    """Insert a block of cleaned rows with a single multi-row INSERT ... VALUES."""
+    psycopg2.extras.execute_values(
+        cursor,
+        f"INSERT INTO {table} ({', '.join(LISTING_COLUMNS)}) VALUES %s",
+        list(rows.astype(object).itertuples(index=False, name=None)),
+        page_size=len(rows)
+    )
+
+
+def load_batch(cursor, rows, write):
+    """
+    Write one batch inside a savepoint. If the batch fails, roll it back and bisect it
+    so only the offending rows are dropped instead of falling back to row-by-row inserts.
+    Returns (inserted, errors).
+    """
+    cursor.execute("SAVEPOINT load_batch")
+    try:
+        write(cursor, rows)
+        cursor.execute("RELEASE SAVEPOINT load_batch")
+        return len(rows), 0
+    except psycopg2.Error as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT load_batch")
+        cursor.execute("RELEASE SAVEPOINT load_batch")
+        if len(rows) == 1:
+            print(f"\n⚠️  Error on row {rows.index[0]}: {str(e).strip().splitlines()[0]}")
+            return 0, 1
+
+    middle = len(rows) // 2
+    left = load_batch(cursor, rows.iloc[:middle], write)
+    right = load_batch(cursor, rows.iloc[middle:], write)
+    return left[0] + right[0], left[1] + right[1]
+
+
+def load_row_by_row(cursor, batches):
+    """Original one-INSERT-per-listing loop, kept for comparison with the bulk modes."""
+    inserted = 0
+    errors = 0
+
+    for idx, row in (item for df in batches for item in df.iterrows()):
+        try:
+            cursor.execute("SAVEPOINT load_row")
+            cursor.execute(INSERT_SQL, (
+                str(row['address']),
+                float(str(row['rent']).replace(',', '')),  # Fixed: 'rent' instead of 'Rent', handle commas
+                int(row['BR']),
+                float(row['Ba']),
+                int(row['sqft']),
+                str(row['source']),
+                str(row['url']) if 'url' in row and pd.notna(row['url']) else None
+            ))
+            cursor.execute("RELEASE SAVEPOINT load_row")
+            inserted += 1
+
+            if (inserted % 10 == 0):
+                print(f"   Inserted {inserted:,} listings...", end='\r')
+
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT load_row")
+            errors += 1
+            print(f"\n⚠️  Error on row {idx}: {e}")
+            continue
+
+    return inserted, errors
+
+
+def stage_listings(cursor, batches, write, batch_size):
+    """
+    Write the validated chunks into a temporary listings_staging table, batch_size rows at a
+    time, then keep the last occurrence of each natural key in listings_latest. Repeats are
+    resolved in the database because a scrape can repeat a listing anywhere in the file, not
+    just within one chunk. Returns (staged, repeated, errors).
+    """
+    cursor.execute(f"""
+        CREATE TEMP TABLE listings_staging ON COMMIT DROP AS
+        SELECT {', '.join(LISTING_COLUMNS)} FROM listings WITH NO DATA
+    """)
+    cursor.execute("ALTER TABLE listings_staging ADD COLUMN staged_seq BIGSERIAL")
+    staged = 0
+    errors = 0
+    for batch in batches:
+        rows = table_rows(batch)
+        for start in range(0, len(rows), batch_size):
+            batch_staged, batch_errors = load_batch(cursor, rows.iloc[start:start + batch_size],
+                                                    lambda cur, block: write(cur, block, 'listings_staging'))
+            staged += batch_staged
+            errors += batch_errors
+            print(f"   Staged {staged:,} listings...", end='\r')
+
+    cursor.execute(f"""
+        CREATE TEMP TABLE listings_latest ON COMMIT DROP AS
+        SELECT DISTINCT ON ({NATURAL_KEY_SQL}) *
+        FROM listings_staging
+        ORDER BY {NATURAL_KEY_SQL}, staged_seq DESC
+    """)
+    return cursor.rowcount, staged - cursor.rowcount, errors
+
+
+def load_bulk(cursor, batches, mode, batch_size):
+    """
+    Stage the validated chunks using COPY or execute_values, then insert them into listings
+    in file order with one INSERT ... SELECT. Listings already in the table are counted as
+    errors, as they were when each batch went straight into listings.
+    """
+    write = copy_rows if mode == 'copy' else insert_values
+    staged, repeated, errors = stage_listings(cursor, batches, write, batch_size)
+    if repeated:
+        print(f"\n   Skipping {repeated:,} repeated listings")
+
+    cursor.execute(f"""
+        INSERT INTO listings ({', '.join(LISTING_COLUMNS)})
+        SELECT {', '.join(LISTING_COLUMNS)} FROM listings_latest
+        ORDER BY staged_seq
+        ON CONFLICT DO NOTHING
+    """)
+    inserted = cursor.rowcount
+    if inserted < staged:
+        print(f"\n⚠️  {staged - inserted:,} listings are already in the database")
+    return inserted, errors + staged - inserted
+
+
+def refresh_listing_stats(cursor, bedrooms=None, listing_ids=None):
+    """
+    Upsert listing_stats. With no arguments every listing is recomputed; otherwise only the
+    given bedroom groups, optionally narrowed to specific listing_ids within them.
+    """
+    if denormalized.is_denormalized(cursor):
+        # listing_stats is a view there; the listings triggers keep the metrics current
+        return 0
+
+    group_filter = ""
+    row_filter = ""
+    if bedrooms is not None:
+        group_filter = "WHERE bedrooms = ANY(%(bedrooms)s)"
+        row_filter = "WHERE l.bedrooms = ANY(%(bedrooms)s)"
+    if listing_ids is not None:
+        row_filter = "WHERE l.listing_id = ANY(%(listing_ids)s)"
+
+    cursor.execute(queries.LISTING_STATS.format(group_filter=group_filter, row_filter=row_filter),
+                   {'bedrooms': bedrooms, 'listing_ids': listing_ids})
+    return cursor.rowcount
+
+
+def average_rents(cursor, bedrooms):
+    """Average rent per bedroom group over all history, rounded the same way listing_stats stores it."""
+    cursor.execute("""
+        SELECT bedrooms, ROUND(total_rent / num_listings, 2) FROM bedroom_summary WHERE bedrooms = ANY(%s)
+    """, (bedrooms,))
+    return dict(cursor.fetchall())
+
+
+def load_incremental(cursor, batches, batch_size):
+    """
+    Upsert the CSV on the listing natural key. Chunks are staged with COPY, diffed against the
+    table, and only new or changed listings are written. listing_stats is then refreshed for
+    whole bedroom groups whose average rent moved, and for just the changed rows elsewhere.
+    Returns (inserted, updated, unchanged, errors).
+    """
+    staged, _, errors = stage_listings(cursor, batches, copy_rows, batch_size)
+
+    # Keep only rows that are new or differ from what is already stored
+    cursor.execute("""
+        CREATE TEMP TABLE listings_changed ON COMMIT DROP AS
+        SELECT s.*, l.listing_id IS NULL AS is_new
+        FROM listings_latest s
+        LEFT JOIN listings l
+          ON COALESCE(l.listing_url, l.address) = COALESCE(s.listing_url, s.address)
+         AND l.bedrooms = s.bedrooms
+         AND l.bathrooms = s.bathrooms
+         AND l.square_feet = s.square_feet
+        WHERE l.listing_id IS NULL
+           OR l.monthly_rent IS DISTINCT FROM s.monthly_rent
+           OR l.address IS DISTINCT FROM s.address
+           OR l.source IS DISTINCT FROM s.source
+    """)
+    cursor.execute("SELECT COUNT(*) FILTER (WHERE is_new), COUNT(*), ARRAY_AGG(DISTINCT bedrooms) FROM listings_changed")
+    inserted, changed, groups = cursor.fetchone()
+    if changed == 0:
+        return 0, 0, staged, errors
+
+    before = average_rents(cursor, groups)
+    cursor.execute(f"""
+        INSERT INTO listings ({', '.join(LISTING_COLUMNS)})
+        SELECT {', '.join(LISTING_COLUMNS)} FROM listings_changed
+        ON CONFLICT ({NATURAL_KEY_SQL}) DO UPDATE SET
+            address = EXCLUDED.address,
+            monthly_rent = EXCLUDED.monthly_rent,
+            source = EXCLUDED.source
+        RETURNING listing_id, bedrooms
+    """)
+    upserted = cursor.fetchall()
+    after = average_rents(cursor, groups)
+
+    moved = [br for br in groups if before.get(br) != after.get(br)]
+    still = [listing_id for listing_id, br in upserted if br not in moved]
+    if moved:
+        refresh_listing_stats(cursor, bedrooms=moved)
+    if still:
+        refresh_listing_stats(cursor, bedrooms=groups, listing_ids=still)
+    print(f"\n   Refreshed stats for {len(moved)} moved bedroom group(s) and {len(still)} other changed listing(s)")
+
+    return inserted, changed - inserted, staged - changed, errors
+
+
+parser = argparse.ArgumentParser(description="Load listings from CSV into PostgreSQL")
+parser.add_argument('--csv', default='../data/listings.csv', help="path to the listings CSV")
+parser.add_argument('--mode', choices=['copy', 'values', 'rows'], default='copy',
+                    help="copy: COPY FROM STDIN (default), values: batched execute_values, rows: one INSERT per row")
+parser.add_argument('--batch-size', type=int, default=10000, help="rows per COPY/INSERT batch")
+parser.add_argument('--incremental', action='store_true',
+                    help="upsert on the listing natural key and only recompute stats that changed")
+parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                    help="rows read and validated at a time, so any size of CSV loads in flat memory")
+parser.add_argument('--quarantine', default=None,
+                    help="CSV for rows that fail validation (default: <csv>_rejects.csv)")
+parser.add_argument('--keep-duplicates', action='store_true',
+                    help="load every row instead of one per near-duplicate cluster (data/dedup.py)")
+args = parser.parse_args()
 
 print("=" * 70)
 print("RUKINDAHOMELESS - DATA LOADING SCRIPT")
 print("=" * 70)
 
 # Get the CSV file path
-csv_path = '../data/listings.csv'
+csv_path = args.csv
 
 # Check if CSV exists
 if not os.path.exists(csv_path):
@@ -16,22 +292,32 @@ if not os.path.exists(csv_path):
     print("Make sure your CSV file is in the data/ folder and named 'listings.csv'")
     sys.exit(1)
 
-# Load CSV
+# Check the CSV header; the rows are streamed in chunks while loading
 print(f"\n📂 Loading data from {csv_path}...")
-df = pd.read_csv(csv_path)
-print(f"✅ Found {len(df)} listings in CSV")
+columns = read_columns(csv_path)
 
 # Show column names to verify
-print(f"\n📋 CSV Columns: {list(df.columns)}")
+print(f"\n📋 CSV Columns: {columns}")
+try:
+    check_columns(columns)
+except ValueError as e:
+    print(f"\n❌ ERROR: {csv_path}: {e}")
+    sys.exit(1)
+quarantine = Quarantine(args.quarantine or rejects_path(csv_path))
+batches = read_batches(csv_path, args.chunk_size, quarantine)
+
+if not args.keep_duplicates:
+    # Needs the whole file, so it is a pass of its own ahead of the load
+    print("\n🔎 Finding near-duplicate listings...")
+    canonical = file_canonical_ids(csv_path, args.chunk_size)
+    valid = canonical >= 0
+    duplicates = int((canonical[valid] != np.flatnonzero(valid)).sum())
+    print(f"✅ {duplicates:,} near-duplicate rows will be skipped")
+    batches = canonical_batches(batches, canonical)
 
 # Connect to database
 try:
-    conn = psycopg2.connect(
-        dbname="rukindahomeless",
-        user="yakshbha",
-        password="",  # Leave empty if you didn't set a password
-        host="localhost"
-    )
+    conn = db.connect()
     cursor = conn.cursor()
     print("✅ Connected to database")
 except Exception as e:
@@ -39,71 +325,58 @@ except Exception as e:
     print("\nTroubleshooting:")
     print("1. Make sure PostgreSQL is running")
     print("2. Make sure you created the database: createdb rukindahomeless")
-    print("3. If you set a password during install, add it to the script")
+    print("3. If you set a password during install, put it in database/db.json or RUKH_DB_PASSWORD")
     sys.exit(1)
 
-# Insert listings
-print(f"\n⏳ Inserting {len(df)} listings into database...")
+if partitions.is_partitioned(cursor):
+    if args.incremental:
+        # The natural key is only unique per scrape month once listings is partitioned
+        print("\n❌ --incremental upserts on the listing natural key, which partitioned listings")
+        print("   cannot enforce across months; load each scrape without --incremental")
+        sys.exit(1)
+    # New rows land in the current month's partition
+    partitions.ensure_partitions(cursor)
 
-inserted = 0
-errors = 0
+if args.incremental:
+    # Upsert listings and refresh only the stats that changed
+    print(f"\n⏳ Upserting listings into database (incremental, {args.chunk_size:,} rows per chunk)...")
 
-for idx, row in df.iterrows():
-    try:
-        cursor.execute("""
-            INSERT INTO listings (address, monthly_rent, bedrooms, bathrooms, square_feet, source, listing_url)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, (
-            str(row['address']),
-            float(str(row['rent']).replace(',', '')),  # Fixed: 'rent' instead of 'Rent', handle commas
-            int(row['BR']),
-            float(row['Ba']),
-            int(row['sqft']),
-            str(row['source']),
-            str(row['url']) if 'url' in row and pd.notna(row['url']) else None
-        ))
-        inserted += 1
-        
-        if (inserted % 10 == 0):
-            print(f"   Inserted {inserted}/{len(df)} listings...", end='\r')
-            
-    except Exception as e:
-        errors += 1
-        print(f"\n⚠️  Error on row {idx}: {e}")
-        continue
-
-conn.commit()
-print(f"\n✅ Successfully inserted {inserted} listings ({errors} errors)")
-
-# Calculate statistics
-print("\n⏳ Calculating value scores...")
-
-cursor.execute("""
-    INSERT INTO listing_stats (listing_id, price_per_sqft, price_per_bedroom, avg_rent_for_bedrooms, is_above_average, value_score)
-    SELECT 
-        l.listing_id,
-        ROUND(l.monthly_rent::numeric / NULLIF(l.square_feet, 0), 2),
-        CASE 
-            WHEN l.bedrooms > 0 THEN ROUND(l.monthly_rent::numeric / l.bedrooms, 2)
-            ELSE l.monthly_rent  -- For studios (0 BR), just use the rent itself
-        END,
-        avg_prices.avg_rent,
-        CASE WHEN l.monthly_rent > avg_prices.avg_rent THEN TRUE ELSE FALSE END,
-        CASE 
-            WHEN l.monthly_rent <= avg_prices.avg_rent * 0.85 THEN 9.0
-            WHEN l.monthly_rent <= avg_prices.avg_rent * 0.95 THEN 7.5
-            WHEN l.monthly_rent <= avg_prices.avg_rent * 1.05 THEN 6.0
-            WHEN l.monthly_rent <= avg_prices.avg_rent * 1.15 THEN 4.0
-            ELSE 2.0
-        END
-    FROM listings l
-    JOIN (
-        SELECT bedrooms, AVG(monthly_rent) as avg_rent
-        FROM listings GROUP BY bedrooms
-    ) avg_prices ON l.bedrooms = avg_prices.bedrooms
-""")
-conn.commit()
-print("✅ Value scores calculated!")
+    start_time = time.perf_counter()
+    inserted, updated, unchanged, errors = load_incremental(cursor, batches, args.batch_size)
+    conn.commit()
+    elapsed = time.perf_counter() - start_time
+    rows = inserted + updated + unchanged + errors
+
+    print(f"\n✅ {inserted} new, {updated} updated, {unchanged} unchanged listings ({errors} errors)")
+    print(f"⏱️  {elapsed:.2f}s ({rows / elapsed if elapsed > 0 else 0:,.0f} rows/sec)")
+
+else:
+    # Insert listings
+    print(f"\n⏳ Inserting listings into database (mode: {args.mode}, {args.chunk_size:,} rows per chunk)...")
+
+    start_time = time.perf_counter()
+    if args.mode == 'rows':
+        inserted, errors = load_row_by_row(cursor, batches)
+    else:
+        inserted, errors = load_bulk(cursor, batches, args.mode, args.batch_size)
+    conn.commit()
+    elapsed = time.perf_counter() - start_time
+
+    print(f"\n✅ Successfully inserted {inserted} listings ({errors} errors)")
+    print(f"⏱️  {elapsed:.2f}s ({inserted / elapsed if elapsed > 0 else 0:,.0f} rows/sec)")
+
+    # Calculate statistics
+    print("\n⏳ Calculating value scores...")
+
+    refresh_listing_stats(cursor)
+    conn.commit()
+    print("✅ Value scores calculated!")
+
+quarantine.close()
+if quarantine.rows:
+    print(f"\n⚠️  {quarantine.rows:,} rows failed validation and were written to {quarantine.path}")
+    for reason, count in sorted(quarantine.reasons.items(), key=lambda item: -item[1]):
+        print(f"   {count:>8,}  {reason}")
 
 # Show summary
 print("\n" + "=" * 70)
@@ -122,7 +395,7 @@ for row in cursor.fetchall():
     print(f"{row[0]:<4} {row[1]:<8} ${row[2]:<11.2f} ${row[3]:<11.2f} ${row[4]:<11.2f} {row[5]:<10.0f}")
 
 cursor.close()
-conn.close()
+db.release(conn)
 
 print("\n✅ Data loading complete!")
 print("=" * 70 + "\n")
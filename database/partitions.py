@@ -0,0 +1,339 @@
+"""
+RUKindaHomeless - Partitioned Listings
+Moves listings and listing_stats onto monthly range partitions of the scrape date
+(listings.created_at, mirrored in listing_stats.listed_at), optionally with each month
+list-partitioned by source, and manages those partitions afterwards:
+
+    python partitions.py migrate [--by-source] [--months-ahead 3] [--summary-months 3]
+    python partitions.py ensure          # create partitions for the coming months
+    python partitions.py retain --keep-months 6 [--dry-run]
+    python partitions.py status
+
+Retention drops whole month partitions of both tables instead of DELETEing rows (and
+cascading into listing_stats), then rebuilds the summary tables, since dropping a partition
+does not fire the listings triggers. migrate also redefines the rent_summary and
+source_rent_summary views to aggregate only the last --summary-months months, so the
+summary queries (test_queries.py, load_data.py, the web app) are pruned to those partitions
+by default. Value scoring keeps reading the all-history bedroom_summary table.
+"""
+
+import argparse
+import os
+import re
+import sys
+from datetime import date
+
+import db
+import denormalized
+
+# Month partitions are named <table>_yYYYYmMM (and <table>_yYYYYmMM_<source> below that)
+PARTITION_NAME = re.compile(r'_y(\d{4})m(\d{2})$')
+
+# Unique keys on a partitioned table must include every partitioning column, so with
+# --by-source the primary key grows source (which then cannot be NULL) as well
+LISTINGS_DDL = """
+    CREATE TABLE listings_partitioned (
+        listing_id INT NOT NULL DEFAULT nextval('listings_listing_id_seq'),
+        address VARCHAR(255) NOT NULL,
+        monthly_rent DECIMAL(10,2) NOT NULL,
+        bedrooms INT NOT NULL,
+        bathrooms DECIMAL(3,1) NOT NULL,
+        square_feet INT NOT NULL,
+        source VARCHAR(50){source_constraint},
+        listing_url TEXT,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (listing_id, {partition_key})
+    ) PARTITION BY RANGE (created_at)
+"""
+
+# No foreign key to listings: both tables are partitioned by month and a month is
+# always dropped from both, which replaces the ON DELETE CASCADE
+STATS_DDL = """
+    CREATE TABLE listing_stats_partitioned (
+        stat_id INT NOT NULL DEFAULT nextval('listing_stats_stat_id_seq'),
+        listing_id INT NOT NULL,
+        price_per_sqft DECIMAL(6,2),
+        price_per_bedroom DECIMAL(10,2),
+        avg_rent_for_bedrooms DECIMAL(10,2),
+        is_above_average BOOLEAN,
+        value_score DECIMAL(3,1),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        listed_at TIMESTAMP NOT NULL
+    ) PARTITION BY RANGE (listed_at)
+"""
+
+# Written by migrate, read by ensure so later months are laid out the same way
+CONFIG_DDL = """
+    CREATE TABLE listing_partition_config (
+        by_source BOOLEAN NOT NULL,
+        sources TEXT[] NOT NULL,
+        summary_months INT NOT NULL
+    )
+"""
+
+# Replace schema.sql's all-history summary views on a partitioned table; the
+# trigger-maintained bedroom_summary and source_summary tables still cover every month
+RECENT_WINDOW = "created_at >= date_trunc('month', LOCALTIMESTAMP) - interval '{months_back} months'"
+
+RECENT_SUMMARY_VIEWS = [
+    """
+    CREATE VIEW rent_summary AS
+    SELECT
+        bedrooms,
+        COUNT(*) as num_listings,
+        ROUND(AVG(monthly_rent), 2) as avg_rent,
+        MIN(monthly_rent) as min_rent,
+        MAX(monthly_rent) as max_rent,
+        ROUND(AVG(square_feet), 2) as avg_sqft
+    FROM listings
+    WHERE {window}
+    GROUP BY bedrooms
+    ORDER BY bedrooms
+""",
+    """
+    CREATE VIEW source_rent_summary AS
+    SELECT
+        source,
+        COUNT(*) as num_listings,
+        ROUND(AVG(monthly_rent), 2) as avg_rent,
+        ROUND(AVG(square_feet), 2) as avg_sqft
+    FROM listings
+    WHERE {window}
+    GROUP BY source
+    ORDER BY avg_rent
+""",
+]
+
+# Indexes whose unique key has to grow the partition key on a partitioned table
+PARTITIONED_INDEXES = {
+    'idx_listing_natural_key': "CREATE UNIQUE INDEX idx_listing_natural_key ON listings "
+                               "((COALESCE(listing_url, address)), bedrooms, bathrooms, square_feet, {partition_key})",
+}
+
+
+def is_partitioned(cursor, table='listings'):
+    cursor.execute("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%s)", (table,))
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_suffix(month):
+    return f'y{month.year}m{month.month:02d}'
+
+
+def source_suffix(source):
+    return re.sub(r'[^a-z0-9]+', '_', source.lower()).strip('_') or 'blank'
+
+
+def schema_statements(kind):
+    """CREATE INDEX / CREATE TRIGGER statements from schema.sql, in order."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')) as f:
+        schema_sql = f.read()
+    if kind == 'index':
+        return re.findall(r'CREATE (?:UNIQUE )?INDEX \w+ ON [^;]+', schema_sql)
+    return re.findall(r'CREATE TRIGGER \w+[^;]+', schema_sql)
+
+
+def create_month(cursor, month, by_source, sources):
+    """Create the listings and listing_stats partitions for one month if they are missing."""
+    suffix = month_suffix(month)
+    bounds = f"FROM ('{month}') TO ('{add_months(month, 1)}')"
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (f'listings_{suffix}',))
+    if cursor.fetchone()[0]:
+        return False
+
+    if by_source:
+        cursor.execute(f"CREATE TABLE listings_{suffix} PARTITION OF listings FOR VALUES {bounds} "
+                       f"PARTITION BY LIST (source)")
+        for source in sources:
+            cursor.execute(f"CREATE TABLE listings_{suffix}_{source_suffix(source)} PARTITION OF listings_{suffix} "
+                           f"FOR VALUES IN (%s)", (source,))
+        cursor.execute(f"CREATE TABLE listings_{suffix}_other PARTITION OF listings_{suffix} DEFAULT")
+    else:
+        cursor.execute(f"CREATE TABLE listings_{suffix} PARTITION OF listings FOR VALUES {bounds}")
+    cursor.execute(f"CREATE TABLE listing_stats_{suffix} PARTITION OF listing_stats FOR VALUES {bounds}")
+    return True
+
+
+def ensure_partitions(cursor, months_ahead=3):
+    """Make sure every month from the current one through months_ahead has partitions."""
+    cursor.execute("SELECT by_source, sources FROM listing_partition_config")
+    by_source, sources = cursor.fetchone()
+    this_month = date.today().replace(day=1)
+    return sum(create_month(cursor, add_months(this_month, offset), by_source, sources)
+               for offset in range(months_ahead + 1))
+
+
+def month_partitions(cursor, table):
+    """(month, partition name) for the direct partitions of table, oldest first."""
+    cursor.execute("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+    """, (table,))
+    months = []
+    for (name,) in cursor.fetchall():
+        match = PARTITION_NAME.search(name)
+        if match:
+            months.append((date(int(match.group(1)), int(match.group(2)), 1), name))
+    return sorted(months)
+
+
+def migrate(cursor, by_source, months_ahead, summary_months):
+    """Copy the plain tables into partitioned ones and swap them in, in one transaction."""
+    cursor.execute("SELECT date_trunc('month', MIN(created_at))::date FROM listings")
+    first_month = cursor.fetchone()[0] or date.today().replace(day=1)
+    cursor.execute("SELECT DISTINCT source FROM listings WHERE source IS NOT NULL ORDER BY source")
+    sources = [row[0] for row in cursor.fetchall()]
+
+    partition_key = 'created_at, source' if by_source else 'created_at'
+    cursor.execute(LISTINGS_DDL.format(partition_key=partition_key,
+                                       source_constraint=" NOT NULL DEFAULT 'unknown'" if by_source else ""))
+    cursor.execute(STATS_DDL)
+    cursor.execute("DROP TABLE IF EXISTS listing_partition_config")
+    cursor.execute(CONFIG_DDL)
+    cursor.execute("INSERT INTO listing_partition_config VALUES (%s, %s, %s)",
+                   (by_source, sources, summary_months))
+
+    # Partitions are created against the final names, so swap the parents in first
+    cursor.execute("ALTER SEQUENCE listings_listing_id_seq OWNED BY NONE")
+    cursor.execute("ALTER SEQUENCE listing_stats_stat_id_seq OWNED BY NONE")
+    cursor.execute("ALTER TABLE listing_stats RENAME TO listing_stats_unpartitioned")
+    cursor.execute("ALTER TABLE listings RENAME TO listings_unpartitioned")
+    cursor.execute("ALTER TABLE listings_partitioned RENAME TO listings")
+    cursor.execute("ALTER TABLE listing_stats_partitioned RENAME TO listing_stats")
+
+    this_month = date.today().replace(day=1)
+    month = first_month
+    created = 0
+    while month <= add_months(this_month, months_ahead):
+        created += create_month(cursor, month, by_source, sources)
+        month = add_months(month, 1)
+
+    source = "COALESCE(source, 'unknown')" if by_source else "source"
+    cursor.execute(f"""
+        INSERT INTO listings
+        SELECT listing_id, address, monthly_rent, bedrooms, bathrooms, square_feet, {source}, listing_url,
+               COALESCE(created_at, LOCALTIMESTAMP)
+        FROM listings_unpartitioned
+    """)
+    moved = cursor.rowcount
+    cursor.execute("""
+        INSERT INTO listing_stats (stat_id, listing_id, price_per_sqft, price_per_bedroom, avg_rent_for_bedrooms,
+                                   is_above_average, value_score, created_at, listed_at)
+        SELECT s.stat_id, s.listing_id, s.price_per_sqft, s.price_per_bedroom, s.avg_rent_for_bedrooms,
+               s.is_above_average, s.value_score, s.created_at, l.created_at
+        FROM listing_stats_unpartitioned s
+        JOIN listings l ON l.listing_id = s.listing_id
+    """)
+    cursor.execute("DROP TABLE listing_stats_unpartitioned")
+    cursor.execute("DROP TABLE listings_unpartitioned")
+    cursor.execute("ALTER SEQUENCE listings_listing_id_seq OWNED BY listings.listing_id")
+    cursor.execute("ALTER SEQUENCE listing_stats_stat_id_seq OWNED BY listing_stats.stat_id")
+
+    # Same indexes and summary triggers as schema.sql; the triggers fire on the parent
+    for statement in schema_statements('index'):
+        name = re.search(r'INDEX (\w+)', statement).group(1)
+        cursor.execute(PARTITIONED_INDEXES.get(name, statement).format(partition_key=partition_key))
+    for statement in schema_statements('trigger'):
+        cursor.execute(statement)
+    cursor.execute("SELECT refresh_rent_summaries()")
+
+    window = RECENT_WINDOW.format(months_back=summary_months - 1)
+    for view in RECENT_SUMMARY_VIEWS:
+        name = re.search(r'VIEW (\w+)', view).group(1)
+        cursor.execute(f"DROP VIEW IF EXISTS {name}")
+        cursor.execute(view.format(window=window))
+    cursor.execute("ANALYZE listings")
+    cursor.execute("ANALYZE listing_stats")
+    return moved, created
+
+
+def retain(cursor, keep_months, dry_run=False):
+    """Drop month partitions older than the last keep_months months; returns their names."""
+    cutoff = add_months(date.today().replace(day=1), -(keep_months - 1))
+    expired = [(month, name) for month, name in month_partitions(cursor, 'listings') if month < cutoff]
+    if dry_run or not expired:
+        return [name for _, name in expired]
+
+    for month, name in expired:
+        cursor.execute(f"DROP TABLE IF EXISTS listing_stats_{month_suffix(month)}")
+        cursor.execute(f"DROP TABLE {name}")
+    # Dropped partitions never reach the DELETE trigger, so rebuild the summaries
+    cursor.execute("SELECT refresh_rent_summaries()")
+    return [name for _, name in expired]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Partition listings by scrape month and manage the partitions")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    migrate_parser = subparsers.add_parser('migrate', help="move the plain tables onto monthly partitions")
+    migrate_parser.add_argument('--by-source', action='store_true',
+                                help="also list-partition each month by source")
+    migrate_parser.add_argument('--months-ahead', type=int, default=3, help="future months to create up front")
+    migrate_parser.add_argument('--summary-months', type=int, default=3,
+                                help="months covered by rent_summary and source_rent_summary")
+    ensure_parser = subparsers.add_parser('ensure', help="create partitions for the coming months")
+    ensure_parser.add_argument('--months-ahead', type=int, default=3)
+    retain_parser = subparsers.add_parser('retain', help="drop partitions older than --keep-months")
+    retain_parser.add_argument('--keep-months', type=int, required=True,
+                               help="months to keep, counting the current one")
+    retain_parser.add_argument('--dry-run', action='store_true', help="only list what would be dropped")
+    subparsers.add_parser('status', help="list partitions and row counts")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("RUKINDAHOMELESS - LISTING PARTITIONS")
+    print("=" * 70)
+
+    try:
+        conn = db.connect()
+        cursor = conn.cursor()
+    except Exception as e:
+        print(f"\n❌ Could not connect to database: {e}")
+        sys.exit(1)
+
+    partitioned = is_partitioned(cursor)
+    if args.command == 'migrate':
+        if partitioned:
+            print("\n❌ listings is already partitioned")
+            sys.exit(1)
+        # The denormalized layout replaces listing_stats with a view, which can't be partitioned
+        if denormalized.is_denormalized(cursor):
+            print("\n❌ listings uses the denormalized layout (denormalized.py); "
+                  "partitioning needs the two-table layout")
+            sys.exit(1)
+        print(f"\n⏳ Migrating listings to monthly partitions{' by source' if args.by_source else ''}...")
+        moved, created = migrate(cursor, args.by_source, args.months_ahead, args.summary_months)
+        conn.commit()
+        print(f"✅ Moved {moved:,} listings into {created} monthly partitions")
+    elif not partitioned:
+        print("\n❌ listings is not partitioned yet; run `python partitions.py migrate` first")
+        sys.exit(1)
+    elif args.command == 'ensure':
+        created = ensure_partitions(cursor, args.months_ahead)
+        conn.commit()
+        print(f"\n✅ Created {created} new monthly partition(s)")
+    elif args.command == 'retain':
+        dropped = retain(cursor, args.keep_months, args.dry_run)
+        conn.commit()
+        verb = "Would drop" if args.dry_run else "Dropped"
+        print(f"\n✅ {verb} {len(dropped)} partition(s) older than {args.keep_months} months")
+        for name in dropped:
+            print(f"   {name}")
+
+    if is_partitioned(cursor):
+        print(f"\n{'Partition':<32} {'Listings':<10}")
+        print("-" * 70)
+        for month, name in month_partitions(cursor, 'listings'):
+            cursor.execute(f"SELECT COUNT(*) FROM {name}")
+            print(f"{name:<32} {cursor.fetchone()[0]:<10,}")
+
+    cursor.close()
+    db.release(conn)
+    print("\n" + "=" * 70 + "\n")
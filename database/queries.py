@@ -0,0 +1,162 @@
+"""
+RUKindaHomeless - Shared SQL
+Queries used by more than one database script (test_queries.py, load_data.py, explain_queries.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from models.thresholds import value_score_sql
+
+# Value score bands from models/thresholds.py, shared with the classifier and the web app
+VALUE_SCORE_CASE = value_score_sql('l.monthly_rent', 'avg_prices.avg_rent')
+
+# Upsert per-listing value metrics. {group_filter} narrows the bedroom averages and
+# {row_filter} the listings being recomputed; both may be empty.
+LISTING_STATS = f"""
+    INSERT INTO listing_stats (listing_id, listed_at, price_per_sqft, price_per_bedroom, avg_rent_for_bedrooms, is_above_average, value_score)
+    SELECT 
+        l.listing_id,
+        l.created_at,
+        ROUND(l.monthly_rent::numeric / NULLIF(l.square_feet, 0), 2),
+        CASE 
+            WHEN l.bedrooms > 0 THEN ROUND(l.monthly_rent::numeric / l.bedrooms, 2)
+            ELSE l.monthly_rent  -- For studios (0 BR), just use the rent itself
+        END,
+        avg_prices.avg_rent,
+        CASE WHEN l.monthly_rent > avg_prices.avg_rent THEN TRUE ELSE FALSE END,
+        {VALUE_SCORE_CASE}
+    FROM listings l
+    JOIN (
+        SELECT bedrooms, total_rent / num_listings as avg_rent
+        FROM bedroom_summary {{group_filter}}
+    ) avg_prices ON l.bedrooms = avg_prices.bedrooms
+    {{row_filter}}
+    ON CONFLICT (listing_id, listed_at) DO UPDATE SET
+        price_per_sqft = EXCLUDED.price_per_sqft,
+        price_per_bedroom = EXCLUDED.price_per_bedroom,
+        avg_rent_for_bedrooms = EXCLUDED.avg_rent_for_bedrooms,
+        is_above_average = EXCLUDED.is_above_average,
+        value_score = EXCLUDED.value_score
+"""
+
+# Query 1: Average rent by bedrooms
+AVG_RENT_BY_BEDROOMS = """
+    SELECT bedrooms, num_listings, avg_rent, min_rent, max_rent
+    FROM rent_summary
+    ORDER BY bedrooms
+"""
+
+# Query 2: Best deals
+BEST_VALUE = """
+    SELECT l.address, l.bedrooms, l.monthly_rent, s.value_score
+    FROM listings l
+    JOIN listing_stats s ON l.listing_id = s.listing_id
+    WHERE s.value_score >= 7.0
+    ORDER BY s.value_score DESC
+    LIMIT 10
+"""
+
+# Query 3: Cheapest apartment for each bedroom count
+CHEAPEST_BY_BEDROOMS = """
+    SELECT DISTINCT ON (bedrooms) 
+           bedrooms, address, monthly_rent, source
+    FROM listings
+    ORDER BY bedrooms, monthly_rent
+"""
+
+# Query 4: Source comparison
+AVG_RENT_BY_SOURCE = """
+    SELECT source, num_listings, avg_rent, avg_sqft
+    FROM source_rent_summary
+    ORDER BY avg_rent
+"""
+
+# Query 5: Above vs below average
+ABOVE_AVERAGE_BY_BEDROOMS = """
+    SELECT l.bedrooms, 
+           COUNT(*) as total,
+           SUM(CASE WHEN s.is_above_average THEN 1 ELSE 0 END) as above_avg,
+           SUM(CASE WHEN NOT s.is_above_average THEN 1 ELSE 0 END) as below_avg
+    FROM listings l
+    JOIN listing_stats s ON l.listing_id = s.listing_id
+    GROUP BY l.bedrooms
+    ORDER BY l.bedrooms
+"""
+
+# Query 6: Price per sqft leaders
+PRICE_PER_SQFT_LEADERS = """
+    SELECT l.address, l.bedrooms, l.monthly_rent, l.square_feet, s.price_per_sqft
+    FROM listings l
+    JOIN listing_stats s ON l.listing_id = s.listing_id
+    ORDER BY s.price_per_sqft DESC
+    LIMIT 5
+"""
+
+# Query 7: 2BR apartments with best value scores
+BEST_VALUE_2BR = """
+    SELECT l.address, l.monthly_rent, l.square_feet, s.value_score, l.source
+    FROM listings l
+    JOIN listing_stats s ON l.listing_id = s.listing_id
+    WHERE l.bedrooms = 2
+    ORDER BY s.value_score DESC
+    LIMIT 5
+"""
+
+# Every listing with its value metrics, for CSV export
+LISTINGS_EXPORT = """
+    SELECT l.listing_id, l.address, l.monthly_rent, l.bedrooms, l.bathrooms, l.square_feet,
+           l.source, s.price_per_sqft, s.value_score
+    FROM listings l
+    LEFT JOIN listing_stats s ON l.listing_id = s.listing_id
+    ORDER BY l.listing_id
+"""
+
+# The seven demonstration queries in the order test_queries.py runs them
+ANALYTICAL_QUERIES = [
+    ('avg_rent_by_bedrooms', AVG_RENT_BY_BEDROOMS),
+    ('best_value', BEST_VALUE),
+    ('cheapest_by_bedrooms', CHEAPEST_BY_BEDROOMS),
+    ('avg_rent_by_source', AVG_RENT_BY_SOURCE),
+    ('above_average_by_bedrooms', ABOVE_AVERAGE_BY_BEDROOMS),
+    ('price_per_sqft_leaders', PRICE_PER_SQFT_LEADERS),
+    ('best_value_2br', BEST_VALUE_2BR),
+]
+
+# The same queries against denormalized.py's layout, where the listing metrics live on
+# listings itself; the ones that never touched listing_stats are unchanged
+DENORMALIZED_QUERIES = [
+    ('avg_rent_by_bedrooms', AVG_RENT_BY_BEDROOMS),
+    ('best_value', """
+    SELECT address, bedrooms, monthly_rent, value_score
+    FROM listings
+    WHERE value_score >= 7.0
+    ORDER BY value_score DESC
+    LIMIT 10
+"""),
+    ('cheapest_by_bedrooms', CHEAPEST_BY_BEDROOMS),
+    ('avg_rent_by_source', AVG_RENT_BY_SOURCE),
+    ('above_average_by_bedrooms', """
+    SELECT bedrooms,
+           COUNT(*) as total,
+           SUM(CASE WHEN is_above_average THEN 1 ELSE 0 END) as above_avg,
+           SUM(CASE WHEN NOT is_above_average THEN 1 ELSE 0 END) as below_avg
+    FROM listings
+    GROUP BY bedrooms
+    ORDER BY bedrooms
+"""),
+    ('price_per_sqft_leaders', """
+    SELECT address, bedrooms, monthly_rent, square_feet, price_per_sqft
+    FROM listings
+    ORDER BY price_per_sqft DESC
+    LIMIT 5
+"""),
+    ('best_value_2br', """
+    SELECT address, monthly_rent, square_feet, value_score, source
+    FROM listings
+    WHERE bedrooms = 2
+    ORDER BY value_score DESC
+    LIMIT 5
+"""),
+]
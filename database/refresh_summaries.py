@@ -0,0 +1,47 @@
+"""
+RUKindaHomeless - Summary Refresh
+Rebuilds the trigger-maintained bedroom_summary and source_summary tables from listings.
+The triggers keep them current during normal loads; run this after bulk edits made
+with triggers disabled, or to verify the summaries against a full aggregate.
+"""
+
+import sys
+import time
+
+import db
+
+print("=" * 70)
+print("RUKINDAHOMELESS - REFRESH RENT SUMMARIES")
+print("=" * 70)
+
+try:
+    conn = db.connect()
+    cursor = conn.cursor()
+except Exception as e:
+    print(f"\n❌ Could not connect to database: {e}")
+    sys.exit(1)
+
+print("\n⏳ Rebuilding bedroom and source summaries...")
+start_time = time.perf_counter()
+cursor.execute("SELECT refresh_rent_summaries()")
+conn.commit()
+print(f"✅ Summaries rebuilt in {time.perf_counter() - start_time:.2f}s")
+
+cursor.execute("SELECT * FROM rent_summary")
+print("\nRent Summary by Bedrooms:")
+print(f"{'BR':<4} {'Count':<8} {'Avg Rent':<12} {'Min Rent':<12} {'Max Rent':<12} {'Avg Sqft':<10}")
+print("-" * 70)
+for row in cursor.fetchall():
+    print(f"{row[0]:<4} {row[1]:<8} ${row[2]:<11.2f} ${row[3]:<11.2f} ${row[4]:<11.2f} {row[5]:<10.0f}")
+
+cursor.execute("SELECT * FROM source_rent_summary")
+print("\nRent Summary by Source:")
+print(f"{'Source':<20} {'Count':<8} {'Avg Rent':<12} {'Avg Sqft':<10}")
+print("-" * 70)
+for row in cursor.fetchall():
+    print(f"{row[0]:<20} {row[1]:<8} ${row[2]:<11.2f} {row[3]:<10.0f}")
+
+cursor.close()
+db.release(conn)
+
+print("\n" + "=" * 70 + "\n")
@@ -23,24 +23,183 @@ CREATE TABLE listing_stats (
     avg_rent_for_bedrooms DECIMAL(10,2),
     is_above_average BOOLEAN,
     value_score DECIMAL(3,1),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- The listing's created_at, so partitions.py can partition stats alongside listings
+    listed_at TIMESTAMP
 );
 
--- Indexes for performance
+-- Indexes for performance, shaped after the queries in queries.py
+-- (explain_queries.py compares their plans against the original single-column set)
 CREATE INDEX idx_rent ON listings(monthly_rent);
-CREATE INDEX idx_bedrooms ON listings(bedrooms);
 CREATE INDEX idx_source ON listings(source);
-CREATE INDEX idx_sqft ON listings(square_feet);
+
+-- Bedroom filters and DISTINCT ON (bedrooms) ... ORDER BY bedrooms, monthly_rent
+CREATE INDEX idx_bedrooms_rent ON listings(bedrooms, monthly_rent);
+
+-- Join key for listing_stats; also the ON CONFLICT target when stats are upserted
+-- (listed_at is part of it because a partitioned table's unique keys must include the
+-- partition key). The included columns let Query 5 read the stats side from the index alone.
+CREATE UNIQUE INDEX idx_stats_listing ON listing_stats(listing_id, listed_at) INCLUDE (is_above_average, value_score);
+
+-- Top-N by value score (Queries 2 and 7) and by price per sqft (Query 6)
+CREATE INDEX idx_stats_value_score ON listing_stats(value_score DESC) INCLUDE (listing_id);
+CREATE INDEX idx_stats_price_per_sqft ON listing_stats(price_per_sqft DESC) INCLUDE (listing_id);
+
+-- Natural key used by load_data.py --incremental to upsert re-scraped listings
+CREATE UNIQUE INDEX idx_listing_natural_key ON listings ((COALESCE(listing_url, address)), bedrooms, bathrooms, square_feet);
+
+-- Per-group aggregates kept in step with listings by the triggers below, so summaries
+-- read a handful of rows instead of re-aggregating the whole table
+CREATE TABLE bedroom_summary (
+    bedrooms INT PRIMARY KEY,
+    num_listings INT NOT NULL,
+    total_rent DECIMAL(14,2) NOT NULL,
+    min_rent DECIMAL(10,2) NOT NULL,
+    max_rent DECIMAL(10,2) NOT NULL,
+    total_sqft BIGINT NOT NULL
+);
+
+CREATE TABLE source_summary (
+    source VARCHAR(50) PRIMARY KEY,
+    num_listings INT NOT NULL,
+    total_rent DECIMAL(14,2) NOT NULL,
+    total_sqft BIGINT NOT NULL
+);
+
+-- Recompute the given bedroom groups (all groups when NULL)
+CREATE FUNCTION refresh_bedroom_summary(groups INT[]) RETURNS void AS $$
+    DELETE FROM bedroom_summary WHERE groups IS NULL OR bedrooms = ANY(groups);
+    INSERT INTO bedroom_summary
+    SELECT bedrooms, COUNT(*), SUM(monthly_rent), MIN(monthly_rent), MAX(monthly_rent), SUM(square_feet)
+    FROM listings
+    WHERE groups IS NULL OR bedrooms = ANY(groups)
+    GROUP BY bedrooms;
+$$ LANGUAGE sql;
+
+-- Recompute the given sources (all sources when NULL)
+CREATE FUNCTION refresh_source_summary(groups TEXT[]) RETURNS void AS $$
+    DELETE FROM source_summary WHERE groups IS NULL OR source = ANY(groups);
+    INSERT INTO source_summary
+    SELECT COALESCE(source, 'unknown'), COUNT(*), SUM(monthly_rent), SUM(square_feet)
+    FROM listings
+    WHERE groups IS NULL OR COALESCE(source, 'unknown') = ANY(groups)
+    GROUP BY COALESCE(source, 'unknown');
+$$ LANGUAGE sql;
+
+-- Full rebuild, used by refresh_summaries.py
+CREATE FUNCTION refresh_rent_summaries() RETURNS void AS $$
+    SELECT refresh_bedroom_summary(NULL);
+    SELECT refresh_source_summary(NULL);
+$$ LANGUAGE sql;
+
+-- Statement-level trigger: apply the changed rows as deltas (count/sum/min/max), so the
+-- cost follows the size of the statement rather than the size of the table. A group is
+-- only rescanned when a deleted or updated row held its current min or max rent.
+CREATE FUNCTION listings_summary_trigger() RETURNS trigger AS $$
+DECLARE
+    dirty_groups INT[] := '{}';
+BEGIN
+    -- Updates that only rewrite derived columns (denormalized.py) leave the totals alone
+    IF current_setting('rukh.derived_update', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM refresh_rent_summaries();
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        dirty_groups := ARRAY(
+            SELECT DISTINCT o.bedrooms
+            FROM old_rows o JOIN bedroom_summary b ON b.bedrooms = o.bedrooms
+            WHERE o.monthly_rent <= b.min_rent OR o.monthly_rent >= b.max_rent
+        );
+
+        UPDATE bedroom_summary b SET
+            num_listings = b.num_listings - d.num_listings,
+            total_rent = b.total_rent - d.total_rent,
+            total_sqft = b.total_sqft - d.total_sqft
+        FROM (
+            SELECT bedrooms, COUNT(*) AS num_listings, SUM(monthly_rent) AS total_rent, SUM(square_feet) AS total_sqft
+            FROM old_rows GROUP BY bedrooms
+        ) d
+        WHERE b.bedrooms = d.bedrooms;
+
+        UPDATE source_summary s SET
+            num_listings = s.num_listings - d.num_listings,
+            total_rent = s.total_rent - d.total_rent,
+            total_sqft = s.total_sqft - d.total_sqft
+        FROM (
+            SELECT COALESCE(source, 'unknown') AS source, COUNT(*) AS num_listings,
+                   SUM(monthly_rent) AS total_rent, SUM(square_feet) AS total_sqft
+            FROM old_rows GROUP BY 1
+        ) d
+        WHERE s.source = d.source;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO bedroom_summary AS b
+        SELECT bedrooms, COUNT(*), SUM(monthly_rent), MIN(monthly_rent), MAX(monthly_rent), SUM(square_feet)
+        FROM new_rows GROUP BY bedrooms
+        ON CONFLICT (bedrooms) DO UPDATE SET
+            num_listings = b.num_listings + EXCLUDED.num_listings,
+            total_rent = b.total_rent + EXCLUDED.total_rent,
+            min_rent = LEAST(b.min_rent, EXCLUDED.min_rent),
+            max_rent = GREATEST(b.max_rent, EXCLUDED.max_rent),
+            total_sqft = b.total_sqft + EXCLUDED.total_sqft;
+
+        INSERT INTO source_summary AS s
+        SELECT COALESCE(source, 'unknown'), COUNT(*), SUM(monthly_rent), SUM(square_feet)
+        FROM new_rows GROUP BY 1
+        ON CONFLICT (source) DO UPDATE SET
+            num_listings = s.num_listings + EXCLUDED.num_listings,
+            total_rent = s.total_rent + EXCLUDED.total_rent,
+            total_sqft = s.total_sqft + EXCLUDED.total_sqft;
+    END IF;
+
+    DELETE FROM bedroom_summary WHERE num_listings <= 0;
+    DELETE FROM source_summary WHERE num_listings <= 0;
+    IF cardinality(dirty_groups) > 0 THEN
+        PERFORM refresh_bedroom_summary(dirty_groups);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER listings_summary_insert AFTER INSERT ON listings
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION listings_summary_trigger();
+
+CREATE TRIGGER listings_summary_update AFTER UPDATE ON listings
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION listings_summary_trigger();
+
+CREATE TRIGGER listings_summary_delete AFTER DELETE ON listings
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION listings_summary_trigger();
+
+CREATE TRIGGER listings_summary_truncate AFTER TRUNCATE ON listings
+    FOR EACH STATEMENT EXECUTE FUNCTION listings_summary_trigger();
 
 -- View for summary statistics
 CREATE VIEW rent_summary AS
 SELECT 
     bedrooms,
-    COUNT(*) as num_listings,
-    ROUND(AVG(monthly_rent), 2) as avg_rent,
-    ROUND(MIN(monthly_rent), 2) as min_rent,
-    ROUND(MAX(monthly_rent), 2) as max_rent,
-    ROUND(AVG(square_feet), 2) as avg_sqft
-FROM listings
-GROUP BY bedrooms
-ORDER BY bedrooms;
\ No newline at end of file
+    num_listings,
+    ROUND(total_rent / num_listings, 2) as avg_rent,
+    min_rent,
+    max_rent,
+    ROUND(total_sqft::numeric / num_listings, 2) as avg_sqft
+FROM bedroom_summary
+ORDER BY bedrooms;
+
+-- Same summary by data source
+CREATE VIEW source_rent_summary AS
+SELECT
+    source,
+    num_listings,
+    ROUND(total_rent / num_listings, 2) as avg_rent,
+    ROUND(total_sqft::numeric / num_listings, 2) as avg_sqft
+FROM source_summary
+ORDER BY avg_rent;
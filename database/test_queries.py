@@ -1,30 +1,185 @@
-import psycopg2
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import db
+import queries
+
+
+def time_query(name, sql):
+    """
+    Run one prepared query on a pooled connection; returns (name, ms, rows, cold), where cold
+    means the connection had not prepared the query yet and the timing includes its PREPARE.
+    """
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cold = name not in conn.prepared
+        start_time = time.perf_counter()
+        db.execute_prepared(cursor, name, sql)
+        rows = cursor.fetchall()
+        return name, (time.perf_counter() - start_time) * 1000, len(rows), cold
+
+
+def warm_up(connections):
+    """
+    PREPARE and run every query once on each of `connections` pooled connections, borrowed
+    together so they are distinct; db.py's pool keeps them idle for the timed runs.
+    """
+    borrowed = [db.connect() for _ in range(connections)]
+    try:
+        for conn in borrowed:
+            cursor = conn.cursor()
+            for name, sql in queries.ANALYTICAL_QUERIES:
+                db.execute_prepared(cursor, name, sql)
+                cursor.fetchall()
+            cursor.close()
+    finally:
+        for conn in borrowed:
+            db.release(conn)
+
+
+def query_plan(name, sql):
+    with db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql)
+        plan = cursor.fetchone()[0][0]['Plan']
+        return {'nodes': db.plan_nodes(plan), 'total_cost': plan['Total Cost']}
+
+
+def run_benchmark(repeat, concurrency):
+    """
+    Run every analytical query `repeat` times, `concurrency` at a time across pooled
+    connections, after one untimed warm-up of each query on every connection (so no timed
+    run pays for a PREPARE). Returns the JSON report.
+    """
+    db.get_pool(pool_max=concurrency)
+    warm_up(concurrency)
+
+    # Interleave the queries so each one runs against the same mix of concurrent neighbours
+    jobs = [(name, sql) for _ in range(repeat) for name, sql in queries.ANALYTICAL_QUERIES]
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(lambda job: time_query(*job), jobs))
+    wall_seconds = time.perf_counter() - start_time
+
+    report = {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': repeat,
+        'concurrency': concurrency,
+        'wall_seconds': round(wall_seconds, 3),
+        'queries_per_second': round(len(jobs) / wall_seconds, 1),
+        'cold_runs': sum(cold for *_, cold in results),
+        'queries': {},
+    }
+    for name, sql in queries.ANALYTICAL_QUERIES:
+        latencies = np.array([ms for query_name, ms, *_ in results if query_name == name])
+        p50, p95 = np.percentile(latencies, [50, 95])
+        report['queries'][name] = {
+            'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3),
+            'max_ms': round(float(latencies.max()), 3),
+            'rows': next(rows for query_name, _, rows, _ in results if query_name == name),
+            'plan': query_plan(name, sql),
+        }
+    return report
+
+
+def compare_with_baseline(report, baseline, tolerance, min_ms):
+    """
+    Flag queries whose p50 grew by more than `tolerance`x (and by at least min_ms, so
+    sub-millisecond noise is ignored), whose row count changed, or whose plan changed.
+    Returns the number of regressions; plan changes alone are only reported.
+    """
+    regressions = 0
+    print(f"\n{'Query':<28} {'Baseline p50':<14} {'p50':<12} {'Ratio':<8} Status")
+    print("-" * 70)
+    for name, result in report['queries'].items():
+        before = baseline['queries'].get(name)
+        if before is None:
+            print(f"{name:<28} {'-':<14} {result['p50_ms']:<12.2f} {'-':<8} new query")
+            continue
+        ratio = result['p50_ms'] / before['p50_ms'] if before['p50_ms'] > 0 else float('inf')
+        problems = []
+        if ratio > tolerance and result['p50_ms'] - before['p50_ms'] >= min_ms:
+            problems.append('slower')
+        if result['rows'] != before['rows']:
+            problems.append(f"rows {before['rows']} → {result['rows']}")
+        regressions += bool(problems)
+        if result['plan']['nodes'] != before['plan']['nodes']:
+            problems.append('plan changed')
+        status = '❌ ' + ', '.join(problems) if problems else '✅'
+        print(f"{name:<28} {before['p50_ms']:<14.2f} {result['p50_ms']:<12.2f} {ratio:<8.2f} {status}")
+        if 'plan changed' in problems:
+            print(f"   was: {' → '.join(before['plan']['nodes'][:4])}")
+            print(f"   now: {' → '.join(result['plan']['nodes'][:4])}")
+    return regressions
+
+
+parser = argparse.ArgumentParser(description="Run the demonstration queries against the listings database")
+parser.add_argument('--export', metavar='CSV',
+                    help="also stream every listing with its stats to this CSV through a server-side cursor")
+parser.add_argument('--benchmark', action='store_true',
+                    help="time the query set instead of printing its results")
+parser.add_argument('--repeat', type=int, default=20, help="timed runs per query in --benchmark mode")
+parser.add_argument('--concurrency', type=int, default=4, help="pooled connections running queries at once")
+parser.add_argument('--output', default='query_benchmark.json', help="where to write the --benchmark report")
+parser.add_argument('--baseline', metavar='JSON', help="earlier --benchmark report to compare against")
+parser.add_argument('--tolerance', type=float, default=1.5,
+                    help="p50 slowdown (x baseline) counted as a regression")
+parser.add_argument('--min-ms', type=float, default=1.0,
+                    help="ignore slowdowns smaller than this many milliseconds")
+args = parser.parse_args()
+if args.repeat < 1 or args.concurrency < 1:
+    parser.error("--repeat and --concurrency must be at least 1")
+
+if args.benchmark:
+    print("\n" + "="*70)
+    print("RUKINDAHOMELESS - SQL QUERY BENCHMARK")
+    print("="*70)
+    print(f"\n⏱️  {len(queries.ANALYTICAL_QUERIES)} queries x {args.repeat} runs, {args.concurrency} at a time")
+
+    report = run_benchmark(args.repeat, args.concurrency)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'Query':<28} {'p50 (ms)':<10} {'p95 (ms)':<10} {'max (ms)':<10} {'Rows':<6}")
+    print("-" * 70)
+    for name, result in report['queries'].items():
+        print(f"{name:<28} {result['p50_ms']:<10.2f} {result['p95_ms']:<10.2f} {result['max_ms']:<10.2f} "
+              f"{result['rows']:<6}")
+        print(f"   {' → '.join(result['plan']['nodes'][:4])}")
+    print(f"\n✅ {report['queries_per_second']:,.0f} queries/sec; report written to {args.output}")
+    if report['cold_runs']:
+        print(f"⚠️  {report['cold_runs']} timed run(s) got a connection that had not been warmed up "
+              f"and include a PREPARE")
+
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report, baseline, args.tolerance, args.min_ms)
+        print(f"\n{'❌' if regressions else '✅'} {regressions} regression(s) against {args.baseline}")
+    print("\n" + "="*70 + "\n")
+    db.close_pool()
+    sys.exit(1 if regressions else 0)
 
 print("\n" + "="*70)
 print("RUKINDAHOMELESS - SQL QUERY DEMONSTRATIONS")
 print("="*70 + "\n")
 
 # Connect to database
-conn = psycopg2.connect(
-    dbname="rukindahomeless",
-    user="yakshbha",
-    password="",
-    host="localhost"
-)
+conn = db.connect()
 cursor = conn.cursor()
 
 # Query 1: Average rent by bedrooms
 print("QUERY 1: Average rent by number of bedrooms")
 print("-" * 70)
-cursor.execute("""
-    SELECT bedrooms, COUNT(*) as num_listings, 
-           ROUND(AVG(monthly_rent), 2) as avg_rent,
-           ROUND(MIN(monthly_rent), 2) as min_rent,
-           ROUND(MAX(monthly_rent), 2) as max_rent
-    FROM listings
-    GROUP BY bedrooms
-    ORDER BY bedrooms
-""")
+db.execute_prepared(cursor, 'avg_rent_by_bedrooms', queries.AVG_RENT_BY_BEDROOMS)
 print(f"{'BR':<4} {'Count':<8} {'Avg Rent':<12} {'Min Rent':<12} {'Max Rent':<12}")
 print("-" * 70)
 for row in cursor.fetchall():
@@ -33,14 +188,7 @@ for row in cursor.fetchall():
 # Query 2: Best deals
 print("\n\nQUERY 2: Top 10 Best Value Apartments (Score >= 7)")
 print("-" * 70)
-cursor.execute("""
-    SELECT l.address, l.bedrooms, l.monthly_rent, s.value_score
-    FROM listings l
-    JOIN listing_stats s ON l.listing_id = s.listing_id
-    WHERE s.value_score >= 7.0
-    ORDER BY s.value_score DESC
-    LIMIT 10
-""")
+db.execute_prepared(cursor, 'best_value', queries.BEST_VALUE)
 print(f"{'Address':<40} {'BR':<4} {'Rent':<10} {'Score':<6}")
 print("-" * 70)
 for row in cursor.fetchall():
@@ -50,12 +198,7 @@ for row in cursor.fetchall():
 # Query 3: Cheapest apartment for each bedroom count
 print("\n\nQUERY 3: Cheapest Apartment for Each Bedroom Count")
 print("-" * 70)
-cursor.execute("""
-    SELECT DISTINCT ON (bedrooms) 
-           bedrooms, address, monthly_rent, source
-    FROM listings
-    ORDER BY bedrooms, monthly_rent
-""")
+db.execute_prepared(cursor, 'cheapest_by_bedrooms', queries.CHEAPEST_BY_BEDROOMS)
 print(f"{'BR':<4} {'Address':<40} {'Rent':<10} {'Source':<15}")
 print("-" * 70)
 for row in cursor.fetchall():
@@ -65,14 +208,7 @@ for row in cursor.fetchall():
 # Query 4: Source comparison
 print("\n\nQUERY 4: Average Rent by Data Source")
 print("-" * 70)
-cursor.execute("""
-    SELECT source, COUNT(*) as count, 
-           ROUND(AVG(monthly_rent), 2) as avg_rent,
-           ROUND(AVG(square_feet), 2) as avg_sqft
-    FROM listings
-    GROUP BY source
-    ORDER BY avg_rent
-""")
+db.execute_prepared(cursor, 'avg_rent_by_source', queries.AVG_RENT_BY_SOURCE)
 print(f"{'Source':<20} {'Count':<8} {'Avg Rent':<12} {'Avg Sqft':<10}")
 print("-" * 70)
 for row in cursor.fetchall():
@@ -81,16 +217,7 @@ for row in cursor.fetchall():
 # Query 5: Above vs below average
 print("\n\nQUERY 5: Listings Above Average for Their Bedroom Count")
 print("-" * 70)
-cursor.execute("""
-    SELECT l.bedrooms, 
-           COUNT(*) as total,
-           SUM(CASE WHEN s.is_above_average THEN 1 ELSE 0 END) as above_avg,
-           SUM(CASE WHEN NOT s.is_above_average THEN 1 ELSE 0 END) as below_avg
-    FROM listings l
-    JOIN listing_stats s ON l.listing_id = s.listing_id
-    GROUP BY l.bedrooms
-    ORDER BY l.bedrooms
-""")
+db.execute_prepared(cursor, 'above_average_by_bedrooms', queries.ABOVE_AVERAGE_BY_BEDROOMS)
 print(f"{'BR':<4} {'Total':<8} {'Above Avg':<12} {'Below Avg':<12}")
 print("-" * 70)
 for row in cursor.fetchall():
@@ -99,13 +226,7 @@ for row in cursor.fetchall():
 # Query 6: Price per sqft leaders
 print("\n\nQUERY 6: Most Expensive per Square Foot")
 print("-" * 70)
-cursor.execute("""
-    SELECT l.address, l.bedrooms, l.monthly_rent, l.square_feet, s.price_per_sqft
-    FROM listings l
-    JOIN listing_stats s ON l.listing_id = s.listing_id
-    ORDER BY s.price_per_sqft DESC
-    LIMIT 5
-""")
+db.execute_prepared(cursor, 'price_per_sqft_leaders', queries.PRICE_PER_SQFT_LEADERS)
 print(f"{'Address':<40} {'BR':<4} {'Rent':<10} {'Sqft':<8} {'$/sqft':<8}")
 print("-" * 70)
 for row in cursor.fetchall():
@@ -115,21 +236,29 @@ for row in cursor.fetchall():
 # Query 7: Complex multi-table join
 print("\n\nQUERY 7: 2BR Apartments with Best Value Scores")
 print("-" * 70)
-cursor.execute("""
-    SELECT l.address, l.monthly_rent, l.square_feet, s.value_score, l.source
-    FROM listings l
-    JOIN listing_stats s ON l.listing_id = s.listing_id
-    WHERE l.bedrooms = 2
-    ORDER BY s.value_score DESC
-    LIMIT 5
-""")
+db.execute_prepared(cursor, 'best_value_2br', queries.BEST_VALUE_2BR)
 print(f"{'Address':<40} {'Rent':<10} {'Sqft':<8} {'Score':<8} {'Source':<15}")
 print("-" * 70)
 for row in cursor.fetchall():
     address = row[0][:37] + "..." if len(row[0]) > 40 else row[0]
     print(f"{address:<40} ${row[1]:<9.2f} {row[2]:<8} {row[3]:<7.1f} {row[4]:<15}")
 
+if args.export:
+    print("\n\nEXPORT: All listings with value metrics")
+    print("-" * 70)
+    start_time = time.perf_counter()
+    exported = 0
+    with open(args.export, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['listing_id', 'address', 'monthly_rent', 'bedrooms', 'bathrooms', 'square_feet',
+                         'source', 'price_per_sqft', 'value_score'])
+        # Chunks come from a server-side cursor, so memory stays flat however many listings there are
+        for rows in db.stream(conn, queries.LISTINGS_EXPORT):
+            writer.writerows(rows)
+            exported += len(rows)
+    print(f"✅ Exported {exported:,} listings to {args.export} in {time.perf_counter() - start_time:.2f}s")
+
 print("\n" + "="*70 + "\n")
 
 cursor.close()
-conn.close()
\ No newline at end of file
+db.release(conn)
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+RUKindaHomeless - Model Backends
+The estimator families predict_rent.py and value_classifier.py can train, selected with
+--backend:
+
+    random_forest   RandomForestRegressor/Classifier, the original models; deep trees, exported
+                    for the NumPy-only predictor (forest_engine.py)
+    hist_gb         HistGradientBoostingRegressor/Classifier; features binned into 255 buckets,
+                    shallow boosted trees, much faster to fit and far smaller on disk
+
+Both scripts report the same metrics for either backend, plus fit time, predict throughput
+and pickled model size, so the choice can be made per deployment.
+
+Usage:
+    backend = BACKENDS['hist_gb']
+    model = backend.make('regressor', backend.params('regressor'))
+"""
+
+import pickle
+import time
+
+import numpy as np
+from sklearn.ensemble import (HistGradientBoostingClassifier, HistGradientBoostingRegressor,
+                              RandomForestClassifier, RandomForestRegressor)
+from sklearn.inspection import permutation_importance
+
+# Rows per predict call when measuring throughput, about a web app page of listings
+THROUGHPUT_BATCH = 100
+
+
+class Backend:
+    """
+    One estimator family: its regressor and classifier classes, default parameters for each
+    task, the CV grid predict_rent.py --search uses, and whether forest_engine.py can
+    export it.
+    """
+
+    def __init__(self, name, label, classes, defaults, grid, compilable):
+        self.name = name
+        self.label = label
+        self.classes = classes
+        self.defaults = defaults
+        self.grid = grid
+        self.compilable = compilable
+
+    def params(self, task, **overrides):
+        """Default parameters for task ('regressor' or 'classifier') with overrides applied."""
+        return {**self.defaults[task], **overrides}
+
+    def make(self, task, params, n_jobs=-1):
+        """An unfitted estimator. n_jobs only applies to random forests; boosting uses OpenMP."""
+        if self.name == 'random_forest':
+            params = {**params, 'n_jobs': n_jobs}
+        return self.classes[task](**params)
+
+
+BACKENDS = {
+    'random_forest': Backend(
+        'random_forest', 'Random Forest',
+        classes={'regressor': RandomForestRegressor, 'classifier': RandomForestClassifier},
+        defaults={
+            'regressor': {
+                'n_estimators': 100,      # 100 trees in the forest
+                'max_depth': 10,          # Maximum depth of each tree
+                'min_samples_split': 5,   # Minimum samples to split a node
+                'random_state': 42,
+            },
+            'classifier': {'n_estimators': 100, 'max_depth': 10, 'min_samples_split': 3, 'random_state': 42},
+        },
+        grid={
+            'n_estimators': [50, 100, 200],
+            'max_depth': [6, 10, None],
+            'min_samples_split': [2, 5, 10],
+        },
+        compilable=True,
+    ),
+    'hist_gb': Backend(
+        'hist_gb', 'Histogram Gradient Boosting',
+        classes={'regressor': HistGradientBoostingRegressor, 'classifier': HistGradientBoostingClassifier},
+        defaults={
+            # Regression on rent in dollars: absolute error, like the MAE we report
+            'regressor': {'loss': 'absolute_error', 'max_iter': 200, 'learning_rate': 0.1,
+                          'max_leaf_nodes': 31, 'min_samples_leaf': 5, 'random_state': 42},
+            'classifier': {'max_iter': 200, 'learning_rate': 0.1, 'max_leaf_nodes': 31,
+                           'min_samples_leaf': 5, 'random_state': 42},
+        },
+        grid={
+            'max_iter': [100, 200, 400],
+            'learning_rate': [0.05, 0.1],
+            'max_leaf_nodes': [15, 31, 63],
+        },
+        compilable=False,
+    ),
+}
+
+
+def n_nodes(model):
+    """Total tree nodes in a fitted model of either backend."""
+    if hasattr(model, 'estimators_'):
+        return int(sum(tree.tree_.node_count for tree in model.estimators_))
+    return int(sum(len(predictor.nodes) for iteration in model._predictors for predictor in iteration))
+
+
+def model_bytes(model):
+    """Size of the pickled model, which is what gets shipped and loaded by workers."""
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def predict_throughput(model, X, min_seconds=0.5):
+    """Rows per second predicted in THROUGHPUT_BATCH-row calls, repeating X for min_seconds."""
+    rows = 0
+    start_time = time.perf_counter()
+    while True:
+        for i in range(0, len(X), THROUGHPUT_BATCH):
+            model.predict(X[i:i + THROUGHPUT_BATCH])
+        rows += len(X)
+        elapsed = time.perf_counter() - start_time
+        if elapsed >= min_seconds:
+            return rows / elapsed
+
+
+def feature_importances(model, X, y):
+    """
+    Impurity importances for random forests. Boosted models don't keep those, so they get
+    permutation importances on (X, y) instead; pass held-out data.
+    """
+    if hasattr(model, 'feature_importances_'):
+        return np.asarray(model.feature_importances_)
+    result = permutation_importance(model, X, y, n_repeats=5, random_state=42)
+    return result.importances_mean
@@ -0,0 +1,192 @@
+"""
+RUKindaHomeless - Batch Scoring
+Scores a listings file of any size with the registered models (models/registry.py). The
+input (CSV or Parquet) is read in chunks, chunks are scored by a pool of worker processes
+that each load the models once, and results are written in input order with three extra
+columns: predicted_rent, predicted_value_category and residual (actual rent minus predicted
+rent). Rows that fail the shared ingest validation (data/ingest.py) are written to a
+quarantine CSV instead of being scored.
+
+At most --workers * 2 chunks are in flight at a time, so memory stays bounded however large
+the input is.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data.ingest import DEFAULT_CHUNK_SIZE, Quarantine, check_columns, read_batches, read_columns, rejects_path
+from models.registry import REGISTRY_DIR, load_model, read_meta
+
+RENT_FEATURES = ['BR', 'Ba', 'sqft']
+VALUE_FEATURES = ['BR', 'Ba', 'sqft', 'price_per_sqft']
+
+# Loaded once per worker process by load_models()
+_models = {}
+
+
+def resolve_versions(registry_dir, engine='sklearn'):
+    """
+    Pin the latest rent and value versions up front, so every worker scores with the same
+    models even if a new version is published mid-run. Raises LookupError if one is missing
+    and ValueError if its features aren't the ones score_chunk builds, or the compiled engine
+    was asked for a model that has no forest export.
+    """
+    pinned = {}
+    for key, features in [('rent', RENT_FEATURES), ('value', VALUE_FEATURES)]:
+        meta = read_meta(key, registry_dir=registry_dir)
+        if meta['features'] != features:
+            raise ValueError(f"{key} v{meta['version']} expects features {meta['features']}, not {features}")
+        if engine == 'compiled' and not meta['compiled']:
+            raise ValueError(f"{key} v{meta['version']} is a {meta['model_type']} with no compiled forest; "
+                             f"use --engine sklearn")
+        pinned[key] = meta['version']
+    return pinned
+
+
+def load_models(registry_dir, engine, pinned):
+    """Pool initializer: load both models into this worker."""
+    for key, version in pinned.items():
+        model = load_model(key, version, compiled=(engine == 'compiled'), registry_dir=registry_dir)
+        if engine == 'sklearn':
+            # Parallelism comes from the process pool; keep each worker single-threaded
+            model.n_jobs = 1
+        _models[key] = model
+
+
+def score_chunk(chunk):
+    """Add predicted_rent, predicted_value_category and residual to a cleaned chunk."""
+    X = chunk[RENT_FEATURES].astype(np.float64)
+    X_value = X.assign(price_per_sqft=chunk['rent'] / chunk['sqft'])
+    X_value = X_value.replace([np.inf, -np.inf], np.nan)
+
+    # Rows missing a feature are left unscored rather than guessed at
+    rent_ok = X.notna().all(axis=1).to_numpy()
+    value_ok = X_value.notna().all(axis=1).to_numpy()
+
+    predicted_rent = np.full(len(chunk), np.nan)
+    if rent_ok.any():
+        predicted_rent[rent_ok] = _models['rent'].predict(X[rent_ok])
+    category = np.full(len(chunk), None, dtype=object)
+    if value_ok.any():
+        category[value_ok] = _models['value'].predict(X_value[value_ok])
+
+    return chunk.assign(
+        predicted_rent=predicted_rent.round(2),
+        predicted_value_category=category,
+        residual=(chunk['rent'].to_numpy(np.float64) - predicted_rent).round(2),
+    )
+
+
+class ChunkWriter:
+    """Append scored chunks to a CSV or Parquet output file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet_writer = None
+        self.csv_file = None
+
+    def write(self, chunk):
+        if self.path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk.astype({'source': str}), preserve_index=False)
+            if self.parquet_writer is None:
+                self.parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self.parquet_writer.write_table(table)
+        else:
+            if self.csv_file is None:
+                self.csv_file = open(self.path, 'w', newline='')
+                chunk.to_csv(self.csv_file, index=False)
+            else:
+                chunk.to_csv(self.csv_file, index=False, header=False)
+
+    def close(self):
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+        if self.csv_file is not None:
+            self.csv_file.close()
+
+
+def score_file(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, registry_dir=REGISTRY_DIR,
+               engine='sklearn', quarantine=None, pinned=None):
+    """
+    Score input_path into output_path with the pinned model versions (the latest when None);
+    returns the number of rows written.
+    """
+    workers = workers or os.cpu_count()
+    max_in_flight = workers * 2
+    writer = ChunkWriter(output_path)
+    rows = 0
+    pinned = pinned or resolve_versions(registry_dir, engine)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_models,
+                             initargs=(registry_dir, engine, pinned)) as pool:
+        in_flight = deque()
+        try:
+            for chunk in read_batches(input_path, chunk_size, quarantine):
+                in_flight.append(pool.submit(score_chunk, chunk))
+                # Write finished chunks in order; block on the oldest once the window is full
+                while in_flight and (len(in_flight) >= max_in_flight or in_flight[0].done()):
+                    scored = in_flight.popleft().result()
+                    writer.write(scored)
+                    rows += len(scored)
+            while in_flight:
+                scored = in_flight.popleft().result()
+                writer.write(scored)
+                rows += len(scored)
+        finally:
+            writer.close()
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Score a listings file with the saved rent and value models")
+    parser.add_argument('input', help="listings CSV or Parquet file")
+    parser.add_argument('--output', default=None, help="CSV or Parquet file to write (default: <input>_scored.csv)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="rows per chunk sent to a worker")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--registry-dir', default=REGISTRY_DIR, help="model registry to score with")
+    parser.add_argument('--engine', choices=['sklearn', 'compiled'], default='sklearn',
+                        help="the sklearn models or their forest_engine.py exports")
+    parser.add_argument('--quarantine', default=None,
+                        help="CSV for rows that fail validation (default: <input>_rejects.csv)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.input)[0] + '_scored.csv'
+
+    print("=" * 70)
+    print("RUKINDAHOMELESS - BATCH SCORING")
+    print("=" * 70)
+    print(f"\n📂 {args.input} → {output}")
+    print(f"   {args.workers} workers, {args.chunk_size:,} rows per chunk, {args.engine} models")
+
+    try:
+        check_columns(read_columns(args.input))
+    except ValueError as e:
+        print(f"\n❌ ERROR: {args.input}: {e}")
+        sys.exit(1)
+
+    try:
+        pinned = resolve_versions(args.registry_dir, args.engine)
+    except (LookupError, ValueError) as e:
+        print(f"\n❌ ERROR: {e}")
+        sys.exit(1)
+    print(f"   Models: rent v{pinned['rent']}, value v{pinned['value']}")
+
+    start_time = time.perf_counter()
+    with Quarantine(args.quarantine or rejects_path(args.input)) as quarantine:
+        rows = score_file(args.input, output, args.chunk_size, args.workers, args.registry_dir, args.engine,
+                          quarantine, pinned)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"\n✅ Scored {rows:,} listings in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/sec)")
+    if quarantine.rows:
+        print(f"⚠️  {quarantine.rows:,} rows failed validation and were written to {quarantine.path}")
+    print("=" * 70 + "\n")
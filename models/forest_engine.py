@@ -0,0 +1,208 @@
+"""
+RUKindaHomeless - Compiled Forest Engine
+Flattens a trained RandomForestRegressor/RandomForestClassifier into a handful of contiguous
+NumPy arrays (one .npy file each) and evaluates every tree at once over a batch using only
+NumPy. Loading uses np.load(mmap_mode='r'), so workers start fast and share the model pages.
+
+models/registry.py exports every random forest it publishes (registry/<name>/v<N>/forest/).
+Re-export a published version, or compare its export with the sklearn model:
+    python forest_engine.py export rent [--version 3]
+    python forest_engine.py check rent [--version 3]
+Predict:
+    forest = CompiledForest.load('models/registry/rent/v1/forest')
+    forest.predict(X)
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+ARRAYS = ['roots', 'feature', 'threshold', 'right', 'value']
+FORMAT_VERSION = 1
+
+
+def export_forest(model, out_dir):
+    """
+    Write a fitted sklearn forest to out_dir as roots/feature/threshold/right/value .npy files
+    plus meta.json. Node indices are global across trees. sklearn builds trees depth first, so
+    a split's left child is always the next node and only the right child is stored. Leaves get
+    a -inf threshold and point right to themselves, so a fixed number of steps walks every tree
+    to its leaf.
+    """
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    is_classifier = hasattr(model, 'classes_')
+
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+    feature, threshold, right, value = [], [], [], []
+    for offset, tree in zip(offsets, trees):
+        nodes = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        if not (tree.children_left[~is_leaf] == nodes[~is_leaf] + 1).all():
+            raise ValueError("expected left children to directly follow their parent node")
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(np.where(is_leaf, -np.inf, tree.threshold))
+        right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+
+        leaf_values = tree.value[:, 0, :]
+        if is_classifier:
+            # Older sklearn stores class counts, newer stores fractions; predict_proba wants fractions
+            leaf_values = leaf_values / leaf_values.sum(axis=1, keepdims=True)
+        value.append(leaf_values)
+
+    arrays = {
+        'roots': offsets[:-1].astype(np.int32),
+        'feature': np.concatenate(feature).astype(np.int32),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'right': np.concatenate(right).astype(np.int32),
+        'value': np.concatenate(value).astype(np.float64),
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name in ARRAYS:
+        np.save(os.path.join(out_dir, f'{name}.npy'), np.ascontiguousarray(arrays[name]))
+
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'kind': 'classifier' if is_classifier else 'regressor',
+        'model_type': type(model).__name__,
+        'n_trees': len(trees),
+        'n_nodes': int(offsets[-1]),
+        'max_depth': max(int(tree.max_depth) for tree in trees),
+        'n_features': int(model.n_features_in_),
+        'feature_names': [str(name) for name in getattr(model, 'feature_names_in_', [])],
+        'classes': [c.item() if hasattr(c, 'item') else c for c in model.classes_] if is_classifier else None,
+    }
+    with open(os.path.join(out_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class CompiledForest:
+    """NumPy-only predictor over the arrays written by export_forest."""
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.kind = meta['kind']
+        self.max_depth = meta['max_depth']
+        self.feature_names = meta['feature_names']
+        self.classes = np.array(meta['classes']) if meta['classes'] is not None else None
+        for name in ARRAYS:
+            # Plain ndarray views: still backed by the mapped file, without np.memmap's per-op overhead
+            setattr(self, name, np.asarray(arrays[name]))
+
+    @classmethod
+    def load(cls, model_dir, mmap=True):
+        with open(os.path.join(model_dir, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"{model_dir} was exported with format {meta.get('format_version')}, "
+                             f"expected {FORMAT_VERSION}")
+        arrays = {name: np.load(os.path.join(model_dir, f'{name}.npy'), mmap_mode='r' if mmap else None)
+                  for name in ARRAYS}
+        return cls(meta, arrays)
+
+    def _features(self, X):
+        # Same dtype sklearn uses for tree inputs, so splits land on the same side
+        if hasattr(X, 'columns') and self.feature_names:
+            X = X[self.feature_names]
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X
+
+    def _leaf_values(self, X):
+        """Average leaf value over all trees for each row of X."""
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.int32) * n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (n_rows, len(self.roots))).copy()
+        # One step per level for every (row, tree) pair at once; flat np.take beats 2-D fancy indexing
+        for _ in range(self.max_depth):
+            go_left = np.take(flat_X, row_offsets + np.take(self.feature, nodes)) <= np.take(self.threshold, nodes)
+            nodes = np.where(go_left, nodes + 1, np.take(self.right, nodes))
+        return np.take(self.value, nodes, axis=0).mean(axis=1)
+
+    def _batched(self, X, batch_size):
+        # Bound the (rows x trees) node matrix so memory stays flat on large inputs
+        return np.concatenate([self._leaf_values(X[start:start + batch_size])
+                               for start in range(0, len(X), batch_size)]) if len(X) else \
+            np.empty((0, self.value.shape[1]))
+
+    def predict_proba(self, X, batch_size=1024):
+        if self.kind != 'classifier':
+            raise ValueError("predict_proba is only available for classifiers")
+        return self._batched(self._features(X), batch_size)
+
+    def predict(self, X, batch_size=1024):
+        values = self._batched(self._features(X), batch_size)
+        if self.kind == 'classifier':
+            return self.classes[values.argmax(axis=1)]
+        return values[:, 0]
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from models.registry import REGISTRY_DIR, load_model, open_model, version_dir
+
+    parser = argparse.ArgumentParser(description="Compile the registry's random forests into NumPy arrays")
+    parser.add_argument('--registry-dir', default=REGISTRY_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export_parser = subparsers.add_parser('export', help="(re)write a version's forest/ export")
+    export_parser.add_argument('name', help="registered model, e.g. rent or value")
+    export_parser.add_argument('--version', type=int, help="default: latest")
+    check_parser = subparsers.add_parser('check', help="compare a version's compiled forest with its sklearn model")
+    check_parser.add_argument('name', help="registered model, e.g. rent or value")
+    check_parser.add_argument('--version', type=int, help="default: latest")
+    check_parser.add_argument('--rows', type=int, default=100000, help="random rows to compare on")
+    args = parser.parse_args()
+
+    try:
+        path = version_dir(args.name, args.version, args.registry_dir)
+    except LookupError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.command == 'export':
+        # Checked against the version's model_sha256 before exporting
+        model = open_model(path)
+        if not hasattr(model, 'estimators_') or not hasattr(model.estimators_[0], 'tree_'):
+            print(f"❌ {path} holds a {type(model).__name__}; only random forests can be compiled")
+            sys.exit(1)
+        meta = export_forest(model, os.path.join(path, 'forest'))
+        print(f"✅ {path} -> forest/ ({meta['n_trees']} trees, {meta['n_nodes']:,} nodes)")
+    else:
+        model = load_model(args.name, args.version, registry_dir=args.registry_dir)
+        try:
+            forest = load_model(args.name, args.version, compiled=True, registry_dir=args.registry_dir)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+        rng = np.random.default_rng(0)
+        br = rng.integers(0, 6, args.rows)
+        X = np.column_stack([br, rng.choice([1.0, 1.5, 2.0, 2.5], args.rows),
+                             rng.integers(150, 2500, args.rows), rng.uniform(0.5, 6.0, args.rows)])
+        X = X[:, :forest.meta['n_features']]
+        if forest.feature_names:
+            import pandas as pd
+            X = pd.DataFrame(X, columns=forest.feature_names)
+
+        start_time = time.perf_counter()
+        expected = model.predict(X)
+        sklearn_seconds = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        actual = forest.predict(X)
+        compiled_seconds = time.perf_counter() - start_time
+
+        if forest.kind == 'classifier':
+            mismatches = int((expected != actual).sum())
+            print(f"   label mismatches: {mismatches:,} / {args.rows:,}")
+        else:
+            print(f"   max abs difference: {np.abs(expected - actual).max():.6f}")
+        print(f"   sklearn:  {sklearn_seconds:.3f}s")
+        print(f"   compiled: {compiled_seconds:.3f}s")
@@ -1,28 +1,70 @@
 """
-RUKindaHomeless - Random Forest Rent Prediction Model
-Predicts monthly rent based on bedrooms, bathrooms, and square footage
+RUKindaHomeless - Rent Prediction Model
+Predicts monthly rent based on bedrooms, bathrooms, and square footage, with a random
+forest (default) or histogram gradient boosting (--backend hist_gb, see models/backends.py)
 """
 
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, r2_score, mean_squared_error
-import pickle
+import argparse
+import json
+import os
+import sys
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data.listings import load_listings, DEFAULT_CSV
+from models.registry import REGISTRY_DIR, describe_data, publish, read_meta
+from models.backends import BACKENDS, feature_importances, model_bytes, predict_throughput
+from models.training import ModelCache, fingerprint, fit, grid_search
+
+parser = argparse.ArgumentParser(description="Train the rent prediction model")
+parser.add_argument('--csv', default=DEFAULT_CSV, help="path to the listings CSV")
+parser.add_argument('--keep-duplicates', action='store_true',
+                    help="train on every row instead of one row per near-duplicate cluster (data/dedup.py)")
+parser.add_argument('--backend', choices=sorted(BACKENDS), default='random_forest',
+                    help="model family (default: random_forest)")
+parser.add_argument('--registry-dir', default=REGISTRY_DIR, help="model registry to publish to")
+parser.add_argument('--n-estimators', type=int,
+                    help="trees in the forest, or boosting iterations for hist_gb")
+parser.add_argument('--max-depth', type=int, help="maximum tree depth (0 for unlimited)")
+parser.add_argument('--min-samples-split', type=int, help="minimum samples to split a node (random_forest only)")
+parser.add_argument('--retrain', action='store_true',
+                    help="fit even if a cached model matches the data and parameters")
+parser.add_argument('--search', action='store_true',
+                    help="cross-validate a parameter grid first and train the most accurate config")
+parser.add_argument('--grid', type=json.loads,
+                    help='parameter grid as JSON, e.g. \'{"max_depth": [6, 10, null]}\' '
+                         '(default: the backend\'s grid in models/backends.py)')
+parser.add_argument('--folds', type=int, default=5, help="cross-validation folds for --search")
+parser.add_argument('--workers', type=int, default=None,
+                    help="worker processes for --search (default: one per CPU)")
+args = parser.parse_args()
+
+backend = BACKENDS[args.backend]
+overrides = {}
+if args.n_estimators is not None:
+    overrides['max_iter' if args.backend == 'hist_gb' else 'n_estimators'] = args.n_estimators
+if args.max_depth is not None:
+    overrides['max_depth'] = args.max_depth or None
+if args.min_samples_split is not None:
+    if args.backend == 'hist_gb':
+        parser.error("--min-samples-split only applies to --backend random_forest")
+    overrides['min_samples_split'] = args.min_samples_split
+params = backend.params('regressor', **overrides)
+grid = args.grid or backend.grid
+
 print("=" * 70)
-print("RANDOM FOREST RENT PREDICTION MODEL")
+print(f"{backend.label.upper()} RENT PREDICTION MODEL")
 print("=" * 70)
 
 # Load data
 print("\n📂 Loading data...")
-df = pd.read_csv('../data/listings.csv')
-
-# Clean rent column (remove commas if present)
-df['rent'] = df['rent'].astype(str).str.replace(',', '').astype(float)
+df = load_listings(args.csv, dedupe=not args.keep_duplicates)
 
-print(f"✅ Loaded {len(df)} listings")
+print(f"✅ Loaded {len(df)} listings{'' if args.keep_duplicates else ' (near-duplicates removed)'}")
 print(f"📋 Columns: {list(df.columns)}")
 
 # Prepare features and target
@@ -46,18 +88,42 @@ X_train, X_test, y_train, y_test = train_test_split(
 print(f"   Training set: {X_train.shape[0]} samples")
 print(f"   Test set: {X_test.shape[0]} samples")
 
-# Train Random Forest model
-print("\n🌲 Training Random Forest model...")
-model = RandomForestRegressor(
-    n_estimators=100,      # 100 trees in the forest
-    max_depth=10,          # Maximum depth of each tree
-    min_samples_split=5,   # Minimum samples to split a node
-    random_state=42,
-    n_jobs=-1              # Use all CPU cores
-)
-
-model.fit(X_train, y_train)
-print("✅ Model trained successfully!")
+# Pick parameters by cross-validation
+if args.search:
+    configs = 1
+    for values in grid.values():
+        configs *= len(values)
+    print(f"\n🔍 Searching {configs} configs x {args.folds} folds "
+          f"on {args.workers or os.cpu_count()} worker process(es)...")
+    results, wall_seconds = grid_search(X_train.to_numpy(), y_train.to_numpy(), args.backend, grid,
+                                        folds=args.folds, workers=args.workers)
+
+    names = sorted(grid)
+    print(f"\n{'  '.join(f'{n:<17}' for n in names)}  {'CV MAE':>14}  {'fit':>7}  {'µs/row':>7}  {'nodes':>8}")
+    print("-" * 70)
+    for result in results:
+        values = '  '.join(f"{str(result['params'][n]):<17}" for n in names)
+        print(f"{values}  ${result['mae']:>7.2f} ±{result['mae_std']:>5.2f}  "
+              f"{result['fit_seconds']:>6.2f}s  {result['latency_us']:>7.1f}  {result['nodes']:>8,}"
+              f"{'  ◆' if result['pareto'] else ''}")
+    print(f"\n   ◆ = no other config is both more accurate and faster to predict")
+    print(f"   ⏱️  Search took {wall_seconds:.2f}s wall time")
+
+    params = results[0]['params']
+    print(f"\n🏆 Best config: {json.dumps({n: params[n] for n in names})}")
+
+# Train the model, unless this exact data and config was trained before
+cache = ModelCache()
+cache_key = fingerprint(X_train, y_train, args.backend, params)
+cached = None if args.retrain else cache.load(cache_key)
+if cached is not None:
+    model, fit_seconds = cached
+    print(f"\n♻️  Reusing cached model {cache_key[:12]} (same data and parameters; --retrain to refit)")
+else:
+    print(f"\n🌲 Training {backend.label} model...")
+    model, fit_seconds = fit(X_train, y_train, args.backend, params)
+    cache.store(cache_key, model, fit_seconds)
+    print(f"✅ Model trained successfully in {fit_seconds:.2f}s!")
 
 # Make predictions
 print("\n🔮 Making predictions...")
@@ -89,11 +155,20 @@ print(f"   MAE (Mean Absolute Error): ${test_mae:.2f}")
 print(f"   RMSE (Root Mean Squared Error): ${test_rmse:.2f}")
 print(f"   R² Score: {test_r2:.4f}")
 
+# Cost of the model, for choosing a backend per deployment
+predict_rows_per_second = predict_throughput(model, X_test)
+size_bytes = model_bytes(model)
+
+print("\n⚡ Training and Inference Cost:")
+print(f"   Fit time: {fit_seconds:.2f}s{' (cached)' if cached is not None else ''}")
+print(f"   Predict throughput: {predict_rows_per_second:,.0f} rows/sec")
+print(f"   Model size: {size_bytes / 1024:,.1f} KB pickled")
+
 # Feature importance
 print("\n🎯 Feature Importance:")
 feature_importance = pd.DataFrame({
     'feature': X.columns,
-    'importance': model.feature_importances_
+    'importance': feature_importances(model, X_test, y_test)
 }).sort_values('importance', ascending=False)
 
 for idx, row in feature_importance.iterrows():
@@ -117,27 +192,38 @@ for ex in examples:
     pred = model.predict([[ex['BR'], ex['Ba'], ex['sqft']]])[0]
     print(f"{ex['BR']:<10} {ex['Ba']:<12} {ex['sqft']:<10} ${pred:<14.2f}")
 
-# Save model
-print("\n💾 Saving model...")
-with open('rent_predictor.pkl', 'wb') as f:
-    pickle.dump(model, f)
-print("✅ Model saved as 'rent_predictor.pkl'")
-
-# Save metrics to file
+# Metrics stored with the model
 metrics_summary = {
-    'model_type': 'Random Forest Regressor',
-    'n_estimators': 100,
+    'model_type': f'{backend.label} Regressor',
+    'backend': args.backend,
+    'n_estimators': getattr(model, 'n_iter_', None) or len(model.estimators_),
+    'params': params,
     'train_mae': train_mae,
     'train_rmse': train_rmse,
     'train_r2': train_r2,
     'test_mae': test_mae,
     'test_rmse': test_rmse,
     'test_r2': test_r2,
+    'fit_seconds': fit_seconds,
+    'predict_rows_per_second': predict_rows_per_second,
+    'model_bytes': size_bytes,
     'feature_importance': feature_importance.to_dict('records')
 }
 
-with open('model_metrics.pkl', 'wb') as f:
-    pickle.dump(metrics_summary, f)
+# Publish a new registry version (models/registry.py); serving code loads the latest
+print("\n💾 Publishing model...")
+data = describe_data(args.csv, len(df), deduplicated=not args.keep_duplicates)
+try:
+    latest = read_meta('rent', registry_dir=args.registry_dir)
+except LookupError:
+    latest = None
+# The cache file is dumped the same way publish() dumps, so equal checksums mean the same model
+if latest and latest['model_sha256'] == cache.checksum(cache_key) and latest['data'] == data:
+    print(f"✅ Same model and data as rent v{latest['version']}; nothing new to publish")
+else:
+    version = publish('rent', model, X.columns, data, metrics_summary, params=params, backend=args.backend,
+                      registry_dir=args.registry_dir)
+    print(f"✅ Model published as rent v{version} in '{args.registry_dir}'")
 
 print("\n" + "=" * 70)
 print("✅ MODEL TRAINING COMPLETE!")
@@ -0,0 +1,315 @@
+"""
+RUKindaHomeless - Rent Prediction Service
+Loads the registered rent model (models/registry.py; the latest version, or its compiled
+forest with --compiled) once and serves predictions over HTTP or stdin/stdout (JSON lines).
+Requests that arrive within a short window are coalesced into one model.predict call, so
+many concurrent callers share scikit-learn's per-call overhead instead of each paying it.
+
+HTTP:
+    POST /predict   {"BR": 2, "Ba": 1, "sqft": 900}  or  {"listings": [{...}, {...}]}
+    GET  /stats     request/batch counts and latency percentiles
+    GET  /health
+stdio (--stdio): one JSON request per input line, one JSON response per output line.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from models.forest_engine import CompiledForest
+from models.registry import REGISTRY_DIR, load_model, read_meta, version_dir
+from models.registry import open_model as open_version
+
+FEATURES = ['BR', 'Ba', 'sqft']
+
+
+class MicroBatcher:
+    """Queue single rows and predict them together once the window closes or the batch is full."""
+
+    def __init__(self, model, window_ms=2.0, max_batch=256, history=10000):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        self.latencies = deque(maxlen=history)
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+
+    async def predict(self, rows):
+        """Predict a list of feature rows; resolves when their batch has run."""
+        loop = asyncio.get_running_loop()
+        start_time = time.perf_counter()
+        futures = []
+        for row in rows:
+            future = loop.create_future()
+            self.queue.put_nowait((row, future))
+            futures.append(future)
+        predictions = await asyncio.gather(*futures)
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        self.latencies.append(latency_ms)
+        self.requests += 1
+        return predictions, latency_ms
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            # Give concurrent callers one window to join, unless a full batch is already waiting
+            if self.queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            X = pd.DataFrame([row for row, _ in batch], columns=FEATURES)
+            try:
+                # Run in a thread so new requests keep queueing while the forest predicts
+                predictions = await loop.run_in_executor(None, self.model.predict, X)
+            except Exception as e:
+                # One bad row shouldn't fail everyone who shared its window: retry row by row
+                if len(batch) == 1:
+                    predictions = [e]
+                else:
+                    predictions = await loop.run_in_executor(None, self.predict_each, X)
+            for (_, future), prediction in zip(batch, predictions):
+                if future.done():
+                    continue
+                if isinstance(prediction, Exception):
+                    future.set_exception(prediction)
+                else:
+                    future.set_result(round(float(prediction), 2))
+            self.batches += 1
+            self.rows += len(batch)
+
+    def predict_each(self, X):
+        """Predict X one row at a time; a row that fails gets its exception instead of a value."""
+        predictions = []
+        for i in range(len(X)):
+            try:
+                predictions.append(self.model.predict(X.iloc[i:i + 1])[0])
+            except Exception as e:
+                predictions.append(e)
+        return predictions
+
+    def stats(self):
+        latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'rows': self.rows,
+            'avg_batch_size': round(self.rows / self.batches, 1) if self.batches else 0,
+            'latency_ms': {
+                'p50': round(p50, 3),
+                'p95': round(p95, 3),
+                'p99': round(p99, 3),
+                'max': round(latencies.max(), 3),
+            },
+        }
+
+
+def parse_rows(payload):
+    """Feature rows from {"BR", "Ba", "sqft"} or {"listings": [...]}; raises ValueError if malformed."""
+    listings = payload.get('listings', [payload]) if isinstance(payload, dict) else None
+    if not isinstance(listings, list) or not listings:
+        raise ValueError('expected {"BR", "Ba", "sqft"} or {"listings": [...]}')
+    rows = []
+    for listing in listings:
+        try:
+            row = [float(listing[feature]) for feature in FEATURES]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"each listing needs numeric {', '.join(FEATURES)}")
+        # json.loads accepts Infinity and NaN, which the model can't predict on
+        if not all(math.isfinite(value) for value in row):
+            raise ValueError(f"{', '.join(FEATURES)} must be finite numbers")
+        rows.append(row)
+    return rows
+
+
+async def handle_payload(batcher, payload):
+    """Shared by both transports: returns (status, response dict)."""
+    try:
+        rows = parse_rows(payload)
+    except ValueError as e:
+        return 400, {'error': str(e)}
+    try:
+        predictions, latency_ms = await batcher.predict(rows)
+    except Exception as e:
+        return 500, {'error': f'prediction failed: {e}'}
+    if 'listings' in payload:
+        return 200, {'predictions': predictions, 'latency_ms': round(latency_ms, 3)}
+    return 200, {'prediction': predictions[0], 'latency_ms': round(latency_ms, 3)}
+
+
+async def handle_http(batcher, reader, writer):
+    """Minimal HTTP/1.1 with keep-alive: enough for curl, load testers and other local services."""
+    reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+            if method == 'POST' and path == '/predict':
+                try:
+                    status, response = await handle_payload(batcher, json.loads(body or b'{}'))
+                except json.JSONDecodeError:
+                    status, response = 400, {'error': 'body must be JSON'}
+            elif method == 'GET' and path == '/stats':
+                status, response = 200, batcher.stats()
+            elif method == 'GET' and path == '/health':
+                status, response = 200, {'status': 'ok'}
+            else:
+                status, response = 404, {'error': f'no route for {method} {path}'}
+
+            data = json.dumps(response).encode()
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            writer.write(
+                f"HTTP/1.1 {status} {reasons[status]}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_stdio(batcher):
+    """Answer JSON lines from stdin concurrently; responses carry the request's "id" if given."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    async def answer(line):
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError:
+            status, response = 400, {'error': 'line must be JSON'}
+        else:
+            status, response = await handle_payload(batcher, payload)
+            if isinstance(payload, dict) and 'id' in payload:
+                response['id'] = payload['id']
+        response['status'] = status
+        print(json.dumps(response), flush=True)
+
+    pending = set()
+    while line := await reader.readline():
+        if line.strip():
+            task = asyncio.create_task(answer(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.wait(pending)
+
+
+async def run_benchmark(batcher, requests, concurrency):
+    """Fire single-row requests from `concurrency` callers and report throughput."""
+    rng = np.random.default_rng(42)
+    br = rng.integers(0, 5, requests)
+    rows = np.column_stack([br, np.where(br <= 1, 1.0, 2.0), 430 + 280 * br]).tolist()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(row):
+        async with semaphore:
+            await batcher.predict([row])
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(one(row) for row in rows))
+    elapsed = time.perf_counter() - start_time
+    return requests / elapsed
+
+
+def open_model(args):
+    """
+    The model to serve: a registry version directory or forest_engine.py export given with
+    --model, else a version from the registry.
+    """
+    if args.model and os.path.exists(os.path.join(args.model, 'model.joblib')):
+        # Checked against the checksum in its meta.json, like every registry load
+        model = open_version(args.model)
+    elif args.model and os.path.isdir(args.model):
+        return CompiledForest.load(args.model)
+    elif args.model:
+        raise ValueError(f"{args.model} is not a registry version or forest export; "
+                         f"publish loose pickles with `python registry.py import-legacy` first")
+    else:
+        meta = read_meta('rent', args.version, args.registry_dir)
+        if meta['features'] != FEATURES:
+            raise ValueError(f"rent v{meta['version']} expects features {meta['features']}, not {FEATURES}")
+        print(f"📦 rent v{meta['version']} ({meta['backend']}{', compiled' if args.compiled else ''})",
+              file=sys.stderr)
+        if args.compiled:
+            return load_model('rent', meta['version'], compiled=True, registry_dir=args.registry_dir)
+        # An uncached copy: load_model's instance is shared and n_jobs is set below
+        model = open_version(version_dir('rent', meta['version'], args.registry_dir))
+    # Batches are small; joblib's thread fan-out costs more than it saves here
+    model.n_jobs = args.jobs
+    return model
+
+
+async def main(args):
+    model = open_model(args)
+
+    batcher = MicroBatcher(model, window_ms=args.window_ms, max_batch=args.max_batch)
+    worker = asyncio.create_task(batcher.run())
+
+    if args.benchmark:
+        rate = await run_benchmark(batcher, args.benchmark, args.concurrency)
+        print(f"✅ {args.benchmark:,} predictions at {rate:,.0f}/sec", file=sys.stderr)
+        print(json.dumps(batcher.stats(), indent=2), file=sys.stderr)
+    elif args.stdio:
+        await serve_stdio(batcher)
+        print(json.dumps(batcher.stats()), file=sys.stderr)
+    else:
+        server = await asyncio.start_server(lambda r, w: handle_http(batcher, r, w), args.host, args.port)
+        print(f"✅ Serving rent predictions on http://{args.host}:{args.port} "
+              f"(window {args.window_ms} ms, max batch {args.max_batch})", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+    worker.cancel()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve rent predictions with request micro-batching")
+    parser.add_argument('--registry-dir', default=REGISTRY_DIR, help="model registry to serve from")
+    parser.add_argument('--version', type=int, help="rent model version (default: latest)")
+    parser.add_argument('--compiled', action='store_true', help="serve the version's forest_engine.py export")
+    parser.add_argument('--model', help="serve this registry version directory or forest_engine.py export instead")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--stdio', action='store_true', help="read JSON lines from stdin instead of serving HTTP")
+    parser.add_argument('--window-ms', type=float, default=2.0, help="how long to wait for more requests per batch")
+    parser.add_argument('--max-batch', type=int, default=256, help="largest batch sent to the model")
+    parser.add_argument('--jobs', type=int, default=1, help="n_jobs for model.predict")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="time N in-process requests and exit")
+    parser.add_argument('--concurrency', type=int, default=256, help="concurrent callers for --benchmark")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
+    except (LookupError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
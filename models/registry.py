@@ -0,0 +1,274 @@
+"""
+RUKindaHomeless - Model Registry
+Versioned model artifacts in place of the loose pickles the training scripts used to write.
+Every training run publishes a new immutable version:
+
+    models/registry/<name>/v<N>/
+        meta.json       format version, backend, feature list, training data fingerprint,
+                        parameters, metrics, sklearn version, artifact checksums
+        model.joblib    the fitted estimator (uncompressed, so its arrays can be memory-mapped)
+        forest/         forest_engine.py export, random forests only
+
+meta.json can be read on its own, so listing and comparing versions never deserializes a
+model. load_model() keeps the most recently used versions in an in-process LRU cache and
+memory-maps array data, so worker processes share the pages of the same artifact.
+
+joblib is still pickle underneath: only load artifacts this project published.
+
+    python registry.py list [name]
+    python registry.py show rent [--version 3]
+    python registry.py import-legacy          # rent_predictor.pkl etc. -> registry versions
+
+Usage:
+    from models.registry import describe_data, load_model, publish, read_meta
+    data = describe_data(csv_path, len(df), deduplicated=True)
+    version = publish('rent', model, features, data, metrics, params, backend='random_forest')
+    model = load_model('rent')                     # latest version
+    forest = load_model('rent', compiled=True)     # CompiledForest over the mapped arrays
+"""
+
+import argparse
+import datetime
+import functools
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import warnings
+
+import joblib
+import numpy as np
+import sklearn
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from models.forest_engine import CompiledForest, export_forest
+
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_DIR = os.path.join(MODELS_DIR, 'registry')
+FORMAT_VERSION = 1
+
+# Loaded versions kept per process; each holds a model of a few hundred KB to a few MB
+CACHE_SIZE = 8
+
+# The headline metric shown by `list` for each model
+HEADLINE_METRICS = {'rent': 'test_mae', 'value': 'test_accuracy'}
+
+# Legacy pickle layout: name -> (model pickle, metrics pickle, features)
+LEGACY_FILES = {
+    'rent': ('rent_predictor.pkl', 'model_metrics.pkl', ['BR', 'Ba', 'sqft']),
+    'value': ('value_classifier.pkl', 'classifier_info.pkl', ['BR', 'Ba', 'sqft', 'price_per_sqft']),
+}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def to_json(value):
+    """json.dump default for the NumPy scalars and arrays that end up in metrics."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def describe_data(path, rows, deduplicated):
+    """The data entry of meta.json for a model trained on rows of the listings file at path."""
+    return {'source': os.path.abspath(path), 'sha256': file_sha256(path), 'rows': rows,
+            'deduplicated': deduplicated}
+
+
+def versions(name, registry_dir=REGISTRY_DIR):
+    """Published version numbers of name, oldest first."""
+    try:
+        entries = os.listdir(os.path.join(registry_dir, name))
+    except FileNotFoundError:
+        return []
+    return sorted(int(entry[1:]) for entry in entries if entry.startswith('v') and entry[1:].isdigit())
+
+
+def version_dir(name, version=None, registry_dir=REGISTRY_DIR):
+    """Directory of a version (the latest when version is None); raises LookupError if missing."""
+    published = versions(name, registry_dir)
+    if version is None:
+        if not published:
+            raise LookupError(f"no '{name}' model in {registry_dir}; train one first")
+        version = published[-1]
+    elif version not in published:
+        raise LookupError(f"'{name}' has no version {version} (published: {published or 'none'})")
+    return os.path.join(registry_dir, name, f'v{version}')
+
+
+def read_meta(name, version=None, registry_dir=REGISTRY_DIR):
+    """A version's metadata, without touching the model itself."""
+    with open(os.path.join(version_dir(name, version, registry_dir), 'meta.json')) as f:
+        return json.load(f)
+
+
+def publish(name, model, features, data, metrics, params=None, backend=None, parent=None,
+            registry_dir=REGISTRY_DIR):
+    """
+    Store a fitted model as the next version of name and return its version number. data
+    describes the training data (source file, its fingerprint, rows); parent is the version
+    an incremental update started from.
+    """
+    model_root = os.path.join(registry_dir, name)
+    os.makedirs(model_root, exist_ok=True)
+    version = (versions(name, registry_dir) or [0])[-1] + 1
+
+    # Written under a temporary name and renamed, so readers never see half a version
+    tmp_dir = os.path.join(model_root, f'.v{version}.tmp')
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    joblib.dump(model, os.path.join(tmp_dir, 'model.joblib'))
+    compiled = hasattr(model, 'estimators_') and hasattr(model.estimators_[0], 'tree_')
+    if compiled:
+        export_forest(model, os.path.join(tmp_dir, 'forest'))
+
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'name': name,
+        'version': version,
+        'parent': parent,
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'model_type': type(model).__name__,
+        'backend': backend,
+        'features': list(features),
+        'data': data,
+        'params': params,
+        'metrics': metrics,
+        'compiled': compiled,
+        'sklearn_version': sklearn.__version__,
+        'model_sha256': file_sha256(os.path.join(tmp_dir, 'model.joblib')),
+    }
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2, default=to_json)
+
+    os.rename(tmp_dir, os.path.join(model_root, f'v{version}'))
+    return version
+
+
+def open_model(path, mmap=True):
+    """
+    Load the model in a version directory, uncached, after checking it against the checksum in
+    its meta.json. Callers that modify the model (incremental updates) want mmap=False.
+    """
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    if meta.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"{path} has format {meta.get('format_version')}, expected {FORMAT_VERSION}")
+    model_path = os.path.join(path, 'model.joblib')
+    if file_sha256(model_path) != meta['model_sha256']:
+        raise ValueError(f"{model_path} does not match the checksum in its meta.json")
+    if meta['sklearn_version'] != sklearn.__version__:
+        warnings.warn(f"{path} was trained with scikit-learn {meta['sklearn_version']}, "
+                      f"running {sklearn.__version__}")
+    return joblib.load(model_path, mmap_mode='r' if mmap else None)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _cached_model(path, compiled):
+    if compiled:
+        forest_dir = os.path.join(path, 'forest')
+        if not os.path.isdir(forest_dir):
+            raise ValueError(f"{path} has no compiled forest (only random forests are exported)")
+        return CompiledForest.load(forest_dir)
+    return open_model(path)
+
+
+def load_model(name, version=None, compiled=False, registry_dir=REGISTRY_DIR):
+    """
+    A published model (the latest version when version is None), from the per-process LRU
+    cache when it was loaded before. compiled returns the forest_engine.py CompiledForest.
+    The cached object is shared: don't modify it (use open_model for that).
+    """
+    return _cached_model(version_dir(name, version, registry_dir), compiled)
+
+
+def cache_info():
+    """Hits, misses and size of the loaded-model cache."""
+    return _cached_model.cache_info()
+
+
+def import_legacy(model_dir=MODELS_DIR, registry_dir=REGISTRY_DIR):
+    """Publish the pickles the training scripts used to write. Returns [(name, version)]."""
+    imported = []
+    for name, (model_file, metrics_file, features) in LEGACY_FILES.items():
+        model_path = os.path.join(model_dir, model_file)
+        if not os.path.exists(model_path):
+            continue
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        metrics_path = os.path.join(model_dir, metrics_file)
+        metrics = {}
+        if os.path.exists(metrics_path):
+            with open(metrics_path, 'rb') as f:
+                metrics = pickle.load(f)
+        params = {key: value for key, value in model.get_params().items() if key != 'n_jobs'}
+        data = {'source': 'legacy import', 'file': model_file, 'sha256': None,
+                'rows': None, 'imported_sha256': file_sha256(model_path)}
+        version = publish(name, model, features, data, metrics, params=params,
+                          backend=metrics.get('backend', 'random_forest'), registry_dir=registry_dir)
+        imported.append((name, version))
+    return imported
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Inspect and populate the model registry")
+    parser.add_argument('--registry-dir', default=REGISTRY_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    list_parser = subparsers.add_parser('list', help="published versions")
+    list_parser.add_argument('name', nargs='?', help="only this model")
+    show_parser = subparsers.add_parser('show', help="print a version's meta.json")
+    show_parser.add_argument('name')
+    show_parser.add_argument('--version', type=int, help="default: latest")
+    legacy_parser = subparsers.add_parser('import-legacy', help="publish rent_predictor.pkl and value_classifier.pkl")
+    legacy_parser.add_argument('--model-dir', default=MODELS_DIR, help="directory holding the pickles")
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'show':
+            print(json.dumps(read_meta(args.name, args.version, args.registry_dir), indent=2))
+            sys.exit(0)
+
+        print("=" * 70)
+        print("RUKINDAHOMELESS - MODEL REGISTRY")
+        print("=" * 70)
+
+        if args.command == 'import-legacy':
+            imported = import_legacy(args.model_dir, args.registry_dir)
+            if not imported:
+                print(f"\n❌ No legacy pickles found in {args.model_dir}")
+                sys.exit(1)
+            for name, version in imported:
+                print(f"\n✅ {LEGACY_FILES[name][0]} -> {name} v{version}")
+        else:
+            if args.name:
+                names = [args.name]
+            elif os.path.isdir(args.registry_dir):
+                names = sorted(entry for entry in os.listdir(args.registry_dir) if not entry.startswith('.'))
+            else:
+                names = []
+            print(f"\n{'Model':<8} {'Version':<9} {'Created':<21} {'Backend':<15} {'Metric':<22} {'Parent':<6}")
+            print("-" * 70)
+            for name in names:
+                for version in versions(name, args.registry_dir):
+                    meta = read_meta(name, version, args.registry_dir)
+                    metric = HEADLINE_METRICS.get(name)
+                    value = meta['metrics'].get(metric)
+                    shown = f"{metric} {value:.4g}" if value is not None else '-'
+                    parent = f"v{meta['parent']}" if meta['parent'] else '-'
+                    print(f"{name:<8} {'v' + str(version):<9} {meta['created_at']:<21} "
+                          f"{meta['backend'] or '-':<15} {shown:<22} {parent:<6}")
+    except LookupError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+
+    print("\n" + "=" * 70 + "\n")
@@ -0,0 +1,40 @@
+"""
+RUKindaHomeless - Value Scoring
+Compares each listing's rent with the average rent for its bedroom count and turns the
+result into a value category (Great Deal / Fair Price / Overpriced) and a 2.0-9.0 value score.
+
+The thresholds live in models/thresholds.py: value_classifier.py labels its training data
+with score_listings(), database/queries.py builds its SQL CASE from value_score_sql(), and
+the web app generator embeds the categories computed here.
+"""
+
+import numpy as np
+import pandas as pd
+
+from models.thresholds import (DEFAULT_VALUE_SCORE, GREAT_DEAL_RATIO, OVERPRICED_RATIO,
+                               VALUE_SCORE_BANDS, value_score_sql)
+
+CATEGORIES = ['Great Deal', 'Fair Price', 'Overpriced']
+
+
+def score_listings(df, rent='rent', bedrooms='BR'):
+    """
+    Score every row of df at once. Returns a frame aligned with df.index holding
+    avg_rent_for_br, value_category (categorical) and value_score.
+    """
+    rent_values = df[rent].astype(np.float64)
+    avg = rent_values.groupby(df[bedrooms]).transform('mean')
+
+    r = rent_values.to_numpy()
+    a = avg.to_numpy()
+
+    codes = np.select([r <= a * GREAT_DEAL_RATIO, r >= a * OVERPRICED_RATIO], [0, 2], 1)
+    score = np.select([r <= a * bound for bound, _ in VALUE_SCORE_BANDS],
+                      [value for _, value in VALUE_SCORE_BANDS], DEFAULT_VALUE_SCORE)
+
+    return pd.DataFrame({
+        'avg_rent_for_br': a,
+        'value_category': pd.Categorical.from_codes(codes, CATEGORIES),
+        'value_score': score,
+    }, index=df.index)
+
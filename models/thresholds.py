@@ -0,0 +1,20 @@
+"""
+RUKindaHomeless - Value Score Thresholds
+The value category ratios and score bands behind models/scoring.py, with no NumPy or pandas
+import, so database scripts and the web app can share them without the data stack.
+"""
+
+# Great Deal: 15% or more below average; Overpriced: 15% or more above
+GREAT_DEAL_RATIO = 0.85
+OVERPRICED_RATIO = 1.15
+
+# (rent at most this fraction of the bedroom average, score); first match wins
+VALUE_SCORE_BANDS = [(0.85, 9.0), (0.95, 7.5), (1.05, 6.0), (1.15, 4.0)]
+DEFAULT_VALUE_SCORE = 2.0
+
+
+def value_score_sql(rent_expr, avg_expr):
+    """The value score bands as a SQL CASE expression over the given column expressions."""
+    whens = ' '.join(f"WHEN {rent_expr} <= {avg_expr} * {bound} THEN {value}"
+                     for bound, value in VALUE_SCORE_BANDS)
+    return f"CASE {whens} ELSE {DEFAULT_VALUE_SCORE} END"
@@ -0,0 +1,192 @@
+"""
+RUKindaHomeless - Rent Model Training Pipeline
+Shared pieces of predict_rent.py: a cache of fitted models keyed by a fingerprint of the
+training data and parameters (so an unchanged run loads the model instead of refitting), and
+a k-fold cross-validated grid search that spreads (config, fold) fits over a process pool.
+Both work with any backend in models/backends.py.
+
+The search writes the feature matrix and target once as .npy files; every worker opens them
+with np.load(mmap_mode='r'), so the data is shared through the page cache instead of being
+pickled into each task. Each fit still copies its own fold's rows, as sklearn needs them
+contiguous.
+
+Usage:
+    from models.training import ModelCache, fingerprint, grid_search
+    key = fingerprint(X_train, y_train, 'random_forest', params)
+    cached = cache.load(key)          # (model, fit_seconds) or None
+    results = grid_search(X, y, 'random_forest', {'max_depth': [6, 10, None]}, folds=5, workers=4)
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import KFold
+
+from models.backends import BACKENDS, n_nodes
+from models.registry import file_sha256
+
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(MODELS_DIR, '.cache', 'rent')
+
+# Rows per call when timing predictions, about the size of a web app page of listings
+LATENCY_BATCH = 100
+
+# Loaded once per worker process by open_arrays()
+_arrays = {}
+
+
+def fingerprint(X, y, backend, params):
+    """
+    SHA-256 over the training arrays, the backend and its parameters and the sklearn version:
+    equal fingerprints mean a refit would produce the same model.
+    """
+    digest = hashlib.sha256()
+    for array in (np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.float64)):
+        digest.update(str(array.shape).encode())
+        digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update(json.dumps({'backend': backend, **params}, sort_keys=True).encode())
+    digest.update(sklearn.__version__.encode())
+    return digest.hexdigest()
+
+
+def fit(X, y, backend, params, n_jobs=-1):
+    """A backend regressor with params fitted on X, y. Returns (model, fit_seconds)."""
+    model = BACKENDS[backend].make('regressor', params, n_jobs=n_jobs)
+    start_time = time.perf_counter()
+    model.fit(X, y)
+    return model, time.perf_counter() - start_time
+
+
+class ModelCache:
+    """
+    Fitted models under their fingerprint in models/.cache/rent/: <key>.joblib written the same
+    way models/registry.py publishes a model, and <key>.json with its fit time and checksum.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def path(self, key, extension='joblib'):
+        return os.path.join(self.cache_dir, f'{key}.{extension}')
+
+    def checksum(self, key):
+        """SHA-256 of the cached model file for key (what publish() records as model_sha256), or None."""
+        try:
+            with open(self.path(key, 'json')) as f:
+                return json.load(f)['model_sha256']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def load(self, key):
+        """(model, fit_seconds) cached for key, or None if missing or failing its checksum."""
+        try:
+            with open(self.path(key, 'json')) as f:
+                info = json.load(f)
+            if file_sha256(self.path(key)) != info['model_sha256']:
+                return None
+            return joblib.load(self.path(key)), info['fit_seconds']
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+
+    def store(self, key, model, fit_seconds):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.path(key) + '.tmp'
+        joblib.dump(model, tmp_path)
+        info = {'fit_seconds': fit_seconds, 'model_sha256': file_sha256(tmp_path)}
+        os.replace(tmp_path, self.path(key))
+        # The sidecar goes last: a model without one is never loaded
+        with open(self.path(key, 'json') + '.tmp', 'w') as f:
+            json.dump(info, f)
+        os.replace(self.path(key, 'json') + '.tmp', self.path(key, 'json'))
+
+
+def expand_grid(grid, base):
+    """Every combination of the grid's values, each on top of the base parameters."""
+    names = sorted(grid)
+    return [{**base, **dict(zip(names, values))} for values in itertools.product(*(grid[n] for n in names))]
+
+
+def open_arrays(data_dir):
+    """Pool initializer: memory-map the shared feature matrix and target."""
+    _arrays['X'] = np.load(os.path.join(data_dir, 'X.npy'), mmap_mode='r')
+    _arrays['y'] = np.load(os.path.join(data_dir, 'y.npy'), mmap_mode='r')
+
+
+def fit_fold(config_index, backend, params, train_rows, test_rows):
+    """Fit one config on one fold; returns its MAE and timings."""
+    X, y = _arrays['X'], _arrays['y']
+    X_train, y_train = X[train_rows], y[train_rows]
+    X_test, y_test = X[test_rows], y[test_rows]
+
+    # Parallelism comes from the process pool; keep each forest fit single-threaded
+    model, fit_seconds = fit(X_train, y_train, backend, params, n_jobs=1)
+
+    start_time = time.perf_counter()
+    predictions = np.concatenate([model.predict(X_test[i:i + LATENCY_BATCH])
+                                  for i in range(0, len(X_test), LATENCY_BATCH)])
+    predict_seconds = time.perf_counter() - start_time
+
+    return {
+        'config': config_index,
+        'mae': float(mean_absolute_error(y_test, predictions)),
+        'fit_seconds': fit_seconds,
+        'latency_us': predict_seconds / len(X_test) * 1e6,
+        'nodes': n_nodes(model),
+    }
+
+
+def grid_search(X, y, backend, grid, folds=5, workers=None, random_state=42):
+    """
+    k-fold cross-validation of every grid config (on top of the backend's default regressor
+    parameters), (config, fold) pairs spread over workers processes. Returns (results,
+    wall_seconds); results hold one dict per config with its params, mean/std MAE, mean fit
+    time, per-row prediction latency and total tree nodes, sorted by MAE.
+    """
+    configs = expand_grid(grid, BACKENDS[backend].params('regressor'))
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=random_state).split(X))
+
+    data_dir = tempfile.mkdtemp(prefix='rukh_search_')
+    try:
+        np.save(os.path.join(data_dir, 'X.npy'), np.ascontiguousarray(X, dtype=np.float32))
+        np.save(os.path.join(data_dir, 'y.npy'), np.ascontiguousarray(y, dtype=np.float64))
+
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=open_arrays, initargs=(data_dir,)) as pool:
+            futures = [pool.submit(fit_fold, index, backend, params, train_rows, test_rows)
+                       for index, params in enumerate(configs)
+                       for train_rows, test_rows in splits]
+            fold_results = [future.result() for future in futures]
+        wall_seconds = time.perf_counter() - start_time
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    results = []
+    for index, params in enumerate(configs):
+        runs = [r for r in fold_results if r['config'] == index]
+        maes = np.array([r['mae'] for r in runs])
+        results.append({
+            'params': params,
+            'mae': float(maes.mean()),
+            'mae_std': float(maes.std()),
+            'fit_seconds': float(np.mean([r['fit_seconds'] for r in runs])),
+            'latency_us': float(np.mean([r['latency_us'] for r in runs])),
+            'nodes': int(np.mean([r['nodes'] for r in runs])),
+        })
+    results.sort(key=lambda r: r['mae'])
+
+    # Pareto front: no other config is both more accurate and faster to predict
+    best_latency = np.inf
+    for result in results:
+        result['pareto'] = result['latency_us'] < best_latency
+        best_latency = min(best_latency, result['latency_us'])
+    return results, wall_seconds
@@ -0,0 +1,174 @@
+"""
+RUKindaHomeless - Incremental Rent Model Updates
+Folds a new scrape batch into the latest registered rent model without reloading the full
+listings CSV or refitting from scratch, and publishes the result as a new registry version
+(models/registry.py) whose parent is the version it started from:
+
+    random_forest   grows --trees new trees fitted on the batch (warm_start); once the forest
+                    passes --max-trees the oldest trees are dropped, so it follows the market
+    hist_gb         runs --trees more boosting iterations on the batch (warm_start)
+
+Before anything is fitted, the current model is scored on the batch and that error is compared
+with the test_mae stored in the model's metrics by the last full fit. If it has drifted past
+--drift-threshold times that, patching the model with a few trees won't fix it: the update is
+refused and predict_rent.py should be rerun on the full data (--force updates anyway).
+
+    python update_rent_model.py new_scrape.csv
+    python update_rent_model.py new_scrape.csv --trees 30 --drift-threshold 1.5
+
+Exit status is 2 when drift was detected and the model left unchanged.
+"""
+
+import argparse
+import datetime
+import math
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data.listings import load_listings
+from models.backends import model_bytes
+from models.registry import REGISTRY_DIR, describe_data, open_model, publish, read_meta, version_dir
+
+DEFAULT_TREES = 20
+DEFAULT_MAX_TREES = 300
+DEFAULT_DRIFT_THRESHOLD = 1.25
+
+# Below this many rows a batch's MAE says more about the sample than about the model
+MIN_BATCH_ROWS = 20
+
+
+def batch_mae(model, X, y):
+    return float(mean_absolute_error(y, model.predict(X)))
+
+
+def add_trees(model, X, y, trees, max_trees):
+    """
+    Fit trees more trees (or boosting iterations) on X, y in place. Returns the number of old
+    trees dropped to stay within max_trees (forests only).
+    """
+    if hasattr(model, 'estimators_'):
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + trees)
+        model.fit(X, y)
+        dropped = max(0, len(model.estimators_) - max_trees)
+        if dropped:
+            # sklearn appends new trees, so the oldest are at the front
+            model.estimators_ = model.estimators_[dropped:]
+            model.set_params(n_estimators=len(model.estimators_))
+        return dropped
+
+    # Boosting: early stopping would compare against a validation split of the batch alone
+    # and could end the update before it starts
+    model.set_params(warm_start=True, early_stopping=False, max_iter=model.n_iter_ + trees)
+    model.fit(X, y)
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Add trees trained on a new scrape batch to the saved rent model")
+    parser.add_argument('batch', help="CSV (or Parquet) of newly scraped listings")
+    parser.add_argument('--registry-dir', default=REGISTRY_DIR, help="model registry holding the rent model")
+    parser.add_argument('--version', type=int, help="version to update (default: latest)")
+    parser.add_argument('--trees', type=int, default=DEFAULT_TREES,
+                        help="trees (random_forest) or boosting iterations (hist_gb) to add")
+    parser.add_argument('--max-trees', type=int, default=DEFAULT_MAX_TREES,
+                        help="drop the oldest trees beyond this many (random_forest)")
+    parser.add_argument('--drift-threshold', type=float, default=DEFAULT_DRIFT_THRESHOLD,
+                        help="refuse to update when batch MAE exceeds this multiple of the stored test MAE")
+    parser.add_argument('--force', action='store_true', help="update even if drift was detected")
+    parser.add_argument('--keep-duplicates', action='store_true',
+                        help="use every row instead of one row per near-duplicate cluster (data/dedup.py)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("INCREMENTAL RENT MODEL UPDATE")
+    print("=" * 70)
+
+    try:
+        meta = read_meta('rent', args.version, args.registry_dir)
+        path = version_dir('rent', meta['version'], args.registry_dir)
+    except LookupError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    # Read fully into memory: warm_start changes the model, and the published version must not
+    model = open_model(path, mmap=False)
+    metrics = meta['metrics']
+    features = meta['features']
+    print(f"\n📦 Updating rent v{meta['version']} ({meta['backend']}, trained on {meta['data']['rows'] or '?'} rows)")
+
+    print(f"\n📂 Loading batch {args.batch}...")
+    df = load_listings(args.batch, dedupe=not args.keep_duplicates)
+    X = df[features].copy()
+    y = df['rent'].astype(np.float64)
+    X = X.fillna(X.mean())
+    print(f"✅ Loaded {len(df):,} listings{'' if args.keep_duplicates else ' (near-duplicates removed)'}")
+
+    if len(df) < MIN_BATCH_ROWS:
+        print(f"\n❌ Batch has fewer than {MIN_BATCH_ROWS} listings; too small to judge or train on")
+        sys.exit(1)
+
+    # Drift check: how well does the model as trained predict listings it has never seen?
+    reference_mae = metrics['test_mae']
+    before_mae = batch_mae(model, X, y)
+    # A model that fit its test split exactly has drifted as soon as it makes any error
+    if reference_mae > 0:
+        ratio = before_mae / reference_mae
+    else:
+        ratio = math.inf if before_mae > 0 else 1.0
+    print("\n🔎 Drift check:")
+    print(f"   Stored test MAE (last full fit): ${reference_mae:.2f}")
+    print(f"   MAE on new batch:                ${before_mae:.2f} ({ratio:.2f}x)")
+
+    if ratio > args.drift_threshold and not args.force:
+        print(f"\n🚨 Error has drifted past {args.drift_threshold:.2f}x the last full fit; model left unchanged.")
+        print("   Rerun predict_rent.py on the full data (or pass --force to update anyway).")
+        print("\n" + "=" * 70 + "\n")
+        sys.exit(2)
+    print(f"   {'⚠️  Drifted, updating anyway (--force)' if ratio > args.drift_threshold else '✅ Within threshold'}")
+
+    # Hold part of the batch back to see what the new trees bought
+    X_fit, X_check, y_fit, y_check = train_test_split(X, y, test_size=0.2, random_state=42)
+    check_before = batch_mae(model, X_check, y_check)
+
+    kind = 'trees' if hasattr(model, 'estimators_') else 'boosting iterations'
+    print(f"\n🌲 Adding {args.trees} {kind} fitted on {len(X_fit):,} listings...")
+    start_time = time.perf_counter()
+    dropped = add_trees(model, X_fit, y_fit, args.trees, args.max_trees)
+    fit_seconds = time.perf_counter() - start_time
+    check_after = batch_mae(model, X_check, y_check)
+    size = len(model.estimators_) if hasattr(model, 'estimators_') else model.n_iter_
+
+    print(f"✅ Updated in {fit_seconds:.2f}s; model now has {size} {kind}"
+          f"{f' ({dropped} oldest dropped)' if dropped else ''}")
+    print(f"   Held-out batch MAE: ${check_before:.2f} -> ${check_after:.2f}")
+
+    # test_mae stays the last full fit's, so drift is always measured against a real baseline
+    metrics['n_estimators'] = size
+    metrics['model_bytes'] = model_bytes(model)
+    metrics.setdefault('updates', []).append({
+        'from_version': meta['version'],
+        'updated_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'batch': describe_data(args.batch, len(df), deduplicated=not args.keep_duplicates),
+        'batch_mae': before_mae,
+        'drift_ratio': ratio if math.isfinite(ratio) else None,
+        'forced': ratio > args.drift_threshold,
+        'added': args.trees,
+        'dropped': dropped,
+        'fit_seconds': fit_seconds,
+        'holdout_mae_before': check_before,
+        'holdout_mae_after': check_after,
+    })
+
+    print("\n💾 Publishing updated model...")
+    # The update changed n_estimators (and warm_start), so record what the model has now
+    params = {key: value for key, value in model.get_params().items() if key != 'n_jobs'}
+    version = publish('rent', model, features, meta['data'], metrics, params=params,
+                      backend=meta['backend'], parent=meta['version'], registry_dir=args.registry_dir)
+    print(f"✅ Published as rent v{version} (update #{len(metrics['updates'])} since the last full fit)")
+
+    print("\n" + "=" * 70 + "\n")
@@ -1,54 +1,52 @@
 """
 RUKindaHomeless - Value Classifier Model
-Classifies apartments as: Great Deal, Fair Price, or Overpriced
+Classifies apartments as: Great Deal, Fair Price, or Overpriced, with a random forest
+(default) or histogram gradient boosting (--backend hist_gb, see models/backends.py)
 """
 
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
-import pickle
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data.listings import load_listings, DEFAULT_CSV
+from models.backends import BACKENDS, feature_importances, model_bytes, predict_throughput
+from models.registry import REGISTRY_DIR, describe_data, publish
+from models.scoring import score_listings
+
+parser = argparse.ArgumentParser(description="Train the value classifier model")
+parser.add_argument('--csv', default=DEFAULT_CSV, help="path to the listings CSV")
+parser.add_argument('--keep-duplicates', action='store_true',
+                    help="train on every row instead of one row per near-duplicate cluster (data/dedup.py)")
+parser.add_argument('--backend', choices=sorted(BACKENDS), default='random_forest',
+                    help="model family (default: random_forest)")
+parser.add_argument('--registry-dir', default=REGISTRY_DIR, help="model registry to publish to")
+args = parser.parse_args()
+backend = BACKENDS[args.backend]
 
 print("=" * 70)
-print("VALUE CLASSIFIER MODEL")
+print(f"VALUE CLASSIFIER MODEL ({backend.label})")
 print("=" * 70)
 
 # Load data
 print("\n📂 Loading data...")
-df = pd.read_csv('../data/listings.csv')
+df = load_listings(args.csv, dedupe=not args.keep_duplicates)
 
-# Clean rent column
-df['rent'] = df['rent'].astype(str).str.replace(',', '').astype(float)
-
-print(f"✅ Loaded {len(df)} listings")
+print(f"✅ Loaded {len(df)} listings{'' if args.keep_duplicates else ' (near-duplicates removed)'}")
 
 # Calculate price per square foot
 df['price_per_sqft'] = df['rent'] / df['sqft']
 
-# Calculate average rent for each bedroom count
-avg_rent_by_br = df.groupby('BR')['rent'].mean().to_dict()
-df['avg_rent_for_br'] = df['BR'].map(avg_rent_by_br)
-
-# Create value categories based on comparison to average
+# Compare each rent with the average for its bedroom count (thresholds in models/scoring.py)
 print("\n🏷️  Creating value categories...")
-
-def classify_value(row):
-    """
-    Great Deal: 15% or more below average for that bedroom count
-    Fair Price: Within 15% of average
-    Overpriced: 15% or more above average
-    """
-    ratio = row['rent'] / row['avg_rent_for_br']
-    
-    if ratio <= 0.85:
-        return 'Great Deal'
-    elif ratio >= 1.15:
-        return 'Overpriced'
-    else:
-        return 'Fair Price'
-
-df['value_category'] = df.apply(classify_value, axis=1)
+scores = score_listings(df)
+df['avg_rent_for_br'] = scores['avg_rent_for_br']
+df['value_category'] = scores['value_category'].astype(str)
 
 # Show distribution
 print("\n📊 Value Category Distribution:")
@@ -78,17 +76,14 @@ print(f"   Training set: {X_train.shape[0]} samples")
 print(f"   Test set: {X_test.shape[0]} samples")
 
 # Train classifier
-print("\n🌲 Training Random Forest Classifier...")
-classifier = RandomForestClassifier(
-    n_estimators=100,
-    max_depth=10,
-    min_samples_split=3,
-    random_state=42,
-    n_jobs=-1
-)
+print(f"\n🌲 Training {backend.label} Classifier...")
+params = backend.params('classifier')
+classifier = backend.make('classifier', params)
 
+start_time = time.perf_counter()
 classifier.fit(X_train, y_train)
-print("✅ Classifier trained successfully!")
+fit_seconds = time.perf_counter() - start_time
+print(f"✅ Classifier trained successfully in {fit_seconds:.2f}s!")
 
 # Make predictions
 print("\n🔮 Making predictions...")
@@ -119,11 +114,20 @@ labels = ['Great Deal', 'Fair Price', 'Overpriced']
 for i, label in enumerate(labels):
     print(f"{'Actual ' + label:>15} {cm[i][0]:<18} {cm[i][1]:<18} {cm[i][2]:<18}")
 
+# Cost of the model, for choosing a backend per deployment
+predict_rows_per_second = predict_throughput(classifier, X_test)
+size_bytes = model_bytes(classifier)
+
+print("\n⚡ Training and Inference Cost:")
+print(f"   Fit time: {fit_seconds:.2f}s")
+print(f"   Predict throughput: {predict_rows_per_second:,.0f} rows/sec")
+print(f"   Model size: {size_bytes / 1024:,.1f} KB pickled")
+
 # Feature importance
 print("\n🎯 Feature Importance:")
 feature_importance = pd.DataFrame({
     'feature': X.columns,
-    'importance': classifier.feature_importances_
+    'importance': feature_importances(classifier, X_test, y_test)
 }).sort_values('importance', ascending=False)
 
 for idx, row in feature_importance.iterrows():
@@ -149,23 +153,27 @@ for ex in examples:
     pred = classifier.predict([[ex['BR'], ex['Ba'], ex['sqft'], price_per_sqft]])[0]
     print(f"{ex['BR']:<4} {ex['Ba']:<4} {ex['sqft']:<8} ${ex['rent']:<9} ${price_per_sqft:<9.2f} {pred:<15}")
 
-# Save classifier
-print("\n💾 Saving classifier...")
-with open('value_classifier.pkl', 'wb') as f:
-    pickle.dump(classifier, f)
-print("✅ Classifier saved as 'value_classifier.pkl'")
-
-# Save category mapping
+# Metrics stored with the classifier
 category_info = {
     'categories': ['Great Deal', 'Fair Price', 'Overpriced'],
     'distribution': value_counts.to_dict(),
+    'model_type': f'{backend.label} Classifier',
+    'backend': args.backend,
+    'params': params,
     'train_accuracy': train_accuracy,
     'test_accuracy': test_accuracy,
+    'fit_seconds': fit_seconds,
+    'predict_rows_per_second': predict_rows_per_second,
+    'model_bytes': size_bytes,
     'feature_importance': feature_importance.to_dict('records')
 }
 
-with open('classifier_info.pkl', 'wb') as f:
-    pickle.dump(category_info, f)
+# Publish a new registry version (models/registry.py); serving code loads the latest
+print("\n💾 Publishing classifier...")
+data = describe_data(args.csv, len(df), deduplicated=not args.keep_duplicates)
+version = publish('value', classifier, X.columns, data, category_info, params=params, backend=args.backend,
+                  registry_dir=args.registry_dir)
+print(f"✅ Classifier published as value v{version} in '{args.registry_dir}'")
 
 print("\n" + "=" * 70)
 print("✅ CLASSIFIER TRAINING COMPLETE!")
@@ -0,0 +1,11 @@
+"""
+Shared pytest setup: the project modules import each other as data.*, models.* and (for the
+database scripts) bare db/queries, the same way the scripts put them on sys.path.
+"""
+
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'database'))
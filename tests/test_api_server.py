@@ -0,0 +1,132 @@
+"""webapp/api_server.py: keyset pagination, request validation and the static file guard."""
+
+import asyncio
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+from webapp.api_server import (ApiServer, BadRequest, ResponseCache, decode_cursor, encode_cursor,
+                               listings_query)
+
+
+class MemoryBackend:
+    """The SQLite stand-in's two tables in memory, filled with hand-picked rows."""
+
+    placeholder = '?'
+
+    def __init__(self, listings):
+        self.conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE listings (listing_id INTEGER PRIMARY KEY, address TEXT, monthly_rent REAL,
+                                   bedrooms INTEGER, bathrooms REAL, square_feet INTEGER, source TEXT,
+                                   listing_url TEXT);
+            CREATE TABLE listing_stats (listing_id INTEGER PRIMARY KEY, price_per_sqft REAL,
+                                        avg_rent_for_bedrooms REAL, value_score REAL);
+        """)
+        for listing_id, rent, bedrooms, source, value_score in listings:
+            self.conn.execute("INSERT INTO listings VALUES (?, ?, ?, ?, 1, 800, ?, NULL)",
+                              (listing_id, f'{listing_id} Main St', rent, bedrooms, source))
+            self.conn.execute("INSERT INTO listing_stats VALUES (?, ?, 2000, ?)",
+                              (listing_id, rent / 800, value_score))
+        self.queries = 0
+
+    def query(self, sql, params):
+        self.queries += 1
+        return self.conn.execute(sql, params).fetchall()
+
+
+# Duplicate rents so pages have to break ties on listing_id; listing 9 has no value score
+LISTINGS = [(1, 1500, 1, 'Redfin', 7.5), (2, 2000, 2, 'Zillow', 6.0), (3, 1500, 1, 'Zillow', 9.0),
+            (4, 2400, 2, 'Redfin', 4.0), (5, 1800, 1, 'Redfin', 6.0), (6, 2000, 2, 'Redfin', 6.0),
+            (7, 1500, 2, 'Zillow', 9.0), (8, 3100, 3, 'Zillow', 2.0), (9, 2600, 3, 'Redfin', None)]
+
+
+def all_pages(backend, **params):
+    params = {name: [str(value)] for name, value in params.items()}
+    first = listings_query(backend, params)
+    pages, response = [first], first
+    while response['next']:
+        response = listings_query(backend, {**params, 'after': [response['next']]})
+        assert 'total' not in response
+        pages.append(response)
+    return first['total'], [[listing['id'] for listing in page['listings']] for page in pages]
+
+
+@pytest.mark.parametrize('sort, expected', [
+    ('rent', [1, 3, 7, 5, 2, 6, 4, 9, 8]),
+    ('-rent', [8, 9, 4, 6, 2, 5, 7, 3, 1]),
+    ('value', [7, 3, 1, 6, 5, 2, 4, 8]),
+])
+def test_pages_cover_every_row_once_in_order(sort, expected):
+    total, pages = all_pages(MemoryBackend(LISTINGS), sort=sort, limit=2)
+    assert total == len(expected)
+    assert [len(page) for page in pages] == [2] * (len(expected) // 2) + [1] * (len(expected) % 2)
+    assert [listing_id for page in pages for listing_id in page] == expected
+
+
+def test_filters_apply_to_pages_and_total():
+    total, pages = all_pages(MemoryBackend(LISTINGS), bedrooms=2, source='Redfin', min_rent=2000, limit=1)
+    assert total == 2
+    assert pages == [[6], [4]]
+
+
+def test_listing_fields_and_value_category():
+    listing = listings_query(MemoryBackend(LISTINGS), {'limit': ['1']})['listings'][0]
+    assert listing['id'] == 1 and listing['rent'] == 1500 and listing['source'] == 'Redfin'
+    assert listing['valueCategory'] == 'great-deal'
+
+
+@pytest.mark.parametrize('params, message', [
+    ({'limit': ['0']}, "'limit' must be at least 1"),
+    ({'limit': ['ten']}, "'limit' must be a number"),
+    ({'sort': ['address']}, "'sort' must be one of"),
+    ({'after': ['not-a-cursor']}, "invalid 'after' cursor"),
+])
+def test_bad_parameters_raise_bad_request(params, message):
+    with pytest.raises(BadRequest, match=message):
+        listings_query(MemoryBackend(LISTINGS), params)
+
+
+def test_limit_is_capped():
+    backend = MemoryBackend([(i, 1000 + i, 1, 'Redfin', 5.0) for i in range(1, 601)])
+    assert len(listings_query(backend, {'limit': ['10000']})['listings']) == 500
+
+
+def test_cursor_round_trips_decimals_and_floats():
+    assert decode_cursor(encode_cursor(Decimal('1992.50'), 7)) == (Decimal('1992.50'), 7)
+    assert decode_cursor(encode_cursor(1992.5, 7)) == (1992.5, 7)
+
+
+@pytest.fixture
+def server(tmp_path):
+    static_dir = tmp_path / 'webapp'
+    static_dir.mkdir()
+    (static_dir / 'index.html').write_text('<html></html>')
+    (tmp_path / 'secret.txt').write_text('secret')
+    (tmp_path / 'webapp-private').mkdir()
+    (tmp_path / 'webapp-private' / 'key.txt').write_text('secret')
+    return ApiServer(MemoryBackend(LISTINGS), ResponseCache(30), None, str(static_dir))
+
+
+@pytest.mark.parametrize('target', ['/../secret.txt', '/%2e%2e/secret.txt', '/..%2fsecret.txt',
+                                    '/../webapp-private/key.txt', '/missing.html'])
+def test_static_files_never_leave_the_web_app(server, target):
+    status, _, body = asyncio.run(server.route('GET', target))
+    assert status == 404 and body == b'not found'
+
+
+def test_static_index_and_api_routes(server):
+    assert asyncio.run(server.route('GET', '/'))[:2] == (200, 'text/html')
+    assert asyncio.run(server.route('GET', '/index.html'))[0] == 200
+    assert asyncio.run(server.route('POST', '/index.html'))[0] == 405
+    assert asyncio.run(server.route('GET', '/api/nope'))[0] == 404
+    assert asyncio.run(server.route('GET', '/api/listings?limit=0'))[0] == 400
+
+
+def test_api_responses_are_cached(server):
+    first = asyncio.run(server.route('GET', '/api/listings?limit=2&sort=rent'))
+    queries = server.backend.queries
+    # Same parameters in another order hit the cache
+    assert asyncio.run(server.route('GET', '/api/listings?sort=rent&limit=2')) == first
+    assert server.backend.queries == queries
@@ -0,0 +1,72 @@
+"""data/dedup.py: address normalization and near-duplicate clustering."""
+
+import pandas as pd
+import pytest
+
+from data.dedup import dedupe_listings, find_duplicates, normalize_address
+
+
+@pytest.mark.parametrize('address', [
+    '110 Somerset Street, New Brunswick, NJ 08901',
+    '110 SOMERSET ST., New Brunswick NJ 08901-1234',
+    '110 Somerset St, New Brunswick, New Brunswick, NJ 08901',
+])
+def test_normalize_address_spelling_variants(address):
+    assert normalize_address(address) == ('110 somerset st new brunswick', '', '08901')
+
+
+def test_normalize_address_units():
+    assert normalize_address('110 Somerset St Apt 4B, New Brunswick, NJ 08901')[1] == '4b'
+    assert normalize_address('110 Somerset St #4B, New Brunswick, NJ 08901')[1] == '4b'
+
+
+def listings(rows):
+    return pd.DataFrame(rows, columns=['address', 'rent', 'BR', 'Ba', 'sqft', 'url'])
+
+
+def test_reposted_unit_collapses_onto_its_last_copy():
+    df = listings([
+        ['110 Somerset Street, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, 'http://a/1'],
+        ['12 Easton Ave, New Brunswick, NJ 08901', 1500, 1, 1.0, 600, 'http://a/2'],
+        ['110 Somerset St, New Brunswick NJ 08901', 1993, 2, 1.0, 939, 'http://b/7'],
+    ])
+    assert find_duplicates(df).tolist() == [2, 1, 2]
+    assert dedupe_listings(df).index.tolist() == [1, 2]
+
+
+def test_street_typo_is_caught_by_minhash():
+    df = listings([
+        ['110 Somerset Street, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, None],
+        ['110 Somersett Street, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, None],
+    ])
+    assert find_duplicates(df).tolist() == [1, 1]
+
+
+def test_same_url_tolerates_a_miscounted_bedroom():
+    df = listings([
+        ['110 Somerset St, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, 'http://a/1'],
+        ['110 Somerset St, New Brunswick, NJ 08901', 1992, 3, 1.0, 929, 'http://a/1'],
+    ])
+    assert find_duplicates(df).tolist() == [1, 1]
+
+
+BASE = ['110 Somerset St, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, None]
+
+
+@pytest.mark.parametrize('first, second', [
+    (BASE, ['21 Somerset St, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, None]),   # other building
+    (['110 Somerset St Apt 1, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, None],
+     ['110 Somerset St Apt 2, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, None]),  # other unit
+    (BASE, ['110 Somerset St, New Brunswick, NJ 08901', 2100, 2, 1.0, 929, None]),  # rent too far off
+    (BASE, ['110 Somerset St, New Brunswick, NJ 08901', 1992, 3, 1.0, 929, None]),  # other layout
+])
+def test_distinct_units_stay_apart(first, second):
+    assert find_duplicates(listings([first, second])).tolist() == [0, 1]
+
+
+def test_index_labels_are_preserved():
+    df = listings([
+        ['110 Somerset St, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, None],
+        ['110 Somerset St, New Brunswick, NJ 08901', 1992, 2, 1.0, 929, None],
+    ]).set_axis([40, 41])
+    assert find_duplicates(df).tolist() == [41, 41]
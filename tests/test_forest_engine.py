@@ -0,0 +1,60 @@
+"""models/forest_engine.py: a compiled forest predicts exactly what the sklearn forest does."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from models.forest_engine import CompiledForest, export_forest
+
+FEATURES = ['BR', 'Ba', 'sqft']
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    br = rng.integers(0, 5, 400)
+    X = pd.DataFrame({'BR': br, 'Ba': rng.choice([1.0, 1.5, 2.0], 400),
+                      'sqft': 400 + 250 * br + rng.integers(0, 200, 400)})
+    y = 900 + 400 * br + X['sqft'] * 0.8 + rng.normal(0, 100, 400)
+    return X, y
+
+
+def compile_model(model, tmp_path):
+    export_forest(model, str(tmp_path / 'forest'))
+    return CompiledForest.load(str(tmp_path / 'forest'))
+
+
+def test_regressor_parity(data, tmp_path):
+    X, y = data
+    model = RandomForestRegressor(n_estimators=15, max_depth=8, random_state=0).fit(X, y)
+    forest = compile_model(model, tmp_path)
+    np.testing.assert_allclose(forest.predict(X), model.predict(X), rtol=1e-9)
+    # Column order comes from the exported feature names, not the frame
+    np.testing.assert_allclose(forest.predict(X[FEATURES[::-1]]), model.predict(X), rtol=1e-9)
+
+
+def test_classifier_parity(data, tmp_path):
+    X, y = data
+    labels = np.where(y > y.median(), 'high', 'low')
+    model = RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(X, labels)
+    forest = compile_model(model, tmp_path)
+    assert (forest.predict(X) == model.predict(X)).all()
+    np.testing.assert_allclose(forest.predict_proba(X), model.predict_proba(X), atol=1e-12)
+
+
+def test_batches_and_single_rows(data, tmp_path):
+    X, y = data
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X.to_numpy(), y)
+    forest = compile_model(model, tmp_path)
+    rows = X.to_numpy()
+    np.testing.assert_allclose(forest.predict(rows, batch_size=7), model.predict(rows), rtol=1e-9)
+    assert forest.predict(rows[0]).shape == (1,)
+    assert forest.predict(rows[:0]).shape == (0,)
+
+
+def test_regressor_has_no_predict_proba(data, tmp_path):
+    X, y = data
+    forest = compile_model(RandomForestRegressor(n_estimators=2, random_state=0).fit(X, y), tmp_path)
+    with pytest.raises(ValueError):
+        forest.predict_proba(X)
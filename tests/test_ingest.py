@@ -0,0 +1,72 @@
+"""data/ingest.py: chunk validation, row numbering across chunks and the quarantine file."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from data.ingest import Quarantine, check_columns, read_batches, rejects_path, validate_chunk
+
+
+def raw_chunk(rows):
+    return pd.DataFrame(rows, columns=['address', 'rent', 'BR', 'Ba', 'sqft', 'url', 'source']).astype(
+        {'address': object, 'rent': object, 'url': object, 'source': object})
+
+
+def test_validate_chunk_coerces_clean_rows():
+    clean, rejects = validate_chunk(raw_chunk([
+        ['1 Main St', '1,992', 2, 1.0, 900, 'http://a', ' Redfin '],
+        ['2 Main St', '1500', 1, 1.5, 650, None, None],
+    ]))
+    assert len(rejects) == 0
+    assert clean['rent'].tolist() == [1992.0, 1500.0]
+    assert clean['BR'].dtype == 'int32' and clean['sqft'].dtype == 'int32'
+    assert clean['source'].tolist() == ['Redfin', 'unknown']
+
+
+def test_validate_chunk_rejects_with_every_reason_and_input_row_number():
+    clean, rejects = validate_chunk(raw_chunk([
+        ['1 Main St', '1500', 1, 1.0, 650, None, None],
+        ['', 'abc', 2.5, 1.0, 0, None, None],
+        ['3 Main St', '250000', 2, 1.0, 900, None, None],
+    ]), first_row=10)
+    assert clean.index.tolist() == [10]
+    assert rejects['row'].tolist() == [11, 12]
+    reasons = rejects.set_index('row')['reason']
+    assert reasons[11].split('; ') == ['address: missing', 'rent: not a number', 'BR: not a whole number',
+                                       'sqft: outside 1-100000']
+    assert reasons[12] == 'rent: outside 1-100000'
+
+
+def test_check_columns_names_the_missing_ones():
+    with pytest.raises(ValueError, match='rent, sqft'):
+        check_columns(['address', 'BR', 'Ba'])
+
+
+def test_read_batches_quarantines_across_chunks(tmp_path):
+    path = str(tmp_path / 'listings.csv')
+    pd.DataFrame({
+        'address': ['1 A St', '2 B St', '3 C St', '4 D St', '5 E St'],
+        'rent': ['1000', 'call', '1200', '1300', '-5'],
+        'BR': [1, 1, 2, 2, 3],
+        'Ba': [1, 1, 1, 2, 2],
+        'sqft': [500, 600, 700, 800, 900],
+    }).to_csv(path, index=False)
+
+    with Quarantine(rejects_path(path)) as quarantine:
+        batches = list(read_batches(path, chunk_size=2, quarantine=quarantine))
+
+    assert [batch.index.tolist() for batch in batches] == [[0], [2, 3]]
+    assert quarantine.rows == 2
+    assert quarantine.reasons == {'rent: not a number': 1, 'rent: outside 1-100000': 1}
+    rejects = pd.read_csv(rejects_path(path))
+    assert rejects['row'].tolist() == [1, 4]
+
+
+def test_quarantine_only_creates_a_file_when_rows_are_rejected(tmp_path):
+    path = str(tmp_path / 'rejects.csv')
+    with open(path, 'w') as f:
+        f.write('stale from an earlier run\n')
+    with Quarantine(path) as quarantine:
+        quarantine.write(pd.DataFrame(columns=['row', 'reason']))
+    assert not os.path.exists(path)
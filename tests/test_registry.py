@@ -0,0 +1,87 @@
+"""models/registry.py: publishing versions, loading them back and the checksum guard."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+
+from models.forest_engine import CompiledForest
+from models.registry import load_model, open_model, publish, read_meta, version_dir, versions
+
+X = np.array([[1, 1.0, 600], [2, 1.0, 900], [2, 2.0, 1100], [3, 2.0, 1300]] * 10, dtype=float)
+y = np.array([1500, 2000, 2300, 2900] * 10, dtype=float)
+DATA = {'source': 'test', 'sha256': 'abc', 'rows': len(X), 'deduplicated': True}
+
+
+def test_publish_numbers_versions_and_records_meta(tmp_path):
+    registry_dir = str(tmp_path)
+    model = RandomForestRegressor(n_estimators=3, random_state=0).fit(X, y)
+    assert publish('rent', model, ['BR', 'Ba', 'sqft'], DATA, {'test_mae': np.float64(12.5)},
+                   params={'n_estimators': 3}, backend='random_forest', registry_dir=registry_dir) == 1
+    assert publish('rent', model, ['BR', 'Ba', 'sqft'], DATA, {}, parent=1, registry_dir=registry_dir) == 2
+    assert versions('rent', registry_dir) == [1, 2]
+
+    meta = read_meta('rent', registry_dir=registry_dir)
+    assert meta['version'] == 2 and meta['parent'] == 1
+    first = read_meta('rent', 1, registry_dir)
+    assert first['features'] == ['BR', 'Ba', 'sqft'] and first['data'] == DATA
+    assert first['metrics']['test_mae'] == 12.5 and first['compiled']
+    assert not [entry for entry in os.listdir(tmp_path / 'rent') if entry.startswith('.')]
+
+
+def test_load_model_round_trips_and_caches(tmp_path):
+    registry_dir = str(tmp_path)
+    model = RandomForestRegressor(n_estimators=3, random_state=0).fit(X, y)
+    publish('rent', model, ['BR', 'Ba', 'sqft'], DATA, {}, registry_dir=registry_dir)
+
+    loaded = load_model('rent', registry_dir=registry_dir)
+    np.testing.assert_allclose(loaded.predict(X), model.predict(X))
+    assert load_model('rent', 1, registry_dir=registry_dir) is loaded
+    forest = load_model('rent', compiled=True, registry_dir=registry_dir)
+    assert isinstance(forest, CompiledForest)
+    np.testing.assert_allclose(forest.predict(X), model.predict(X), rtol=1e-9)
+
+
+def test_non_forest_has_no_compiled_export(tmp_path):
+    registry_dir = str(tmp_path)
+    model = HistGradientBoostingRegressor(max_iter=5).fit(X, y)
+    publish('rent', model, ['BR', 'Ba', 'sqft'], DATA, {}, backend='hist_gb', registry_dir=registry_dir)
+    assert not read_meta('rent', registry_dir=registry_dir)['compiled']
+    with pytest.raises(ValueError, match='no compiled forest'):
+        load_model('rent', compiled=True, registry_dir=registry_dir)
+
+
+def test_open_model_rejects_a_changed_artifact(tmp_path):
+    registry_dir = str(tmp_path)
+    publish('rent', RandomForestRegressor(n_estimators=2, random_state=0).fit(X, y), ['BR', 'Ba', 'sqft'],
+            DATA, {}, registry_dir=registry_dir)
+    path = version_dir('rent', registry_dir=registry_dir)
+    with open(os.path.join(path, 'model.joblib'), 'ab') as f:
+        f.write(b'\0')
+    with pytest.raises(ValueError, match='checksum'):
+        open_model(path)
+
+
+def test_open_model_rejects_an_unknown_format(tmp_path):
+    registry_dir = str(tmp_path)
+    publish('rent', RandomForestRegressor(n_estimators=2, random_state=0).fit(X, y), ['BR', 'Ba', 'sqft'],
+            DATA, {}, registry_dir=registry_dir)
+    meta_path = os.path.join(version_dir('rent', registry_dir=registry_dir), 'meta.json')
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta['format_version'] = 99
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+    with pytest.raises(ValueError, match='format 99'):
+        open_model(os.path.dirname(meta_path))
+
+
+def test_missing_models_and_versions_raise_lookup_error(tmp_path):
+    with pytest.raises(LookupError, match='train one first'):
+        version_dir('rent', registry_dir=str(tmp_path))
+    publish('rent', RandomForestRegressor(n_estimators=2, random_state=0).fit(X, y), ['BR', 'Ba', 'sqft'],
+            DATA, {}, registry_dir=str(tmp_path))
+    with pytest.raises(LookupError, match='no version 5'):
+        read_meta('rent', 5, str(tmp_path))
@@ -0,0 +1,36 @@
+"""models/scoring.py against the SQL CASE that database/queries.py builds from the same bands."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from models.scoring import score_listings
+from models.thresholds import VALUE_SCORE_BANDS, value_score_sql
+
+
+def test_categories_and_scores_per_bedroom_group():
+    df = pd.DataFrame({'rent': [800, 1000, 1200, 2000, 2000], 'BR': [1, 1, 1, 2, 2]})
+    scores = score_listings(df)
+    assert scores['avg_rent_for_br'].tolist() == [1000, 1000, 1000, 2000, 2000]
+    assert scores['value_category'].tolist() == ['Great Deal', 'Fair Price', 'Overpriced',
+                                                 'Fair Price', 'Fair Price']
+    assert scores['value_score'].tolist() == [9.0, 6.0, 2.0, 6.0, 6.0]
+
+
+def test_sql_case_matches_the_kernel_on_every_band_edge():
+    # Each rent shares a bedroom group with a partner that puts the group average at 1000, so
+    # the rents sit on, just below and just above every band boundary
+    edges = [bound * 1000 for bound, _ in VALUE_SCORE_BANDS]
+    rents = sorted({round(edge + delta, 2) for edge in edges for delta in (-0.01, 0, 0.01)} | {1.0, 1999.0})
+    df = pd.DataFrame({'rent': rents + [2000 - rent for rent in rents], 'BR': list(range(len(rents))) * 2})
+    scores = score_listings(df)
+    assert np.allclose(scores['avg_rent_for_br'], 1000)
+
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE t (rent REAL, avg_rent REAL)")
+    conn.executemany("INSERT INTO t VALUES (?, ?)", zip(df['rent'], scores['avg_rent_for_br']))
+    sql = f"SELECT {value_score_sql('rent', 'avg_rent')} FROM t ORDER BY rowid"
+    actual = [row[0] for row in conn.execute(sql)]
+    np.testing.assert_array_equal(actual, scores['value_score'].to_numpy())
+    assert len(set(actual)) == len(VALUE_SCORE_BANDS) + 1
@@ -0,0 +1,465 @@
+"""
+RUKindaHomeless - Listings API Server
+Small asyncio HTTP API so the web page can query listings instead of downloading every shard.
+Runs against the PostgreSQL database built by database/load_data.py (connection settings from
+database/db.py), or against a SQLite
+stand-in built from listings.csv when PostgreSQL is not available (--sqlite).
+
+    GET /api/listings   filtered, keyset-paginated listings
+                        ?bedrooms=2&source=Redfin&min_rent=1500&max_rent=3000&min_sqft=600
+                        &sort=rent|-rent|price_per_sqft|value&limit=50&after=<next cursor>
+    GET /api/summary    rent_summary and source_rent_summary rows
+    GET /api/health
+    GET /<file>         the generated web app (index.html?api=1 switches the page to this API)
+
+Queries run on a small connection pool in worker threads; responses are cached for
+--cache-ttl seconds.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import queue
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'database'))
+from models.thresholds import GREAT_DEAL_RATIO, OVERPRICED_RATIO
+
+WEBAPP_DIR = os.path.dirname(os.path.abspath(__file__))
+MAX_LIMIT = 500
+
+# sort name -> (key expression, direction); every sort is keyset-paginated on (key, listing_id)
+SORTS = {
+    'rent': ('l.monthly_rent', 'ASC'),
+    '-rent': ('l.monthly_rent', 'DESC'),
+    'price_per_sqft': ('s.price_per_sqft', 'ASC'),
+    'value': ('s.value_score', 'DESC'),
+}
+
+LISTINGS_SQL = """
+    SELECT l.listing_id, l.address, l.monthly_rent, l.bedrooms, l.bathrooms, l.square_feet,
+           l.source, l.listing_url, s.value_score, s.avg_rent_for_bedrooms, {key}
+    FROM listings l
+    LEFT JOIN listing_stats s ON s.listing_id = l.listing_id
+    {where}
+    ORDER BY {key} {direction}, l.listing_id {direction}
+    LIMIT {p}
+"""
+
+COUNT_SQL = """
+    SELECT COUNT(*)
+    FROM listings l
+    {join}
+    {where}
+"""
+
+BEDROOM_SUMMARY_SQL = "SELECT bedrooms, num_listings, avg_rent, min_rent, max_rent, avg_sqft FROM rent_summary"
+SOURCE_SUMMARY_SQL = "SELECT source, num_listings, avg_rent, avg_sqft FROM source_rent_summary"
+
+
+class BadRequest(Exception):
+    pass
+
+
+class PostgresBackend:
+    """
+    Connections come from database/db.py's pool. Each distinct query shape is PREPAREd once
+    per connection, so repeat requests skip parsing and planning.
+    """
+
+    placeholder = '%s'
+
+    def __init__(self, pool_size):
+        import db
+        self.db = db
+        db.get_pool(pool_max=pool_size)
+
+    def query(self, sql, params):
+        name = 'api_' + hashlib.sha1(sql.encode()).hexdigest()[:12]
+        with self.db.connection() as conn:
+            with conn.cursor() as cursor:
+                self.db.execute_prepared(cursor, name, sql, params)
+                return cursor.fetchall()
+
+
+class SQLiteBackend:
+    """
+    Stand-in with the same table and column names, built from listings.csv with the shared
+    loader and scoring kernel, and rebuilt whenever the CSV (or the loader's cleaning) has
+    changed since. A fixed set of connections is handed out through a queue.
+    """
+
+    placeholder = '?'
+
+    def __init__(self, db_path, csv_path, pool_size):
+        source = self.source_key(csv_path)
+        if self.built_from(db_path) != source:
+            self.build(db_path, csv_path, source)
+        self.connections = queue.Queue()
+        for _ in range(pool_size):
+            self.connections.put(sqlite3.connect(db_path, check_same_thread=False))
+
+    @staticmethod
+    def source_key(csv_path):
+        """What the stand-in was built from: the CSV's contents and the loader's cache version."""
+        from data.listings import CACHE_VERSION, file_fingerprint
+        return f'{CACHE_VERSION}:{file_fingerprint(csv_path)}'
+
+    @staticmethod
+    def built_from(db_path):
+        """source_key recorded in an existing stand-in, or None."""
+        if not os.path.exists(db_path):
+            return None
+        conn = sqlite3.connect(db_path)
+        try:
+            row = conn.execute("SELECT value FROM build_info WHERE name = 'source'").fetchone()
+        except sqlite3.Error:
+            return None
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    @staticmethod
+    def build(db_path, csv_path, source):
+        from data.listings import load_listings
+        from models.scoring import score_listings
+
+        df = load_listings(csv_path, dedupe=True)
+        scores = score_listings(df)
+        listings = df.rename(columns={'rent': 'monthly_rent', 'BR': 'bedrooms', 'Ba': 'bathrooms',
+                                      'sqft': 'square_feet', 'url': 'listing_url'})
+        listings = listings[['address', 'monthly_rent', 'bedrooms', 'bathrooms', 'square_feet', 'source',
+                             'listing_url']].astype({'monthly_rent': float, 'source': str})
+        listings.insert(0, 'listing_id', range(1, len(listings) + 1))
+        stats = listings[['listing_id']].assign(
+            price_per_sqft=(listings['monthly_rent'] / listings['square_feet']).round(2),
+            avg_rent_for_bedrooms=scores['avg_rent_for_br'].round(2).to_numpy(),
+            value_score=scores['value_score'].to_numpy(),
+        )
+
+        tmp_path = db_path + '.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        # listing_id as INTEGER PRIMARY KEY is the rowid, so the stats join is a direct lookup
+        conn.executescript("""
+            CREATE TABLE listings (listing_id INTEGER PRIMARY KEY, address TEXT, monthly_rent REAL,
+                                   bedrooms INTEGER, bathrooms REAL, square_feet INTEGER, source TEXT,
+                                   listing_url TEXT);
+            CREATE TABLE listing_stats (listing_id INTEGER PRIMARY KEY, price_per_sqft REAL,
+                                        avg_rent_for_bedrooms REAL, value_score REAL);
+            CREATE TABLE build_info (name TEXT PRIMARY KEY, value TEXT);
+        """)
+        conn.execute("INSERT INTO build_info VALUES ('source', ?)", (source,))
+        listings.to_sql('listings', conn, index=False, if_exists='append')
+        stats.to_sql('listing_stats', conn, index=False, if_exists='append')
+        conn.executescript("""
+            CREATE INDEX idx_rent ON listings(monthly_rent, listing_id);
+            CREATE INDEX idx_bedrooms_rent ON listings(bedrooms, monthly_rent, listing_id);
+            CREATE INDEX idx_stats_value_score ON listing_stats(value_score, listing_id);
+            CREATE INDEX idx_stats_price_per_sqft ON listing_stats(price_per_sqft, listing_id);
+            CREATE VIEW rent_summary AS
+                SELECT bedrooms, COUNT(*) AS num_listings, ROUND(AVG(monthly_rent), 2) AS avg_rent,
+                       MIN(monthly_rent) AS min_rent, MAX(monthly_rent) AS max_rent,
+                       ROUND(AVG(square_feet), 2) AS avg_sqft
+                FROM listings GROUP BY bedrooms ORDER BY bedrooms;
+            CREATE VIEW source_rent_summary AS
+                SELECT source, COUNT(*) AS num_listings, ROUND(AVG(monthly_rent), 2) AS avg_rent,
+                       ROUND(AVG(square_feet), 2) AS avg_sqft
+                FROM listings GROUP BY source ORDER BY avg_rent;
+        """)
+        conn.commit()
+        conn.close()
+        os.replace(tmp_path, db_path)
+        print(f"✅ Built SQLite stand-in {db_path} with {len(listings):,} listings", file=sys.stderr)
+
+    def query(self, sql, params):
+        conn = self.connections.get()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            self.connections.put(conn)
+
+
+class ResponseCache:
+    """LRU of encoded responses with a time-to-live."""
+
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        if self.ttl <= 0:
+            return
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+def number(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def encode_cursor(key, listing_id):
+    # PostgreSQL DECIMALs travel as strings and come back as Decimal, so the keyset
+    # comparison stays numeric = numeric and can use the index
+    key = str(key) if isinstance(key, Decimal) else key
+    return base64.urlsafe_b64encode(json.dumps([key, listing_id]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        key, listing_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (Decimal(key) if isinstance(key, str) else key), int(listing_id)
+    except (ValueError, TypeError, ArithmeticError):
+        raise BadRequest("invalid 'after' cursor")
+
+
+def value_category(rent, avg_rent):
+    """Same thresholds as models/scoring.py (from models/thresholds.py), applied to one row."""
+    if rent is None or not avg_rent:
+        return None
+    if rent <= avg_rent * GREAT_DEAL_RATIO:
+        return 'great-deal'
+    if rent >= avg_rent * OVERPRICED_RATIO:
+        return 'overpriced'
+    return 'fair-price'
+
+
+def listings_query(backend, params):
+    """Build and run the filtered listings query; returns the response dict."""
+    def one(name, cast):
+        values = params.get(name)
+        if not values or values[0] == '':
+            return None
+        try:
+            return cast(values[0])
+        except ValueError:
+            raise BadRequest(f"'{name}' must be a number")
+
+    sort = (params.get('sort') or ['rent'])[0]
+    if sort not in SORTS:
+        raise BadRequest(f"'sort' must be one of {', '.join(SORTS)}")
+    key, direction = SORTS[sort]
+    limit = one('limit', int)
+    if limit is None:
+        limit = 50
+    elif limit < 1:
+        raise BadRequest("'limit' must be at least 1")
+    limit = min(limit, MAX_LIMIT)
+
+    p = backend.placeholder
+    conditions, args = [], []
+    for name, condition, cast in [('bedrooms', 'l.bedrooms = {p}', int),
+                                  ('min_rent', 'l.monthly_rent >= {p}', float),
+                                  ('max_rent', 'l.monthly_rent <= {p}', float),
+                                  ('min_sqft', 'l.square_feet >= {p}', int)]:
+        value = one(name, cast)
+        if value is not None:
+            conditions.append(condition.format(p=p))
+            args.append(value)
+    if params.get('source', [''])[0]:
+        conditions.append(f'l.source = {p}')
+        args.append(params['source'][0])
+    # Rows without a sort key can't be paged past, so they are left out of every sort
+    conditions.append(f'{key} IS NOT NULL')
+    filter_where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+
+    page_conditions, page_args = list(conditions), list(args)
+    cursor = params.get('after', [''])[0]
+    if cursor:
+        after_key, after_id = decode_cursor(cursor)
+        op = '>' if direction == 'ASC' else '<'
+        page_conditions.append(f'({key}, l.listing_id) {op} ({p}, {p})')
+        page_args += [after_key, after_id]
+    page_where = ('WHERE ' + ' AND '.join(page_conditions)) if page_conditions else ''
+
+    # One extra row tells us whether there is a next page. The limit is a parameter so every
+    # page size shares one prepared statement per query shape
+    rows = backend.query(LISTINGS_SQL.format(key=key, direction=direction, where=page_where, p=p),
+                         page_args + [limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    response = {
+        'listings': [
+            {
+                'id': row[0],
+                'address': row[1],
+                'rent': number(row[2]),
+                'bedrooms': row[3],
+                'bathrooms': number(row[4]),
+                'sqft': row[5],
+                'source': row[6],
+                'url': row[7],
+                'valueScore': number(row[8]),
+                'valueCategory': value_category(number(row[2]), number(row[9])),
+            }
+            for row in rows
+        ],
+        'next': encode_cursor(rows[-1][10], rows[-1][0]) if has_more else None,
+    }
+    # The total only comes with the first page; later pages reuse the client's copy
+    if not cursor:
+        # Only join the stats when the sort key lives there; otherwise the count is index-only
+        join = 'LEFT JOIN listing_stats s ON s.listing_id = l.listing_id' if key.startswith('s.') else ''
+        response['total'] = backend.query(COUNT_SQL.format(join=join, where=filter_where), args)[0][0]
+    return response
+
+
+def summary_query(backend):
+    return {
+        'bedrooms': [
+            {'bedrooms': r[0], 'numListings': r[1], 'avgRent': number(r[2]), 'minRent': number(r[3]),
+             'maxRent': number(r[4]), 'avgSqft': number(r[5])}
+            for r in backend.query(BEDROOM_SUMMARY_SQL, [])
+        ],
+        'sources': [
+            {'source': r[0], 'numListings': r[1], 'avgRent': number(r[2]), 'avgSqft': number(r[3])}
+            for r in backend.query(SOURCE_SUMMARY_SQL, [])
+        ],
+    }
+
+
+class ApiServer:
+    def __init__(self, backend, cache, executor, static_dir):
+        self.backend = backend
+        self.cache = cache
+        self.executor = executor
+        self.static_dir = os.path.realpath(static_dir)
+
+    async def route(self, method, target):
+        """Returns (status, content type, body bytes)."""
+        url = urlsplit(target)
+        path = unquote(url.path)
+        if method != 'GET':
+            return 405, 'application/json', b'{"error": "only GET is supported"}'
+
+        if path.startswith('/api/'):
+            cache_key = path + '?' + '&'.join(sorted(url.query.split('&')))
+            body = self.cache.get(cache_key)
+            if body is not None:
+                return 200, 'application/json', body
+
+            loop = asyncio.get_running_loop()
+            params = parse_qs(url.query)
+            try:
+                if path == '/api/listings':
+                    result = await loop.run_in_executor(self.executor, listings_query, self.backend, params)
+                elif path == '/api/summary':
+                    result = await loop.run_in_executor(self.executor, summary_query, self.backend)
+                elif path == '/api/health':
+                    result = {'status': 'ok', 'cache': {'hits': self.cache.hits, 'misses': self.cache.misses}}
+                    return 200, 'application/json', json.dumps(result).encode()
+                else:
+                    return 404, 'application/json', json.dumps({'error': f'no route for {path}'}).encode()
+            except BadRequest as e:
+                return 400, 'application/json', json.dumps({'error': str(e)}).encode()
+
+            body = json.dumps(result, separators=(',', ':')).encode()
+            self.cache.put(cache_key, body)
+            return 200, 'application/json', body
+
+        # Static files from the generated web app, never outside it
+        file_path = os.path.realpath(os.path.join(self.static_dir, path.lstrip('/') or 'index.html'))
+        if not file_path.startswith(self.static_dir + os.sep) or not os.path.isfile(file_path):
+            return 404, 'text/plain', b'not found'
+        with open(file_path, 'rb') as f:
+            body = f.read()
+        return 200, mimetypes.guess_type(file_path)[0] or 'application/octet-stream', body
+
+    async def handle(self, reader, writer):
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                   500: 'Internal Server Error'}
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get('content-length', 0)))
+
+                try:
+                    status, content_type, body = await self.route(method, target)
+                except Exception as e:
+                    print(f"❌ {method} {target}: {e}", file=sys.stderr)
+                    status, content_type, body = 500, 'application/json', json.dumps({'error': str(e)}).encode()
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {reasons[status]}\r\n"
+                    f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                    f"Access-Control-Allow-Origin: *\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main(args):
+    if args.sqlite:
+        backend = SQLiteBackend(args.sqlite, args.csv, args.pool_size)
+    else:
+        backend = PostgresBackend(args.pool_size)
+
+    server = ApiServer(backend, ResponseCache(args.cache_ttl), ThreadPoolExecutor(args.pool_size), args.static_dir)
+    listener = await asyncio.start_server(server.handle, args.host, args.port)
+    print(f"✅ Listings API on http://{args.host}:{args.port}/api/listings "
+          f"({'SQLite ' + args.sqlite if args.sqlite else 'PostgreSQL'}, pool of {args.pool_size})", file=sys.stderr)
+    print(f"   Web app in API mode: http://{args.host}:{args.port}/index.html?api=1", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == '__main__':
+    from data.listings import DEFAULT_CSV
+
+    parser = argparse.ArgumentParser(description="Serve filtered, paginated listing queries over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--sqlite', metavar='PATH', help="use (and if missing or stale, build) a SQLite stand-in instead")
+    parser.add_argument('--csv', default=DEFAULT_CSV, help="listings CSV for building the SQLite stand-in")
+    parser.add_argument('--pool-size', type=int, default=4, help="database connections / worker threads")
+    parser.add_argument('--cache-ttl', type=float, default=30.0, help="seconds to cache responses (0 disables)")
+    parser.add_argument('--static-dir', default=WEBAPP_DIR, help="generated web app to serve alongside the API")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
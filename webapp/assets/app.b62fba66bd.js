@@ -0,0 +1,448 @@
+// RUKindaHomeless - Apartment Finder
+// generate_webapp.py copies this file to assets/app.<content hash>.js
+
+// Totals, filter options and the shard index (manifest.js); listing data is fetched shard by shard
+const MANIFEST = window.MANIFEST;
+
+// Shards are plain scripts calling RUKH.shardLoaded(...), so they load over file:// too
+window.RUKH = {
+    pending: {},
+    resolvers: {},
+    shardLoaded(data) {
+        const resolve = this.resolvers[data.name];
+        delete this.resolvers[data.name];
+        if (resolve) resolve(data.columns ? hydrateShard(data) : data);
+    }
+};
+
+function hydrateShard(data) {
+    const c = data.columns;
+    const rows = new Array(c.rent.length);
+    for (let i = 0; i < rows.length; i++) {
+        rows[i] = {
+            address: c.address[i],
+            rent: c.rent[i],
+            bedrooms: data.bedrooms,
+            bathrooms: c.bathrooms[i],
+            sqft: c.sqft[i],
+            url: c.url[i],
+            source: MANIFEST.sources[c.source[i]],
+            valueCategory: MANIFEST.valueCategories[c.valueCategory[i]],
+            valueScore: c.valueScore[i]
+        };
+    }
+    return rows;
+}
+
+function loadShard(name) {
+    if (!RUKH.pending[name]) {
+        RUKH.pending[name] = new Promise((resolve, reject) => {
+            RUKH.resolvers[name] = resolve;
+            const script = document.createElement('script');
+            script.src = `${MANIFEST.shardDir}/${name}.js`;
+            script.onerror = () => {
+                delete RUKH.pending[name];
+                reject(new Error(`Could not load ${script.src}`));
+            };
+            document.head.appendChild(script);
+        });
+    }
+    return RUKH.pending[name];
+}
+
+function getValueLabel(category) {
+    const labels = {
+        'great-deal': 'Great Deal',
+        'fair-price': 'Fair Price',
+        'overpriced': 'Overpriced'
+    };
+    return labels[category] || 'Fair Price';
+}
+
+function calculateStats() {
+    // Read from the manifest: the generator precomputes every aggregate the page shows
+    document.getElementById('totalListings').textContent = MANIFEST.total;
+    document.getElementById('avgRent').textContent = '$' + Math.round(MANIFEST.avgRent).toLocaleString();
+    document.getElementById('minRent').textContent = '$' + MANIFEST.minRent.toLocaleString();
+    document.getElementById('greatDeals').textContent = MANIFEST.greatDeals;
+    
+    // Populate bedroom and source filters
+    const bedroomsFilter = document.getElementById('bedroomsFilter');
+    bedroomsFilter.innerHTML = '<option value="">All</option>';
+    MANIFEST.bedrooms.forEach(group => {
+        const option = document.createElement('option');
+        option.value = group.bedrooms;
+        option.textContent = group.bedrooms === 0 ? 'Studio' : group.bedrooms + ' BR';
+        bedroomsFilter.appendChild(option);
+    });
+
+    const sourceFilter = document.getElementById('sourceFilter');
+    sourceFilter.innerHTML = '<option value="">All Sources</option>';
+    MANIFEST.sources.forEach(source => {
+        const option = document.createElement('option');
+        option.value = source;
+        option.textContent = source;
+        sourceFilter.appendChild(option);
+    });
+}
+
+// Windowed card list: the container is as tall as every result would be, but only the
+// rows in or near the viewport have card nodes, and scrolling reuses those nodes
+const CARD_GAP = 20;
+const MIN_CARD_WIDTH = 350;
+const OVERSCAN_ROWS = 2;
+// Browsers stop laying out elements taller than roughly 16M px; past that, scroll
+// distance is scaled down and cards are placed relative to the current position
+const MAX_LIST_HEIGHT = 15000000;
+const grid = {count: 0, columns: 1, cardWidth: 0, rowHeight: 0, fullHeight: 0, height: 0, pool: [], frame: null};
+
+function addElement(parent, tag, className) {
+    const element = document.createElement(tag);
+    if (className) element.className = className;
+    parent.appendChild(element);
+    return element;
+}
+
+function createCard() {
+    const card = document.createElement('div');
+    card.className = 'listing-card';
+    const header = addElement(card, 'div', 'listing-header');
+    const fields = {
+        price: addElement(header, 'div', 'listing-price'),
+        address: addElement(header, 'div', 'listing-address')
+    };
+    const details = addElement(card, 'div', 'listing-details');
+    [['bedrooms', 'Bedrooms'], ['bathrooms', 'Bathrooms'], ['sqft', 'Square Feet'],
+     ['pricePerSqft', 'Price/sqft'], ['source', 'Source']].forEach(([key, label]) => {
+        const row = addElement(details, 'div', 'listing-detail-row');
+        addElement(row, 'span', 'detail-label').textContent = label;
+        fields[key] = addElement(row, 'span', 'detail-value');
+    });
+    const badgeRow = addElement(details, 'div');
+    badgeRow.style.textAlign = 'center';
+    fields.badge = addElement(badgeRow, 'span', 'value-badge');
+    fields.link = addElement(card, 'a', 'listing-link');
+    fields.link.target = '_blank';
+    fields.link.textContent = 'View Original Listing →';
+    card.fields = fields;
+    card.index = -1;
+    return card;
+}
+
+function fillCard(card, listing) {
+    const f = card.fields;
+    if (!listing) {
+        // Shard still loading; keep the card's size so the layout does not jump
+        f.price.textContent = '…';
+        ['address', 'bedrooms', 'bathrooms', 'sqft', 'pricePerSqft', 'source'].forEach(key => f[key].textContent = '');
+        f.badge.className = 'value-badge';
+        f.badge.textContent = '';
+        f.link.removeAttribute('href');
+        return;
+    }
+    f.price.textContent = `$${listing.rent.toLocaleString()}/mo`;
+    f.address.textContent = listing.address;
+    f.address.title = listing.address;
+    f.bedrooms.textContent = listing.bedrooms === 0 ? 'Studio' : listing.bedrooms + ' BR';
+    f.bathrooms.textContent = `${listing.bathrooms} BA`;
+    f.sqft.textContent = `${listing.sqft.toLocaleString()} sqft`;
+    f.pricePerSqft.textContent = `$${(listing.rent / listing.sqft).toFixed(2)}`;
+    f.source.textContent = listing.source;
+    f.badge.className = `value-badge ${listing.valueCategory}`;
+    f.badge.textContent = getValueLabel(listing.valueCategory);
+    f.link.href = listing.url;
+}
+
+function layoutGrid() {
+    const container = document.getElementById('listings');
+    const width = container.clientWidth;
+    grid.columns = Math.max(1, Math.floor((width + CARD_GAP) / (MIN_CARD_WIDTH + CARD_GAP)));
+    grid.cardWidth = (width - CARD_GAP * (grid.columns - 1)) / grid.columns;
+    if (!grid.rowHeight) {
+        // Every card has the same shape, so measure one filled-in card once
+        const probe = createCard();
+        probe.style.visibility = 'hidden';
+        probe.style.width = grid.cardWidth + 'px';
+        fillCard(probe, {rent: 0, address: '-', bedrooms: 1, bathrooms: 1, sqft: 1, source: '-',
+                          url: '#', valueCategory: 'fair-price'});
+        container.appendChild(probe);
+        grid.rowHeight = probe.offsetHeight || 480;
+        container.removeChild(probe);
+    }
+    const rows = Math.ceil(grid.count / grid.columns);
+    grid.fullHeight = rows ? rows * (grid.rowHeight + CARD_GAP) - CARD_GAP : 0;
+    grid.height = Math.min(grid.fullHeight, MAX_LIST_HEIGHT);
+    container.style.height = grid.height + 'px';
+    renderWindow();
+}
+
+function renderWindow() {
+    grid.frame = null;
+    const container = document.getElementById('listings');
+    const rowSpan = grid.rowHeight + CARD_GAP;
+    const top = container.getBoundingClientRect().top;
+    const scrolled = Math.max(0, -top);
+    // Map the scrollable range of the (possibly capped) container onto the full list
+    const virtualScrolled = grid.height > window.innerHeight
+        ? scrolled * (grid.fullHeight - window.innerHeight) / (grid.height - window.innerHeight)
+        : scrolled;
+    const totalRows = Math.ceil(grid.count / grid.columns);
+    const firstRow = Math.max(0, Math.floor(virtualScrolled / rowSpan) - OVERSCAN_ROWS);
+    const lastRow = Math.min(totalRows - 1,
+        Math.floor((virtualScrolled + window.innerHeight - Math.max(top, 0)) / rowSpan) + OVERSCAN_ROWS);
+    const first = firstRow * grid.columns;
+    const last = Math.min(grid.count, (lastRow + 1) * grid.columns);
+
+    // The pool only grows to the number of cards that fit on screen (plus overscan)
+    const visibleRows = Math.ceil(window.innerHeight / rowSpan) + 2 * OVERSCAN_ROWS + 1;
+    while (grid.pool.length < Math.min(grid.count, visibleRows * grid.columns)) {
+        const card = createCard();
+        container.appendChild(card);
+        grid.pool.push(card);
+    }
+
+    const used = new Set();
+    for (let index = first; index < last; index++) {
+        // Same slot for the same index while it stays on screen, so unchanged cards are left alone
+        const card = grid.pool[index % grid.pool.length];
+        used.add(card);
+        card.style.display = '';
+        card.style.width = grid.cardWidth + 'px';
+        card.style.left = (index % grid.columns) * (grid.cardWidth + CARD_GAP) + 'px';
+        card.style.top = (scrolled + Math.floor(index / grid.columns) * rowSpan - virtualScrolled) + 'px';
+        if (card.index !== index || card.pending) {
+            const listing = listingAt(index);
+            card.index = index;
+            card.pending = !listing;
+            fillCard(card, listing);
+        }
+    }
+    grid.pool.forEach(card => {
+        if (!used.has(card)) {
+            card.style.display = 'none';
+            card.index = -1;
+        }
+    });
+}
+
+function scheduleRender() {
+    if (!grid.frame) grid.frame = requestAnimationFrame(renderWindow);
+}
+
+function showResults(count) {
+    grid.count = count;
+    grid.pool.forEach(card => card.index = -1);
+    document.getElementById('noResults').style.display = count === 0 ? 'block' : 'none';
+    document.getElementById('resultCount').textContent =
+        count === 0 ? '' : `${count.toLocaleString()} listings`;
+    // Back to the top of the results if we had scrolled past them
+    const container = document.getElementById('listings');
+    if (container.getBoundingClientRect().top < 0) container.scrollIntoView();
+    layoutGrid();
+}
+
+// The active query: matching index ranges and, when sorted, the order to show them in
+let query = null;
+
+function readFilters() {
+    const bedrooms = document.getElementById('bedroomsFilter').value;
+    const source = document.getElementById('sourceFilter').value;
+    return {
+        bedrooms: bedrooms === '' ? null : parseInt(bedrooms),
+        minPrice: parseFloat(document.getElementById('minPrice').value) || 0,
+        maxPrice: parseFloat(document.getElementById('maxPrice').value) || Infinity,
+        source: source === '' ? null : MANIFEST.sources.indexOf(source)
+    };
+}
+
+// First position in rents[lo, hi) whose rent is >= target (or > target when after is set)
+function lowerBound(rents, lo, hi, target, after) {
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (rents[mid] < target || (after && rents[mid] === target)) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+async function findRanges(filters) {
+    // Each (bedrooms, source) bucket is a rent-sorted run inside its bedroom group
+    const ranges = [];
+    const priced = filters.minPrice > 0 || filters.maxPrice < Infinity;
+    for (const group of MANIFEST.bedrooms) {
+        if (filters.bedrooms !== null && group.bedrooms !== filters.bedrooms) continue;
+        const buckets = group.buckets.filter(b =>
+            (filters.source === null || b.source === filters.source) &&
+            b.maxRent >= filters.minPrice && b.minRent <= filters.maxPrice);
+        if (buckets.length === 0) continue;
+        const rents = priced ? (await loadShard(group.index)).rents : null;
+        for (const bucket of buckets) {
+            let start = bucket.start;
+            let end = bucket.start + bucket.count;
+            if (priced) {
+                start = lowerBound(rents, start, end, filters.minPrice, false);
+                end = lowerBound(rents, start, end, filters.maxPrice, true);
+            }
+            if (end > start) ranges.push({group: group, start: start, end: end});
+        }
+    }
+    return ranges;
+}
+
+// API mode (index.html?api=1, or ?api=<server url>): listings come from webapp/api_server.py
+// one keyset page at a time instead of from the shards
+const API_BASE = (() => {
+    const api = new URLSearchParams(window.location.search).get('api');
+    if (!api) return null;
+    return api === '1' ? '' : api.replace(/\/$/, '');
+})();
+const API_PAGE_SIZE = 200;
+const API_SORTS = {'rent-asc': 'rent', 'rent-desc': '-rent', 'price-per-sqft': 'price_per_sqft', 'value': 'value'};
+
+async function fetchApiPage(q) {
+    const f = q.filters;
+    const params = new URLSearchParams({sort: API_SORTS[q.sort] || 'rent', limit: API_PAGE_SIZE});
+    if (f.bedrooms !== null) params.set('bedrooms', f.bedrooms);
+    if (f.source !== null) params.set('source', MANIFEST.sources[f.source]);
+    if (f.minPrice > 0) params.set('min_rent', f.minPrice);
+    if (f.maxPrice < Infinity) params.set('max_rent', f.maxPrice);
+    if (q.api.next) params.set('after', q.api.next);
+    const response = await fetch(`${API_BASE}/api/listings?${params}`);
+    if (!response.ok) throw new Error(`API request failed: ${response.status}`);
+    const page = await response.json();
+    if ('total' in page) q.total = page.total;
+    q.api.rows.push(...page.listings);
+    q.api.next = page.next;
+}
+
+function apiListingAt(q, index) {
+    if (index < q.api.rows.length) return q.api.rows[index];
+    // Pages come in order; keep fetching until the visible rows have arrived
+    if (!q.api.loading && q.api.next) {
+        q.api.loading = fetchApiPage(q).then(() => {
+            q.api.loading = null;
+            if (q === query) scheduleRender();
+        });
+    }
+    return null;
+}
+
+const shardRows = {};
+
+function listingAt(index) {
+    // Result position -> (bedroom group, row) -> loaded shard row, or null while it loads
+    const q = query;
+    if (q.api) return apiListingAt(q, index);
+    let group, position;
+    if (q.order) {
+        const slot = q.order[index];
+        group = MANIFEST.bedrooms[q.groups[slot]];
+        position = q.positions[slot];
+    } else {
+        let lo = 0, hi = q.ranges.length - 1;
+        while (lo < hi) {
+            const mid = (lo + hi + 1) >>> 1;
+            if (q.offsets[mid] <= index) lo = mid;
+            else hi = mid - 1;
+        }
+        group = q.ranges[lo].group;
+        position = q.ranges[lo].start + index - q.offsets[lo];
+    }
+    const name = group.shards[Math.floor(position / MANIFEST.shardSize)];
+    if (shardRows[name]) return shardRows[name][position % MANIFEST.shardSize];
+    loadShard(name).then(rows => {
+        shardRows[name] = rows;
+        scheduleRender();
+    });
+    return null;
+}
+
+const SORT_KEYS = {
+    'rent-asc': (index, i) => index.rents[i],
+    'rent-desc': (index, i) => -index.rents[i],
+    'price-per-sqft': (index, i) => index.sqft[i] > 0 ? index.rents[i] / index.sqft[i] : Infinity,
+    // Highest value score first, cheapest first within a score
+    'value': (index, i) => -index.valueScore[i] * 1e7 + index.rents[i]
+};
+
+async function sortResults(q) {
+    // Sorts the matching (group, row) pairs by keys read from the rent indexes; cards
+    // only re-render for the rows that end up on screen
+    if (!SORT_KEYS[q.sort]) {
+        q.order = null;
+        return;
+    }
+    const indexes = await Promise.all(q.ranges.map(r => loadShard(r.group.index)));
+    const groups = new Uint8Array(q.total);
+    const positions = new Int32Array(q.total);
+    const keys = new Float64Array(q.total);
+    const key = SORT_KEYS[q.sort];
+    let slot = 0;
+    q.ranges.forEach((range, r) => {
+        const groupIndex = MANIFEST.bedrooms.indexOf(range.group);
+        for (let i = range.start; i < range.end; i++, slot++) {
+            groups[slot] = groupIndex;
+            positions[slot] = i;
+            keys[slot] = key(indexes[r], i);
+        }
+    });
+    const order = new Uint32Array(q.total);
+    for (let i = 0; i < order.length; i++) order[i] = i;
+    order.sort((a, b) => (keys[a] - keys[b]) || (a - b));
+    q.groups = groups;
+    q.positions = positions;
+    q.order = order;
+}
+
+async function applySort() {
+    if (!query) return;
+    if (API_BASE !== null) return applyFilters();  // the server sorts
+    const q = query;
+    q.sort = document.getElementById('sortOrder').value;
+    await sortResults(q);
+    if (q !== query) return;
+    showResults(q.total);
+}
+
+async function applyFilters() {
+    const filters = readFilters();
+    const q = {filters: filters, ranges: [], offsets: [], total: 0, order: null,
+               sort: document.getElementById('sortOrder').value};
+    query = q;
+    if (API_BASE !== null) {
+        q.api = {rows: [], next: null, loading: null};
+        await fetchApiPage(q);
+        if (q !== query) return;
+        showResults(q.total);
+        return;
+    }
+    q.ranges = await findRanges(filters);
+    if (q !== query) return;  // a newer filter replaced this one
+    q.ranges.forEach(range => {
+        q.offsets.push(q.total);
+        q.total += range.end - range.start;
+    });
+    await sortResults(q);
+    if (q !== query) return;
+    showResults(q.total);
+}
+
+function resetFilters() {
+    document.getElementById('bedroomsFilter').value = '';
+    document.getElementById('minPrice').value = '';
+    document.getElementById('maxPrice').value = '';
+    document.getElementById('sourceFilter').value = '';
+    applyFilters();
+}
+
+// Initialize when page loads
+window.addEventListener('DOMContentLoaded', () => {
+    console.log(`${MANIFEST.total} apartment listings in ${MANIFEST.bedrooms.reduce((n, g) => n + g.shards.length, 0)} shards`);
+    calculateStats();
+    applyFilters();
+});
+window.addEventListener('scroll', scheduleRender, {passive: true});
+window.addEventListener('resize', () => {
+    grid.rowHeight = 0;
+    layoutGrid();
+});
@@ -1,525 +1,261 @@
 """
 RUKindaHomeless - Web App Generator
-Generates a complete HTML web application with all listings from CSV
+Builds the HTML web application for the listings CSV from the files in templates/:
+
+    index.html             rendered from templates/index.html (string.Template placeholders)
+    assets/app.<hash>.css  templates/app.css, named by content hash so it can be cached forever
+    assets/app.<hash>.js   templates/app.js, likewise
+    manifest.js/.json      totals, filter options and the shard map
+    shards/*.<hash>.js     columnar listing data, loaded by the page as filters need it
+
+Every artifact is only rewritten when its content changes, and the whole data step is
+skipped when the CSV and generator inputs match the previous build (.build.json), so a
+data change rewrites data files only and a template change rewrites assets only.
 """
 
-import pandas as pd
 import json
+import argparse
+import hashlib
+import os
+import sys
+from string import Template
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from data.listings import load_listings, file_fingerprint, DEFAULT_CSV
+from models.scoring import score_listings
+
+VALUE_CATEGORIES = ['great-deal', 'fair-price', 'overpriced']
+SHARD_DIR = 'shards'
+ASSET_DIR = 'assets'
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+BUILD_STATE = '.build.json'
+# Modules that shape the listing data besides this script: scoring and its thresholds,
+# loading and cleaning, validation and dedup
+DATA_MODULES = [os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', *path)
+                for path in [('models', 'scoring.py'), ('models', 'thresholds.py'), ('data', 'listings.py'),
+                             ('data', 'ingest.py'), ('data', 'dedup.py')]]
+
+parser = argparse.ArgumentParser(description="Generate the web app from the listings CSV")
+parser.add_argument('--csv', default=DEFAULT_CSV, help="path to the listings CSV")
+parser.add_argument('--output-dir', default='.', help="where index.html, assets/, manifest.js and shards/ are written")
+parser.add_argument('--shard-size', type=int, default=2000, help="listings per data shard")
+parser.add_argument('--force', action='store_true', help="rebuild the data files even if the inputs are unchanged")
+parser.add_argument('--keep-duplicates', action='store_true',
+                    help="show every scraped row instead of one per near-duplicate cluster")
+args = parser.parse_args()
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_file(path, data):
+    """Write bytes through a temp file so readers never see a half-written artifact."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_if_changed(path, data):
+    """Write data to path unless the file already holds exactly these bytes; True if written."""
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, 'rb') as f:
+            if content_hash(f.read()) == content_hash(data):
+                return False
+    write_file(path, data)
+    return True
+
+
+def write_script(shard_dir, name, data):
+    """
+    Write data as <shard_dir>/<name>.<content hash>.js, a script that hands it to
+    RUKH.shardLoaded, and return the hashed name. Unchanged shards are not rewritten.
+    """
+    hashed = f"{name}.{content_hash(json.dumps(data, separators=(',', ':')).encode())[:10]}"
+    path = os.path.join(shard_dir, f'{hashed}.js')
+    if not os.path.exists(path):
+        payload = json.dumps({'name': hashed, **data}, separators=(',', ':'))
+        write_file(path, f"RUKH.shardLoaded({payload});\n".encode())
+    return hashed
+
+
+def emit_asset(template_name):
+    """Copy templates/<name> to assets/<stem>.<hash><ext>; returns the path relative to the page."""
+    with open(os.path.join(TEMPLATE_DIR, template_name), 'rb') as f:
+        data = f.read()
+    stem, ext = os.path.splitext(template_name)
+    name = f"{stem}.{content_hash(data)[:10]}{ext}"
+    path = os.path.join(args.output_dir, ASSET_DIR, name)
+    if not os.path.exists(path):
+        write_file(path, data)
+        print(f"✅ Wrote {ASSET_DIR}/{name}")
+    return f"{ASSET_DIR}/{name}", name
+
 
 print("=" * 70)
 print("RUKINDAHOMELESS - WEB APP GENERATOR")
 print("=" * 70)
 
-# Load CSV data
-print("\n📂 Loading data from CSV...")
-df = pd.read_csv('../data/listings.csv')
-
-# Clean rent column
-df['rent'] = df['rent'].astype(str).str.replace(',', '').astype(float)
-
-print(f"✅ Loaded {len(df)} listings")
-
-# Convert to list of dictionaries
-listings = []
-for _, row in df.iterrows():
-    listing = {
-        'address': str(row['address']),
-        'rent': float(row['rent']),
-        'bedrooms': int(row['BR']),
-        'bathrooms': float(row['Ba']),
-        'sqft': int(row['sqft']),
-        'url': str(row['url']),
-        'source': str(row['source']).strip()
+os.makedirs(os.path.join(args.output_dir, ASSET_DIR), exist_ok=True)
+state_path = os.path.join(args.output_dir, BUILD_STATE)
+state = {}
+if os.path.exists(state_path):
+    with open(state_path) as f:
+        state = json.load(f)
+
+# Static assets: a new name whenever the content changes, so browsers can cache them forever
+print("\n🎨 Static assets...")
+css_href, css_name = emit_asset('app.css')
+js_src, js_name = emit_asset('app.js')
+for name in os.listdir(os.path.join(args.output_dir, ASSET_DIR)):
+    if name not in (css_name, js_name):
+        os.remove(os.path.join(args.output_dir, ASSET_DIR, name))
+
+# Data: everything the shards depend on, hashed; identical inputs mean identical output
+with open(__file__, 'rb') as f:
+    generator_hash = content_hash(f.read())
+module_hashes = []
+for path in DATA_MODULES:
+    with open(path, 'rb') as f:
+        module_hashes.append(content_hash(f.read()))
+data_key = content_hash(json.dumps([file_fingerprint(args.csv), args.shard_size, args.keep_duplicates,
+                                    generator_hash, module_hashes]).encode())
+manifest_path = os.path.join(args.output_dir, 'manifest.js')
+
+print("\n📂 Listing data...")
+if not args.force and state.get('data_key') == data_key and os.path.exists(manifest_path):
+    print("✅ Listings CSV unchanged since the last build, data files left as they are")
+    total_listings = state.get('total')
+else:
+    df = load_listings(args.csv, dedupe=not args.keep_duplicates)
+    print(f"✅ Loaded {len(df)} listings{'' if args.keep_duplicates else ' (near-duplicates removed)'}")
+
+    # Value categories and scores come from the shared scoring kernel, not the page
+    scores = score_listings(df)
+    df['value_category'] = scores['value_category'].cat.rename_categories(VALUE_CATEGORIES)
+    df['value_score'] = scores['value_score']
+    df['avg_rent_for_br'] = scores['avg_rent_for_br']
+    df['source'] = df['source'].astype(str).str.strip()
+
+    # Shards: one group per bedroom count, ordered by (source, rent) and cut into fixed-size
+    # pages. Within a group every source is then a contiguous, rent-sorted run ("bucket"), so a
+    # bedroom/source/price filter is a few index ranges found by binary search over the group's
+    # rent index, and the page never scans listings it will not show.
+    sources = sorted(df['source'].unique())
+    source_codes = {source: code for code, source in enumerate(sources)}
+    df['source_code'] = df['source'].map(source_codes)
+
+    shard_dir = os.path.join(args.output_dir, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    existing = set(os.listdir(shard_dir))
+
+    bedroom_groups = []
+    ordered = df.sort_values(['BR', 'source_code', 'rent'], kind='stable')
+    for bedrooms, group in ordered.groupby('BR', sort=True):
+        prefix = f"br{int(bedrooms)}"
+        shards = []
+        for page, start in enumerate(range(0, len(group), args.shard_size)):
+            rows = group.iloc[start:start + args.shard_size]
+            # Columnar layout: one array per field, sources and categories as small integer codes
+            shards.append(write_script(shard_dir, f"{prefix}-{page}", {
+                'bedrooms': int(bedrooms),
+                'columns': {
+                    'address': rows['address'].astype(str).tolist(),
+                    'rent': rows['rent'].astype(float).round(2).tolist(),
+                    'bathrooms': rows['Ba'].astype(float).tolist(),
+                    'sqft': rows['sqft'].astype(int).tolist(),
+                    'url': rows['url'].astype(str).tolist(),
+                    'source': rows['source_code'].tolist(),
+                    'valueCategory': rows['value_category'].cat.codes.tolist(),
+                    'valueScore': rows['value_score'].astype(float).tolist(),
+                },
+            }))
+
+        # Sort keys for the whole group (rents ascending within each bucket); a bucket covers
+        # [start, start + count)
+        index_name = write_script(shard_dir, f"{prefix}-index", {
+            'rents': group['rent'].astype(float).round(2).tolist(),
+            'sqft': group['sqft'].astype(int).tolist(),
+            'valueScore': group['value_score'].astype(float).tolist(),
+        })
+        codes = group['source_code'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        counts = np.diff(np.r_[starts, len(codes)])
+        bucket_stats = group.groupby('source_code', sort=True).agg(
+            minRent=('rent', 'min'), maxRent=('rent', 'max'),
+            greatDeals=('value_category', lambda c: int((c == 'great-deal').sum())))
+
+        bedroom_groups.append({
+            'bedrooms': int(bedrooms),
+            'count': len(group),
+            'avgRent': round(float(group['avg_rent_for_br'].iloc[0]), 2),
+            'minRent': float(group['rent'].min()),
+            'greatDeals': int((group['value_category'] == 'great-deal').sum()),
+            'index': index_name,
+            'shards': shards,
+            'buckets': [
+                {
+                    'source': int(codes[start]),
+                    'start': int(start),
+                    'count': int(count),
+                    'minRent': float(bucket_stats.loc[codes[start], 'minRent']),
+                    'maxRent': float(bucket_stats.loc[codes[start], 'maxRent']),
+                    'greatDeals': int(bucket_stats.loc[codes[start], 'greatDeals']),
+                }
+                for start, count in zip(starts, counts)
+            ],
+        })
+
+    source_stats = df.groupby('source_code', sort=True).agg(
+        count=('rent', 'size'), avgRent=('rent', 'mean'),
+        greatDeals=('value_category', lambda c: int((c == 'great-deal').sum())))
+
+    # Everything the page reads instead of recomputing: stat cards, filter options and the shard map
+    manifest = {
+        'total': len(df),
+        'avgRent': round(float(df['rent'].mean()), 2) if len(df) else 0,
+        'minRent': float(df['rent'].min()) if len(df) else 0,
+        'greatDeals': int((df['value_category'] == 'great-deal').sum()),
+        'sources': sources,
+        'sourceStats': [
+            {'count': int(row['count']), 'avgRent': round(float(row['avgRent']), 2), 'greatDeals': int(row['greatDeals'])}
+            for _, row in source_stats.iterrows()
+        ],
+        'valueCategories': VALUE_CATEGORIES,
+        'shardDir': SHARD_DIR,
+        'shardSize': args.shard_size,
+        'bedrooms': bedroom_groups,
     }
-    listings.append(listing)
-
-# Convert to JavaScript array
-listings_js = json.dumps(listings, indent=2)
-
-print(f"✅ Converted {len(listings)} listings to JavaScript format")
-
-# HTML template
-html_template = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>RUKindaHomeless - Apartment Finder</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-
-        header {{
-            background: white;
-            padding: 30px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-            margin-bottom: 30px;
-            text-align: center;
-        }}
-
-        h1 {{
-            color: #667eea;
-            font-size: 2.5em;
-            margin-bottom: 10px;
-        }}
-
-        .subtitle {{
-            color: #666;
-            font-size: 1.1em;
-        }}
-
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-
-        .stat-card {{
-            background: white;
-            padding: 25px;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            text-align: center;
-        }}
-
-        .stat-card h3 {{
-            color: #667eea;
-            font-size: 2em;
-            margin-bottom: 5px;
-        }}
-
-        .stat-card p {{
-            color: #666;
-            font-size: 0.9em;
-        }}
-
-        .filters {{
-            background: white;
-            padding: 25px;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            margin-bottom: 30px;
-        }}
-
-        .filters h2 {{
-            color: #667eea;
-            margin-bottom: 20px;
-        }}
-
-        .filter-group {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin-bottom: 15px;
-        }}
-
-        .filter-group label {{
-            display: block;
-            color: #666;
-            margin-bottom: 5px;
-            font-weight: 600;
-        }}
-
-        .filter-group select,
-        .filter-group input {{
-            width: 100%;
-            padding: 10px;
-            border: 2px solid #e0e0e0;
-            border-radius: 8px;
-            font-size: 1em;
-        }}
-
-        .filter-group select:focus,
-        .filter-group input:focus {{
-            outline: none;
-            border-color: #667eea;
-        }}
-
-        button {{
-            background: #667eea;
-            color: white;
-            border: none;
-            padding: 12px 30px;
-            border-radius: 8px;
-            font-size: 1em;
-            cursor: pointer;
-            transition: all 0.3s;
-        }}
-
-        button:hover {{
-            background: #5568d3;
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-        }}
-
-        .listings {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-            gap: 20px;
-        }}
-
-        .listing-card {{
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-            overflow: hidden;
-            transition: transform 0.3s;
-        }}
-
-        .listing-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-        }}
-
-        .listing-header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-        }}
-
-        .listing-price {{
-            font-size: 2em;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }}
-
-        .listing-address {{
-            font-size: 0.9em;
-            opacity: 0.9;
-        }}
-
-        .listing-details {{
-            padding: 20px;
-        }}
-
-        .listing-detail-row {{
-            display: flex;
-            justify-content: space-between;
-            padding: 10px 0;
-            border-bottom: 1px solid #f0f0f0;
-        }}
-
-        .listing-detail-row:last-child {{
-            border-bottom: none;
-        }}
-
-        .detail-label {{
-            color: #666;
-            font-weight: 600;
-        }}
-
-        .detail-value {{
-            color: #333;
-        }}
-
-        .value-badge {{
-            display: inline-block;
-            padding: 5px 15px;
-            border-radius: 20px;
-            font-size: 0.85em;
-            font-weight: 600;
-            margin-top: 10px;
-        }}
-
-        .great-deal {{
-            background: #4caf50;
-            color: white;
-        }}
-
-        .fair-price {{
-            background: #2196f3;
-            color: white;
-        }}
-
-        .overpriced {{
-            background: #ff9800;
-            color: white;
-        }}
-
-        .listing-link {{
-            display: block;
-            text-align: center;
-            padding: 15px;
-            background: #f5f5f5;
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 600;
-            transition: background 0.3s;
-        }}
-
-        .listing-link:hover {{
-            background: #667eea;
-            color: white;
-        }}
-
-        .no-results {{
-            text-align: center;
-            padding: 60px;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-        }}
-
-        .no-results h2 {{
-            color: #667eea;
-            margin-bottom: 10px;
-        }}
-
-        @media (max-width: 768px) {{
-            h1 {{
-                font-size: 1.8em;
-            }}
-
-            .listings {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>🏠 RUKindaHomeless</h1>
-            <p class="subtitle">Find Your Perfect Apartment in New Brunswick, NJ</p>
-        </header>
-
-        <div class="stats-grid">
-            <div class="stat-card">
-                <h3 id="totalListings">0</h3>
-                <p>Total Listings</p>
-            </div>
-            <div class="stat-card">
-                <h3 id="avgRent">$0</h3>
-                <p>Average Rent</p>
-            </div>
-            <div class="stat-card">
-                <h3 id="minRent">$0</h3>
-                <p>Starting From</p>
-            </div>
-            <div class="stat-card">
-                <h3 id="greatDeals">0</h3>
-                <p>Great Deals</p>
-            </div>
-        </div>
-
-        <div class="filters">
-            <h2>🔍 Filter Apartments</h2>
-            <div class="filter-group">
-                <div>
-                    <label for="bedroomsFilter">Bedrooms</label>
-                    <select id="bedroomsFilter">
-                        <option value="">All</option>
-                        <option value="0">Studio</option>
-                        <option value="1">1 BR</option>
-                        <option value="2">2 BR</option>
-                        <option value="3">3 BR</option>
-                        <option value="5">5 BR</option>
-                    </select>
-                </div>
-                <div>
-                    <label for="minPrice">Min Price</label>
-                    <input type="number" id="minPrice" placeholder="e.g., 1500">
-                </div>
-                <div>
-                    <label for="maxPrice">Max Price</label>
-                    <input type="number" id="maxPrice" placeholder="e.g., 3000">
-                </div>
-                <div>
-                    <label for="sourceFilter">Source</label>
-                    <select id="sourceFilter">
-                        <option value="">All Sources</option>
-                    </select>
-                </div>
-            </div>
-            <button onclick="applyFilters()">Apply Filters</button>
-            <button onclick="resetFilters()" style="background: #666; margin-left: 10px;">Reset</button>
-        </div>
-
-        <div id="listings" class="listings"></div>
-    </div>
-
-    <script>
-        // All apartment listings data loaded from CSV
-        const ALL_LISTINGS = {listings_js};
-
-        // Function to calculate value category
-        function getValueCategory(rent, bedrooms, avgRentByBR) {{
-            const avgRent = avgRentByBR[bedrooms] || rent;
-            const ratio = rent / avgRent;
-            
-            if (ratio <= 0.85) return 'great-deal';
-            if (ratio >= 1.15) return 'overpriced';
-            return 'fair-price';
-        }}
-
-        function getValueLabel(category) {{
-            const labels = {{
-                'great-deal': 'Great Deal',
-                'fair-price': 'Fair Price',
-                'overpriced': 'Overpriced'
-            }};
-            return labels[category] || 'Fair Price';
-        }}
-
-        function calculateStats() {{
-            if (ALL_LISTINGS.length === 0) return;
-            
-            const totalRent = ALL_LISTINGS.reduce((sum, l) => sum + l.rent, 0);
-            const avgRent = totalRent / ALL_LISTINGS.length;
-            const minRent = Math.min(...ALL_LISTINGS.map(l => l.rent));
-            
-            // Calculate average rent by bedroom count
-            const rentByBR = {{}};
-            const countByBR = {{}};
-            
-            ALL_LISTINGS.forEach(listing => {{
-                if (!rentByBR[listing.bedrooms]) {{
-                    rentByBR[listing.bedrooms] = 0;
-                    countByBR[listing.bedrooms] = 0;
-                }}
-                rentByBR[listing.bedrooms] += listing.rent;
-                countByBR[listing.bedrooms]++;
-            }});
-            
-            const avgRentByBR = {{}};
-            Object.keys(rentByBR).forEach(br => {{
-                avgRentByBR[br] = rentByBR[br] / countByBR[br];
-            }});
-            
-            // Calculate great deals
-            let greatDeals = 0;
-            ALL_LISTINGS.forEach(listing => {{
-                const category = getValueCategory(listing.rent, listing.bedrooms, avgRentByBR);
-                if (category === 'great-deal') greatDeals++;
-                listing.valueCategory = category;
-                listing.avgRentForBR = avgRentByBR[listing.bedrooms];
-            }});
-            
-            // Update stats display
-            document.getElementById('totalListings').textContent = ALL_LISTINGS.length;
-            document.getElementById('avgRent').textContent = '$' + Math.round(avgRent).toLocaleString();
-            document.getElementById('minRent').textContent = '$' + minRent.toLocaleString();
-            document.getElementById('greatDeals').textContent = greatDeals;
-            
-            // Populate source filter
-            const sources = [...new Set(ALL_LISTINGS.map(l => l.source))].sort();
-            const sourceFilter = document.getElementById('sourceFilter');
-            sourceFilter.innerHTML = '<option value="">All Sources</option>';
-            sources.forEach(source => {{
-                const option = document.createElement('option');
-                option.value = source;
-                option.textContent = source;
-                sourceFilter.appendChild(option);
-            }});
-        }}
-
-        function displayListings(listings) {{
-            const container = document.getElementById('listings');
-            
-            if (listings.length === 0) {{
-                container.innerHTML = `
-                    <div class="no-results">
-                        <h2>No apartments found</h2>
-                        <p>Try adjusting your filters</p>
-                    </div>
-                `;
-                return;
-            }}
-            
-            container.innerHTML = listings.map(listing => `
-                <div class="listing-card">
-                    <div class="listing-header">
-                        <div class="listing-price">$${{listing.rent.toLocaleString()}}/mo</div>
-                        <div class="listing-address">${{listing.address}}</div>
-                    </div>
-                    <div class="listing-details">
-                        <div class="listing-detail-row">
-                            <span class="detail-label">Bedrooms</span>
-                            <span class="detail-value">${{listing.bedrooms === 0 ? 'Studio' : listing.bedrooms + ' BR'}}</span>
-                        </div>
-                        <div class="listing-detail-row">
-                            <span class="detail-label">Bathrooms</span>
-                            <span class="detail-value">${{listing.bathrooms}} BA</span>
-                        </div>
-                        <div class="listing-detail-row">
-                            <span class="detail-label">Square Feet</span>
-                            <span class="detail-value">${{listing.sqft.toLocaleString()}} sqft</span>
-                        </div>
-                        <div class="listing-detail-row">
-                            <span class="detail-label">Price/sqft</span>
-                            <span class="detail-value">$${{(listing.rent / listing.sqft).toFixed(2)}}</span>
-                        </div>
-                        <div class="listing-detail-row">
-                            <span class="detail-label">Source</span>
-                            <span class="detail-value">${{listing.source}}</span>
-                        </div>
-                        <div style="text-align: center;">
-                            <span class="value-badge ${{listing.valueCategory}}">${{getValueLabel(listing.valueCategory)}}</span>
-                        </div>
-                    </div>
-                    <a href="${{listing.url}}" target="_blank" class="listing-link">View Original Listing →</a>
-                </div>
-            `).join('');
-        }}
-
-        function applyFilters() {{
-            const bedrooms = document.getElementById('bedroomsFilter').value;
-            const minPrice = parseFloat(document.getElementById('minPrice').value) || 0;
-            const maxPrice = parseFloat(document.getElementById('maxPrice').value) || Infinity;
-            const source = document.getElementById('sourceFilter').value;
-            
-            const filtered = ALL_LISTINGS.filter(listing => {{
-                if (bedrooms && listing.bedrooms !== parseInt(bedrooms)) return false;
-                if (listing.rent < minPrice || listing.rent > maxPrice) return false;
-                if (source && listing.source !== source) return false;
-                return true;
-            }});
-            
-            displayListings(filtered);
-        }}
-
-        function resetFilters() {{
-            document.getElementById('bedroomsFilter').value = '';
-            document.getElementById('minPrice').value = '';
-            document.getElementById('maxPrice').value = '';
-            document.getElementById('sourceFilter').value = '';
-            displayListings(ALL_LISTINGS);
-        }}
-
-        // Initialize when page loads
-        window.addEventListener('DOMContentLoaded', () => {{
-            console.log(`Loaded ${{ALL_LISTINGS.length}} apartment listings`);
-            calculateStats();
-            displayListings(ALL_LISTINGS);
-        }});
-    </script>
-</body>
-</html>'''
-
-# Write to file
-output_path = 'index.html'
-with open(output_path, 'w', encoding='utf-8') as f:
-    f.write(html_template)
-
-print(f"\n✅ Generated web app: {output_path}")
-print(f"✅ Embedded {len(listings)} listings")
+    manifest_json = json.dumps(manifest, separators=(',', ':'))
+    write_if_changed(os.path.join(args.output_dir, 'manifest.json'), manifest_json.encode())
+    write_if_changed(os.path.join(args.output_dir, 'manifest.js'), f"window.MANIFEST = {manifest_json};\n".encode())
+
+    # Shards no longer referenced by the manifest
+    shard_files = {f'{name}.js' for group in bedroom_groups for name in group['shards'] + [group['index']]}
+    for name in existing - shard_files:
+        if name.endswith('.js'):
+            os.remove(os.path.join(shard_dir, name))
+
+    written = len(shard_files - existing)
+    print(f"✅ {len(shard_files)} data shards and rent indexes in {shard_dir}/ "
+          f"({written} written, {len(shard_files) - written} unchanged)")
+    total_listings = len(df)
+
+# The page shell only depends on the template and the asset names
+with open(os.path.join(TEMPLATE_DIR, 'index.html'), encoding='utf-8') as f:
+    page = Template(f.read()).substitute(css_href=css_href, js_src=js_src, manifest_src='manifest.js')
+output_path = os.path.join(args.output_dir, 'index.html')
+page_written = write_if_changed(output_path, page.encode('utf-8'))
+
+state = {'data_key': data_key, 'total': total_listings}
+with open(state_path, 'w') as f:
+    json.dump(state, f)
+
+print(f"\n✅ {'Generated' if page_written else 'Unchanged'} web app: {output_path}")
+print(f"✅ Listing data in {os.path.join(args.output_dir, SHARD_DIR)}/ (keep it next to index.html)")
 print("\n" + "=" * 70)
 print("SUCCESS!")
 print("=" * 70)
@@ -528,7 +264,7 @@ print(f"\nTo use it:")
 print(f"1. Open '{output_path}' in your web browser")
 print(f"2. Double-click the file, or run: open {output_path}")
 print(f"\nThe app includes:")
-print(f"  • All {len(listings)} apartment listings")
+print(f"  • All {total_listings} apartment listings, loaded shard by shard")
 print(f"  • Interactive filtering")
 print(f"  • Live statistics")
 print(f"  • Value ratings (Great Deal/Fair/Overpriced)")
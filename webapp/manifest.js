@@ -0,0 +1 @@
+window.MANIFEST = {"total":46,"avgRent":2570.74,"minRent":1059.0,"greatDeals":14,"sources":["Premiere Residences","Redfin","Skyline Tower","The Edge","The Vue","Trulia","craigslist"],"sourceStats":[{"count":5,"avgRent":3106.4,"greatDeals":0},{"count":5,"avgRent":2367.6,"greatDeals":2},{"count":5,"avgRent":2508.0,"greatDeals":0},{"count":6,"avgRent":2856.5,"greatDeals":0},{"count":4,"avgRent":3329.5,"greatDeals":0},{"count":1,"avgRent":1749.0,"greatDeals":1},{"count":20,"avgRent":2306.9,"greatDeals":11}],"valueCategories":["great-deal","fair-price","overpriced"],"shardDir":"shards","shardSize":2000,"bedrooms":[{"bedrooms":0,"count":2,"avgRent":2098.5,"minRent":1800.0,"greatDeals":0,"index":"br0-index.519bbe28fa","shards":["br0-0.7312dd16dc"],"buckets":[{"source":0,"start":0,"count":1,"minRent":2397.0,"maxRent":2397.0,"greatDeals":0},{"source":6,"start":1,"count":1,"minRent":1800.0,"maxRent":1800.0,"greatDeals":0}]},{"bedrooms":1,"count":23,"avgRent":2235.78,"minRent":1059.0,"greatDeals":9,"index":"br1-index.80cd83adb5","shards":["br1-0.20da69630b"],"buckets":[{"source":0,"start":0,"count":2,"minRent":2827.0,"maxRent":3000.0,"greatDeals":0},{"source":1,"start":2,"count":3,"minRent":1059.0,"maxRent":2450.0,"greatDeals":2},{"source":2,"start":5,"count":2,"minRent":2125.0,"maxRent":2150.0,"greatDeals":0},{"source":3,"start":7,"count":3,"minRent":2501.0,"maxRent":2742.0,"greatDeals":0},{"source":4,"start":10,"count":3,"minRent":3069.0,"maxRent":3259.0,"greatDeals":0},{"source":5,"start":13,"count":1,"minRent":1749.0,"maxRent":1749.0,"greatDeals":1},{"source":6,"start":14,"count":9,"minRent":1663.0,"maxRent":2500.0,"greatDeals":6}]},{"bedrooms":2,"count":18,"avgRent":2924.11,"minRent":1992.0,"greatDeals":5,"index":"br2-index.0bdc06209a","shards":["br2-0.38bd9ad416"],"buckets":[{"source":0,"start":0,"count":2,"minRent":3547.0,"maxRent":3761.0,"greatDeals":0},{"source":1,"start":2,"count":2,"minRent":3069.0,"maxRent":3918.0,"greatDeals":0},{"source":2,"start":4,"count":3,"minRent":2665.0,"maxRent":2800.0,"greatDeals":0},{"source":3,"start":7,"count":3,"minRent":3061.0,"maxRent":3191.0,"greatDeals":0},{"source":4,"start":10,"count":1,"minRent":3891.0,"maxRent":3891.0,"greatDeals":0},{"source":6,"start":11,"count":7,"minRent":1992.0,"maxRent":3600.0,"greatDeals":5}]},{"bedrooms":3,"count":2,"avgRent":3025.0,"minRent":2950.0,"greatDeals":0,"index":"br3-index.0d446014f8","shards":["br3-0.36f9fa2902"],"buckets":[{"source":6,"start":0,"count":2,"minRent":2950.0,"maxRent":3100.0,"greatDeals":0}]},{"bedrooms":5,"count":1,"avgRent":3950.0,"minRent":3950.0,"greatDeals":0,"index":"br5-index.583b22ba56","shards":["br5-0.4a88a2d1f1"],"buckets":[{"source":6,"start":0,"count":1,"minRent":3950.0,"maxRent":3950.0,"greatDeals":0}]}]};
@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br0-0.7312dd16dc","bedrooms":0,"columns":{"address":["7 Livingston Ave New Brunswick, NJ 08901","510 Hamilton St, Somerset, NJ 08873"],"rent":[2397.0,1800.0],"bathrooms":[1.0,1.0],"sqft":[439,600],"url":["https://www.trulia.com/building/premiere-residences-7-livingston-ave-new-brunswick-nj-08901-2750788862","https://cnj.craigslist.org/apa/7895107384.html"],"source":[0,6],"valueCategory":[1,1],"valueScore":[4.0,7.5]}});
@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br0-index.519bbe28fa","rents":[2397.0,1800.0],"sqft":[439,600],"valueScore":[4.0,7.5]});
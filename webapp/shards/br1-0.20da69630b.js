@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br1-0.20da69630b","bedrooms":1,"columns":{"address":["7 Livingston Ave New Brunswick, NJ 08901","7 Livingston Ave New Brunswick, NJ 08901","33 Mine St Unit 2, New Brunswick, NJ 08901","33 Mine St Unit 4, New Brunswick, NJ 08901","205 Easton Ave, New Brunswick, NJ 08901","60 Paterson St New Brunswick, NJ 08901","60 Paterson St New Brunswick, NJ 08901","11 Us Highway 1 New Brunswick, NJ 08901","11 Us Highway 1 New Brunswick, NJ 08901","11 Us Highway 1 New Brunswick, NJ 08901","110 Somerset St New Brunswick, NJ 08901","110 Somerset St New Brunswick, NJ 08901","110 Somerset St New Brunswick, NJ 08901","434 Livingston Ave New Brunswick, NJ 08901","33 Paul Robeson Blvd, New Brunswick, NJ 08901","33 Paul Robeson Blvd, New Brunswick, NJ 08901","515 Bound Brook Rd, Dunellen, NJ 08812","1 CHESTER CIR, NEW BRUNSWICK CITY, NJ 08901","316 Magnolia Street, Highland Park, NJ 08904","1 CHESTER CIR, NEW BRUNSWICK CITY, NJ 08901","33 Paul Robeson Blvd, New Brunswick, NJ 08901","510 Hamilton St, Somerset, NJ 08873","300 Block Townsend St Unit 1, New Brunswick, NJ 08901"],"rent":[2827.0,3000.0,1059.0,1342.0,2450.0,2125.0,2150.0,2501.0,2548.0,2742.0,3069.0,3099.0,3259.0,1749.0,1663.0,1663.0,1800.0,1890.0,1895.0,1900.0,1992.0,2200.0,2500.0],"bathrooms":[1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,1.0,2.0,1.0,2.0],"sqft":[653,670,133,249,866,810,915,810,856,878,773,790,843,500,767,727,900,620,714,531,939,750,800],"url":["https://www.trulia.com/building/premiere-residences-7-livingston-ave-new-brunswick-nj-08901-2750788862","https://www.trulia.com/building/premiere-residences-7-livingston-ave-new-brunswick-nj-08901-2750788862","https://www.redfin.com/NJ/New-Brunswick/33-Mine-St-08901/unit-2/apartment/188891009","https://www.redfin.com/NJ/New-Brunswick/33-Mine-St-08901/unit-4/apartment/188891358","https://www.redfin.com/NJ/New-Brunswick/205-Easton-Ave-08901/apartment/179451238","https://www.trulia.com/building/skyline-tower-60-paterson-st-new-brunswick-nj-08901-1002115118","https://www.trulia.com/building/skyline-tower-60-paterson-st-new-brunswick-nj-08901-1002115118","https://www.trulia.com/building/the-edge-at-raritan-heights-11-us-highway-1-new-brunswick-nj-08901-2749343387","https://www.trulia.com/building/the-edge-at-raritan-heights-11-us-highway-1-new-brunswick-nj-08901-2749343387","https://www.trulia.com/building/the-edge-at-raritan-heights-11-us-highway-1-new-brunswick-nj-08901-2749343387","https://www.trulia.com/building/the-vue-110-somerset-st-new-brunswick-nj-08901-1001522305","https://www.trulia.com/building/the-vue-110-somerset-st-new-brunswick-nj-08901-1001522305","https://www.trulia.com/building/the-vue-110-somerset-st-new-brunswick-nj-08901-1001522305","https://www.trulia.com/building/livingston-terrace-434-livingston-ave-new-brunswick-nj-08901-1002385134","https://cnj.craigslist.org/apa/7894196989.html","https://cnj.craigslist.org/apa/7893472428.html","https://cnj.craigslist.org/apa/d/dunellen-bedroom-bathroom-apartment/7890532205.html","https://cnj.craigslist.org/apa/d/new-brunswick-leaves-are-falling-so-are/7890429512.html","https://cnj.craigslist.org/apa/7898853953.html","https://cnj.craigslist.org/apa/d/new-brunswick-move-in-deal-free-1st/7897167695.html","https://cnj.craigslist.org/apa/7896692864.html","https://cnj.craigslist.org/apa/7895109251.html","https://cnj.craigslist.org/apa/7896620000.html"],"source":[0,0,1,1,1,2,2,3,3,3,4,4,4,5,6,6,6,6,6,6,6,6,6],"valueCategory":[2,2,0,0,1,1,1,1,1,2,2,2,2,0,0,0,0,0,0,0,1,1,1],"valueScore":[2.0,2.0,9.0,9.0,4.0,6.0,6.0,4.0,4.0,2.0,2.0,2.0,2.0,9.0,9.0,9.0,9.0,9.0,9.0,9.0,7.5,6.0,4.0]}});
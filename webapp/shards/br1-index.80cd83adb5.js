@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br1-index.80cd83adb5","rents":[2827.0,3000.0,1059.0,1342.0,2450.0,2125.0,2150.0,2501.0,2548.0,2742.0,3069.0,3099.0,3259.0,1749.0,1663.0,1663.0,1800.0,1890.0,1895.0,1900.0,1992.0,2200.0,2500.0],"sqft":[653,670,133,249,866,810,915,810,856,878,773,790,843,500,767,727,900,620,714,531,939,750,800],"valueScore":[2.0,2.0,9.0,9.0,4.0,6.0,6.0,4.0,4.0,2.0,2.0,2.0,2.0,9.0,9.0,9.0,9.0,9.0,9.0,9.0,7.5,6.0,4.0]});
@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br2-0.38bd9ad416","bedrooms":2,"columns":{"address":["7 Livingston Ave New Brunswick, NJ 08901","7 Livingston Ave New Brunswick, NJ 08901","110 Somerset St, New Brunswick, NJ 08901","110 Somerset St New Brunswick, NJ 08901","60 Paterson St New Brunswick, NJ 08901","60 Paterson St New Brunswick, NJ 08901","60 Paterson St New Brunswick, NJ 08901","11 Us Highway 1 New Brunswick, NJ 08901","11 Us Highway 1 New Brunswick, NJ 08901","11 Us Highway 1 New Brunswick, NJ 08901","110 Somerset St New Brunswick, NJ 08901","33 Paul Robeson Blvd, New Brunswick, NJ 08901","33 Paul Robeson Blvd, New Brunswick, NJ 08901","912 Somerset St, New Brunswick, NJ 08901","221 Denison St, Highland Park, NJ 08904","400 Colonial Gardens, Piscataway, NJ 08854.","510 Hamilton St, Somerset, NJ 08873","130 Park Gate Dr, Edison, NJ 08820, Edison, NJ 08820"],"rent":[3547.0,3761.0,3069.0,3918.0,2665.0,2800.0,2800.0,3061.0,3096.0,3191.0,3891.0,1992.0,1992.0,2150.0,2256.0,2295.0,2550.0,3600.0],"bathrooms":[2.0,2.0,2.0,2.0,1.0,1.0,1.5,2.0,2.0,2.0,2.0,2.0,1.0,1.0,1.0,1.0,2.0,2.5],"sqft":[1075,899,1113,962,1040,917,1139,1144,1463,1248,1113,939,939,900,1200,800,975,1800],"url":["https://www.trulia.com/building/premiere-residences-7-livingston-ave-new-brunswick-nj-08901-2750788862","https://www.trulia.com/building/premiere-residences-7-livingston-ave-new-brunswick-nj-08901-2750788862","https://www.redfin.com/NJ/New-Brunswick/The-Vue/apartment/49701471","https://www.trulia.com/building/the-vue-110-somerset-st-new-brunswick-nj-08901-1001522305","https://www.trulia.com/building/skyline-tower-60-paterson-st-new-brunswick-nj-08901-1002115118","https://www.trulia.com/building/skyline-tower-60-paterson-st-new-brunswick-nj-08901-1002115118","https://www.trulia.com/building/skyline-tower-60-paterson-st-new-brunswick-nj-08901-1002115118","https://www.trulia.com/building/the-edge-at-raritan-heights-11-us-highway-1-new-brunswick-nj-08901-2749343387","https://www.trulia.com/building/the-edge-at-raritan-heights-11-us-highway-1-new-brunswick-nj-08901-2749343387","https://www.trulia.com/building/the-edge-at-raritan-heights-11-us-highway-1-new-brunswick-nj-08901-2749343387","https://www.trulia.com/building/the-vue-110-somerset-st-new-brunswick-nj-08901-1001522305","https://cnj.craigslist.org/apa/d/new-brunswick-1000-off-first-month-rent/7898046270.html","https://cnj.craigslist.org/apa/7894119176.html","https://cnj.craigslist.org/apa/7892839699.html","https://cnj.craigslist.org/apa/7899008891.html","https://cnj.craigslist.org/apa/7893893611.html","https://cnj.craigslist.org/apa/7895049953.html","https://cnj.craigslist.org/apa/7889707687.html"],"source":[0,0,1,1,2,2,2,3,3,3,4,6,6,6,6,6,6,6],"valueCategory":[2,2,1,2,1,1,1,1,1,1,2,0,0,0,0,0,1,2],"valueScore":[2.0,2.0,6.0,2.0,7.5,6.0,6.0,6.0,4.0,4.0,2.0,9.0,9.0,9.0,9.0,9.0,7.5,2.0]}});
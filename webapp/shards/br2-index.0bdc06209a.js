@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br2-index.0bdc06209a","rents":[3547.0,3761.0,3069.0,3918.0,2665.0,2800.0,2800.0,3061.0,3096.0,3191.0,3891.0,1992.0,1992.0,2150.0,2256.0,2295.0,2550.0,3600.0],"sqft":[1075,899,1113,962,1040,917,1139,1144,1463,1248,1113,939,939,900,1200,800,975,1800],"valueScore":[2.0,2.0,6.0,2.0,7.5,6.0,6.0,6.0,4.0,4.0,2.0,9.0,9.0,9.0,9.0,9.0,7.5,2.0]});
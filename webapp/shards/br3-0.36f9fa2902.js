@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br3-0.36f9fa2902","bedrooms":3,"columns":{"address":["Central Ave, Edison, NJ 08817","620 Somerset St, New Brunswick, NJ 08901"],"rent":[2950.0,3100.0],"bathrooms":[2.0,2.0],"sqft":[1234,1071],"url":["https://cnj.craigslist.org/apa/7896511389.html","https://cnj.craigslist.org/apa/d/new-brunswick-fully-renovated-house-for/7898393039.html"],"source":[6,6],"valueCategory":[1,1],"valueScore":[6.0,6.0]}});
@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br3-index.0d446014f8","rents":[2950.0,3100.0],"sqft":[1234,1071],"valueScore":[6.0,6.0]});
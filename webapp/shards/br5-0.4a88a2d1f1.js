@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br5-0.4a88a2d1f1","bedrooms":5,"columns":{"address":["3 Seymour Ave, Edison, NJ 08817"],"rent":[3950.0],"bathrooms":[2.0],"sqft":[1650],"url":["https://cnj.craigslist.org/apa/7899178475.html"],"source":[6],"valueCategory":[1],"valueScore":[6.0]}});
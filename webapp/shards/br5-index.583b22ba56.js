@@ -0,0 +1 @@
+RUKH.shardLoaded({"name":"br5-index.583b22ba56","rents":[3950.0],"sqft":[1650],"valueScore":[6.0]});